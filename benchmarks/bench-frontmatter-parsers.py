@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Frontmatter Parser Benchmark
+
+Times each path of validate-frontmatter.py's parser stack on the same
+frontmatter headers and checks that every path returns the same dict.
+
+Usage:
+    python3 benchmarks/bench-frontmatter-parsers.py               # Repo plugins
+    python3 benchmarks/bench-frontmatter-parsers.py --repeat 500  # More samples
+    python3 benchmarks/bench-frontmatter-parsers.py --plugins path/to/plugins
+
+Exit codes:
+    0 - All parser paths agree
+    1 - A parser path returned a different dict
+    2 - No frontmatter found to benchmark
+"""
+
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _load_script(name: str, filename: str):
+    """Load a hyphenated script from scripts/ as a module."""
+    spec = importlib.util.spec_from_file_location(name, REPO_ROOT / 'scripts' / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+vf = _load_script('validate_frontmatter', 'validate-frontmatter.py')
+yaml = vf._yaml()
+
+
+# Headers that exercise each branch of the stack, on top of the repo's files
+SYNTHETIC_HEADERS = [
+    # Flat mapping: native
+    ['name: flat-agent', 'description: A flat agent', 'color: blue', 'tools: Read, Write'],
+    # One level of metadata nesting plus a bool: native
+    ['name: nested-skill', 'description: "Quoted description"', 'user-invocable: false',
+     'metadata:', '  capabilities: parsing, benchmarking'],
+    # Folded scalar: libyaml
+    ['name: folded', 'description: >', '  Folded description', '  over two lines'],
+    # Unquoted colon in value: invalid YAML, regex fallback
+    ['name: broken', 'description: Context: colons: everywhere', 'color: blue'],
+]
+
+
+def collect_headers(plugins_dir: Path) -> list:
+    """Frontmatter header lines for every validatable file under plugins_dir."""
+    headers = []
+    if plugins_dir.is_dir():
+        for file_path in vf.find_plugin_files(plugins_dir):
+            lines = file_path.read_text(encoding='utf-8').split('\n')
+            if not lines or not lines[0].startswith('---'):
+                continue
+            for i, line in enumerate(lines[1:], start=1):
+                if line.strip() == '---':
+                    headers.append(lines[1:i])
+                    break
+    return headers
+
+
+def _yaml_path(loader):
+    def parse(header_lines):
+        parsed, _ = vf._load_yaml_mapping(header_lines, '\n'.join(header_lines), loader)
+        return parsed
+    return parse
+
+
+def parser_paths() -> list:
+    """(name, parse function) for each path of the stack, plus the full stack."""
+    paths = [('native', vf.parse_simple_mapping)]
+    if hasattr(yaml, 'CSafeLoader'):
+        paths.append(('libyaml', _yaml_path(yaml.CSafeLoader)))
+    paths.append(('pyyaml', _yaml_path(yaml.SafeLoader)))
+    paths.append(('fallback', vf.parse_fallback))
+    paths.append(('stack', vf._parse_frontmatter))
+    return paths
+
+
+def time_path(parse, headers: list, repeat: int) -> float:
+    """Mean seconds per header over `repeat` passes."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for header in headers:
+            parse(header)
+    return (time.perf_counter() - start) / (repeat * len(headers))
+
+
+def check_agreement(headers: list) -> list:
+    """Headers where an accepting path disagrees with pure-Python PyYAML."""
+    mismatches = []
+    for header in headers:
+        reference = _yaml_path(yaml.SafeLoader)(header)
+        if reference is None:
+            continue  # invalid YAML: only the fallback handles it
+        for name, parse in parser_paths():
+            if name == 'fallback':
+                continue
+            result = parse(header)
+            if name == 'native' and result is None:
+                continue  # native declined; the stack moves on
+            if result != reference:
+                mismatches.append((name, header, result, reference))
+    return mismatches
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the frontmatter parser stack',
+    )
+    parser.add_argument(
+        '--plugins',
+        type=Path,
+        default=REPO_ROOT / 'plugins',
+        help='Plugins directory to take frontmatter from (default: repo plugins/)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=200,
+        help='Passes over the corpus per parser path (default: 200)'
+    )
+    args = parser.parse_args()
+
+    headers = collect_headers(args.plugins) + SYNTHETIC_HEADERS
+    if not headers:
+        print("No frontmatter found to benchmark")
+        return 2
+
+    mismatches = check_agreement(headers)
+    for name, header, result, reference in mismatches:
+        print(f"MISMATCH [{name}] {header!r}: {result!r} != {reference!r}")
+
+    native_hits = sum(1 for h in headers if vf.parse_simple_mapping(h) is not None)
+    print(f"Corpus: {len(headers)} headers, {native_hits} handled natively")
+    print("")
+    print(f"{'Path':<10} {'us/header':>10} {'vs pyyaml':>10}")
+
+    timings = {name: time_path(parse, headers, args.repeat) for name, parse in parser_paths()}
+    for name, seconds in timings.items():
+        print(f"{name:<10} {seconds * 1e6:>10.2f} {timings['pyyaml'] / seconds:>9.1f}x")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Manifest Schema Benchmark
+
+Times validate-manifests.py's compiled schema checkers against a walker
+that interprets the same schema dicts on every value, over an in-memory
+marketplace of synthetic plugin entries, and checks that both report the
+same errors at the same JSON pointers.
+
+Entries look like the repo's (name, description, version, author, source,
+category, keywords and 8 + 4 + 4 component paths); a share of them carry
+one schema error each: a wrong type, a bad name or version, or a missing
+required key.
+
+Usage:
+    python3 benchmarks/bench-manifest-schema.py                  # 10000 entries
+    python3 benchmarks/bench-manifest-schema.py --plugins 50000 --repeat 10
+    python3 benchmarks/bench-manifest-schema.py --invalid-ratio 0.5
+
+Exit codes:
+    0 - Compiled and interpreted checks agree
+    1 - They reported different errors
+"""
+
+import argparse
+import importlib.util
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _load_script(name: str, filename: str):
+    """Load a hyphenated script from scripts/ as a module."""
+    spec = importlib.util.spec_from_file_location(name, REPO_ROOT / 'scripts' / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+vm = _load_script('validate_manifests', 'validate-manifests.py')
+
+
+# One schema error each, applied to an otherwise valid entry
+BREAKAGES = [
+    lambda entry: entry.update(version='1.0'),
+    lambda entry: entry.update(name='Not Kebab'),
+    lambda entry: entry.update(agents='./agents/agent-0.md'),
+    lambda entry: entry.update(keywords=['ok', 7]),
+    lambda entry: entry['author'].pop('name'),
+    lambda entry: entry.pop('name'),
+    lambda entry: entry.update(description=''),
+]
+
+
+def make_entry(i: int) -> dict:
+    name = f'plugin-{i:05d}'
+    return {
+        'name': name,
+        'description': f'Synthetic plugin {i}',
+        'version': f'1.{i % 7}.{i % 13}',
+        'author': {'name': 'Bench', 'email': 'bench@example.com'},
+        'source': f'./plugins/{name}',
+        'category': 'development',
+        'keywords': ['bench', f'k{i % 10}'],
+        'agents': [f'./agents/agent-{a}.md' for a in range(8)],
+        'commands': [f'./commands/command-{c}.md' for c in range(4)],
+        'skills': [f'./skills/skill-{s}' for s in range(4)],
+    }
+
+
+def make_manifest(plugins: int, invalid_ratio: float, seed: int = 0) -> dict:
+    """A marketplace with `plugins` entries, invalid_ratio of them broken."""
+    rng = random.Random(seed)
+    entries = [make_entry(i) for i in range(plugins)]
+    for i in rng.sample(range(plugins), int(plugins * invalid_ratio)):
+        rng.choice(BREAKAGES)(entries[i])
+    return {'name': 'bench-marketplace', 'owner': {'name': 'Bench'}, 'plugins': entries}
+
+
+def interpret(schema: dict, value, pointer: str, out: list) -> None:
+    """Reference check: walk the schema dict itself for every value."""
+    if 'type' in schema:
+        names = [schema['type']] if isinstance(schema['type'], str) else schema['type']
+        if not any(type(value) in vm._JSON_TYPES[name] for name in names):
+            got = vm._TYPE_NAMES.get(type(value), type(value).__name__)
+            out.append((pointer, 'wrong_type', f"expected {' or '.join(names)}, got {got}"))
+            return
+    if 'minLength' in schema and type(value) is str and len(value) < schema['minLength']:
+        out.append((pointer, 'too_short', f"expected at least {schema['minLength']} character(s)"))
+    if 'pattern' in schema and type(value) is str and not re.search(schema['pattern'], value):
+        expected = schema.get('description', f"a string matching {schema['pattern']}")
+        out.append((pointer, 'pattern_mismatch', f"expected {expected}, got {json.dumps(value)}"))
+    if 'minItems' in schema and type(value) is list and len(value) < schema['minItems']:
+        out.append((pointer, 'too_short', f"expected at least {schema['minItems']} item(s)"))
+    if type(value) is dict:
+        for key in schema.get('required', ()):
+            if key not in value:
+                out.append((pointer + vm._pointer_token(key), 'missing_required', f"missing required key '{key}'"))
+        properties = schema.get('properties', {})
+        for key, item in value.items():
+            if key in properties:
+                interpret(properties[key], item, pointer + vm._pointer_token(key), out)
+    if 'items' in schema and type(value) is list:
+        for i, item in enumerate(value):
+            interpret(schema['items'], item, f'{pointer}/{i}', out)
+
+
+def compiled_pass(manifest: dict) -> list:
+    out = []
+    vm.check_marketplace(manifest, '', out)
+    for i, entry in enumerate(manifest['plugins']):
+        vm.check_plugin_entry(entry, f'/plugins/{i}', out)
+    return out
+
+
+def interpreted_pass(manifest: dict) -> list:
+    out = []
+    interpret(vm.MARKETPLACE_SCHEMA, manifest, '', out)
+    for i, entry in enumerate(manifest['plugins']):
+        interpret(vm.PLUGIN_ENTRY_SCHEMA, entry, f'/plugins/{i}', out)
+    return out
+
+
+def time_pass(check, manifest: dict, repeat: int) -> float:
+    """Fastest of `repeat` passes over the manifest, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        check(manifest)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the compiled manifest schema checks',
+    )
+    parser.add_argument(
+        '--plugins',
+        type=int,
+        default=10000,
+        help='Plugin entries in the synthetic marketplace (default: 10000)'
+    )
+    parser.add_argument(
+        '--invalid-ratio',
+        type=float,
+        default=0.05,
+        help='Share of entries with a schema error (default: 0.05)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='Passes per checker; the fastest is reported (default: 5)'
+    )
+    args = parser.parse_args()
+
+    manifest = make_manifest(args.plugins, args.invalid_ratio)
+    compiled = compiled_pass(manifest)
+    interpreted = interpreted_pass(manifest)
+    for got, expected in zip(compiled, interpreted):
+        if got != expected:
+            print(f"MISMATCH compiled {got!r} != interpreted {expected!r}")
+            return 1
+    if len(compiled) != len(interpreted):
+        print(f"MISMATCH compiled found {len(compiled)} errors, interpreted {len(interpreted)}")
+        return 1
+
+    print(f"Manifest: {args.plugins} entries, {len(compiled)} schema errors")
+    print("")
+    print(f"{'Checker':<12} {'ms/pass':>9} {'us/entry':>9} {'vs interp':>10}")
+    timings = {
+        'compiled': time_pass(compiled_pass, manifest, args.repeat),
+        'interpreted': time_pass(interpreted_pass, manifest, args.repeat),
+    }
+    for name, seconds in timings.items():
+        print(f"{name:<12} {seconds * 1000:>9.1f} {seconds * 1e6 / args.plugins:>9.2f} "
+              f"{timings['interpreted'] / seconds:>9.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Validator Scaling Benchmark
+
+Generates synthetic marketplaces with generate-marketplace.py and runs the
+validator CLIs against them, recording throughput, latency per file and
+peak memory for each case. Results can be stored as baselines and later
+checked against them, entirely offline.
+
+Sizes (plugins x (agents + commands + skills), 5% invalid YAML, 2% missing
+manifest entries):
+    small    10 x (8 + 4 + 4)  =   160 files
+    medium  100 x (8 + 4 + 4)  =  1600 files
+    large   500 x (8 + 4 + 4)  =  8000 files
+
+Cases per size:
+    frontmatter        validate-frontmatter.py -q
+    frontmatter-jobs   validate-frontmatter.py -q --jobs (one worker per CPU)
+    manifests          validate-manifests.py -q
+
+Peak memory is the validator process's own maximum RSS (workers started
+by --jobs are not included).
+
+Timings vary across machines, so baselines store a calibration time (a
+fixed pure-Python workload, timed before and after the cases) next to the
+results. When checking, baseline times are scaled by the ratio of the
+current calibration to the stored one.
+
+Usage:
+    python3 benchmarks/bench-scale.py                      # small, medium
+    python3 benchmarks/bench-scale.py --sizes small,large --runs 3
+    python3 benchmarks/bench-scale.py --update-baselines   # Write baselines.json
+    python3 benchmarks/bench-scale.py --check              # Regression gate
+
+Exit codes:
+    0 - Done, and with --check no case regressed
+    1 - With --check, a case exceeded its baseline tolerance
+    2 - With --check, no baseline file or no baseline for a measured case
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINES = BENCH_DIR / 'baselines.json'
+
+
+def _load_generator():
+    spec = importlib.util.spec_from_file_location('generate_marketplace', BENCH_DIR / 'generate-marketplace.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['generate_marketplace'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+gen = _load_generator()
+
+SIZES = {
+    'small': gen.MarketplaceSpec(plugins=10, invalid_ratio=0.05, missing_ratio=0.02),
+    'medium': gen.MarketplaceSpec(plugins=100, invalid_ratio=0.05, missing_ratio=0.02),
+    'large': gen.MarketplaceSpec(plugins=500, invalid_ratio=0.05, missing_ratio=0.02),
+}
+
+CASES = [
+    ('frontmatter', ['validate-frontmatter.py', '-q']),
+    ('frontmatter-jobs', ['validate-frontmatter.py', '-q', '--jobs']),
+    ('manifests', ['validate-manifests.py', '-q']),
+]
+
+
+class Measurement(NamedTuple):
+    median_ms: float
+    min_ms: float
+    peak_rss_mb: float
+    items: int
+
+    @property
+    def per_item_ms(self) -> float:
+        return self.median_ms / self.items
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / (self.median_ms / 1000)
+
+
+def run_once(argv: List[str], cwd: Path) -> tuple:
+    """(wall seconds, peak RSS in MB) of one child process."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(argv, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, _, rusage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    proc.returncode = 0  # reaped by wait4; keep Popen from waiting again
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return elapsed, rusage.ru_maxrss / scale
+
+
+def measure(argv: List[str], cwd: Path, runs: int, items: int) -> Measurement:
+    run_once(argv, cwd)  # warm the page cache
+    times = []
+    peak = 0.0
+    for _ in range(runs):
+        elapsed, rss = run_once(argv, cwd)
+        times.append(elapsed)
+        peak = max(peak, rss)
+    return Measurement(statistics.median(times) * 1000, min(times) * 1000, peak, items)
+
+
+def calibrate(repeat: int = 7) -> float:
+    """Milliseconds for a fixed string-and-dict workload, fastest of repeat runs."""
+    def workload():
+        table = {}
+        for i in range(200000):
+            key = f'name-{i % 997}'
+            table[key] = table.get(key, '')[:8] + key.lower()
+        return len(table)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload()
+        times.append(time.perf_counter() - start)
+    # The fastest run is the least disturbed by other load on the machine
+    return min(times) * 1000
+
+
+def run_benchmarks(sizes: List[str], runs: int) -> Dict[str, Measurement]:
+    results = {}
+    for size in sizes:
+        spec = SIZES[size]
+        with tempfile.TemporaryDirectory(prefix=f'bench-{size}-') as tmp:
+            root = Path(tmp)
+            counts = gen.generate(root, spec)
+            gen.copy_scripts(root)
+            for case, script_args in CASES:
+                argv = [sys.executable, str(root / 'scripts' / script_args[0])] + script_args[1:]
+                items = counts['entries'] if case == 'manifests' else counts['files']
+                results[f'{size}/{case}'] = measure(argv, root, runs, items)
+    return results
+
+
+def format_table(results: Dict[str, Measurement]) -> str:
+    lines = [f"{'Case':<26} {'items':>6} {'median ms':>10} {'min ms':>8} "
+             f"{'ms/item':>8} {'items/s':>9} {'peak MB':>8}"]
+    for name, m in results.items():
+        lines.append(f"{name:<26} {m.items:>6} {m.median_ms:>10.1f} {m.min_ms:>8.1f} "
+                     f"{m.per_item_ms:>8.3f} {m.items_per_second:>9.0f} {m.peak_rss_mb:>8.1f}")
+    return '\n'.join(lines)
+
+
+def write_baselines(path: Path, results: Dict[str, Measurement], calibration_ms: float) -> None:
+    data = {
+        'calibration_ms': round(calibration_ms, 2),
+        'python': platform.python_version(),
+        'platform': platform.platform(terse=True),
+        'cases': {
+            name: {
+                'median_ms': round(m.median_ms, 1),
+                'peak_rss_mb': round(m.peak_rss_mb, 1),
+                'items': m.items,
+            }
+            for name, m in results.items()
+        },
+    }
+    path.write_text(json.dumps(data, indent=2) + '\n', encoding='utf-8')
+
+
+def check_baselines(baselines: dict, results: Dict[str, Measurement], calibration_ms: float,
+                    time_tolerance: float, memory_tolerance: float) -> tuple:
+    """(report lines, regressed case names, case names without a baseline)."""
+    scale = calibration_ms / baselines['calibration_ms']
+    lines = [f"Calibration {calibration_ms:.1f} ms vs {baselines['calibration_ms']:.1f} ms "
+             f"in baselines: scaling baseline times by {scale:.2f}",
+             f"{'Case':<26} {'limit ms':>9} {'ms':>8} {'limit MB':>9} {'MB':>7} {'':>6}"]
+    regressed = []
+    missing = []
+    for name, m in results.items():
+        base = baselines['cases'].get(name)
+        if base is None or base.get('items') != m.items:
+            missing.append(name)
+            continue
+        time_limit = base['median_ms'] * scale * (1 + time_tolerance)
+        memory_limit = base['peak_rss_mb'] * (1 + memory_tolerance)
+        ok = m.median_ms <= time_limit and m.peak_rss_mb <= memory_limit
+        if not ok:
+            regressed.append(name)
+        lines.append(f"{name:<26} {time_limit:>9.1f} {m.median_ms:>8.1f} "
+                     f"{memory_limit:>9.1f} {m.peak_rss_mb:>7.1f} {'ok' if ok else 'OVER':>6}")
+    return lines, regressed, missing
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark how the validators scale with marketplace size',
+    )
+    parser.add_argument(
+        '--sizes',
+        default='small,medium',
+        help=f"Comma-separated sizes from {', '.join(SIZES)} (default: small,medium)"
+    )
+    parser.add_argument(
+        '--runs',
+        type=int,
+        default=5,
+        help='Runs per case (default: 5)'
+    )
+    parser.add_argument(
+        '--baselines',
+        type=Path,
+        default=DEFAULT_BASELINES,
+        metavar='PATH',
+        help='Baseline file (default: benchmarks/baselines.json)'
+    )
+    parser.add_argument(
+        '--update-baselines',
+        action='store_true',
+        help='Write the measured results as the new baselines'
+    )
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='Exit 1 if a case is slower or larger than its baseline allows'
+    )
+    parser.add_argument(
+        '--time-tolerance',
+        type=float,
+        default=0.25,
+        help='Allowed slowdown over the scaled baseline time (default: 0.25 = 25%%)'
+    )
+    parser.add_argument(
+        '--memory-tolerance',
+        type=float,
+        default=0.20,
+        help='Allowed growth over the baseline peak memory (default: 0.20 = 20%%)'
+    )
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size: {', '.join(unknown)}")
+
+    baselines = None
+    if args.check:
+        try:
+            baselines = json.loads(args.baselines.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot read baselines {args.baselines}: {e}")
+            return 2
+
+    calibration_ms = calibrate()
+    results = run_benchmarks(sizes, args.runs)
+    calibration_ms = min(calibration_ms, calibrate())
+    print(format_table(results))
+
+    if args.update_baselines:
+        write_baselines(args.baselines, results, calibration_ms)
+        print(f"\nWrote baselines for {len(results)} cases to {args.baselines}")
+
+    if baselines is None:
+        return 0
+
+    lines, regressed, missing = check_baselines(
+        baselines, results, calibration_ms, args.time_tolerance, args.memory_tolerance
+    )
+    print()
+    print('\n'.join(lines))
+    if missing:
+        print(f"\nNo baseline for: {', '.join(missing)} (run with --update-baselines)")
+        return 2
+    if regressed:
+        print(f"\nRegressed: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Validator Startup Benchmark
+
+Measures wall-clock time of the validator CLIs as a git hook runs them:
+a fresh interpreter per call, through scripts/validate-hook.py. Enforces a
+budget on the median of each hook case.
+
+Of a hook call's time, the interpreter and the re, pathlib and typing
+imports every run needs take about 30 ms on an idle host; a FILE... call
+skips argparse (see validate-frontmatter.py's _hook_args), leaving the
+budget for loading the validator and validating.
+
+Cases:
+    interpreter          python -c pass (reference, not budgeted)
+    frontmatter-noop     a hook call where no staged file is validatable
+    frontmatter-single   a hook call with one agent file
+    manifests            validate-manifests.py via the launcher (not budgeted)
+    *-direct             the same validator run as a plain script (not budgeted)
+
+The launcher's advantage is cached bytecode, so run without
+PYTHONDONTWRITEBYTECODE set.
+
+Usage:
+    python3 benchmarks/bench-startup.py                  # 50 ms budget
+    python3 benchmarks/bench-startup.py --budget-ms 60
+    python3 benchmarks/bench-startup.py --runs 50
+
+Exit codes:
+    0 - Every budgeted case is within budget
+    1 - A budgeted case exceeded the budget
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / 'scripts'
+
+AGENT_MD = """---
+name: bench-agent
+description: Startup benchmark agent
+color: blue
+tools: Read, Write
+skills: bench-skill
+metadata:
+  capabilities: benchmarking
+---
+
+# Bench agent
+
+Body text.
+"""
+
+
+def build_cases(workdir: Path) -> list:
+    """(name, argv, budgeted) for each case."""
+    agent = workdir / 'plugins' / 'bench' / 'agents' / 'bench-agent.md'
+    agent.parent.mkdir(parents=True)
+    agent.write_text(AGENT_MD, encoding='utf-8')
+    readme = workdir / 'README.md'
+    readme.write_text('# Not a plugin file\n', encoding='utf-8')
+
+    hook = [sys.executable, str(SCRIPTS_DIR / 'validate-hook.py')]
+    return [
+        ('interpreter', [sys.executable, '-c', 'pass'], False),
+        ('frontmatter-noop', hook + ['frontmatter', '-q', str(readme)], True),
+        ('frontmatter-single', hook + ['frontmatter', '-q', str(agent)], True),
+        ('manifests', hook + ['manifests', '-q'], False),
+        ('frontmatter-direct', [sys.executable, str(SCRIPTS_DIR / 'validate-frontmatter.py'),
+                                '-q', str(agent)], False),
+        ('manifests-direct', [sys.executable, str(SCRIPTS_DIR / 'validate-manifests.py'), '-q'], False),
+    ]
+
+
+def time_run(argv: list) -> float:
+    start = time.perf_counter()
+    subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - start
+
+
+def measure(cases: list, runs: int) -> dict:
+    """Seconds per run for each case, interleaving cases to spread out noise."""
+    timings = {name: [] for name, _, _ in cases}
+    for _, argv, _ in cases:
+        time_run(argv)  # warm the page cache and scripts/__pycache__
+    for _ in range(runs):
+        for name, argv, _ in cases:
+            timings[name].append(time_run(argv))
+    return timings
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark validator CLI startup time',
+    )
+    parser.add_argument(
+        '--runs',
+        type=int,
+        default=20,
+        help='Runs per case (default: 20)'
+    )
+    parser.add_argument(
+        '--budget-ms',
+        type=float,
+        default=50.0,
+        help='Budget for the median of each hook case (default: 50)'
+    )
+    args = parser.parse_args()
+
+    if sys.dont_write_bytecode:
+        print("Note: PYTHONDONTWRITEBYTECODE is set; the launcher cannot cache bytecode\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = build_cases(Path(tmp))
+        timings = measure(cases, args.runs)
+
+    print(f"{'Case':<22} {'min ms':>8} {'median ms':>10} {'budget':>8}")
+    over_budget = []
+    for name, _, budgeted in cases:
+        median_ms = statistics.median(timings[name]) * 1000
+        status = ''
+        if budgeted:
+            status = 'ok' if median_ms <= args.budget_ms else 'OVER'
+            if status == 'OVER':
+                over_budget.append(name)
+        print(f"{name:<22} {min(timings[name]) * 1000:>8.1f} {median_ms:>10.1f} {status:>8}")
+
+    if over_budget:
+        print(f"\nOver the {args.budget_ms:g} ms budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
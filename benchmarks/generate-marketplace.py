@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Synthetic Marketplace Generator
+
+Builds a repo-shaped marketplace of configurable size for benchmarking the
+validators: plugins/<plugin>/{agents,commands,skills} plus
+.claude-plugin/marketplace.json declaring them. Output is deterministic for
+a given set of options and seed.
+
+Usage:
+    python3 benchmarks/generate-marketplace.py OUT                 # 10 x (8 + 4 + 4)
+    python3 benchmarks/generate-marketplace.py OUT --plugins 200 --agents 20
+    python3 benchmarks/generate-marketplace.py OUT --invalid-ratio 0.1 --missing-ratio 0.05
+    python3 benchmarks/generate-marketplace.py OUT --scripts      # Copy the validators in
+
+Options shape the tree:
+    --plugins / --agents / --commands / --skills   counts (the last three per plugin)
+    --body-lines      markdown body lines per file
+    --invalid-ratio   fraction of files whose frontmatter is invalid YAML (an
+                      unquoted colon, which only the regex fallback parses)
+    --missing-ratio   fraction of manifest entries naming files that do not exist
+    --seed            random seed for which files are invalid or missing
+
+Exit codes:
+    0 - Marketplace written
+    2 - OUT exists and is not empty
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, NamedTuple
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / 'scripts'
+
+COLORS = ['blue', 'green', 'purple', 'orange', 'cyan', 'red', 'yellow', 'pink']
+
+BODY_LINES = [
+    'Read the request and decide which files are involved.',
+    '',
+    '## Steps',
+    '',
+    '1. Gather context with `Read` and `Grep`.',
+    '2. Propose the change and wait for confirmation.',
+    '3. Apply it and summarise what changed.',
+    '',
+    '- plan: draft a plan',
+    '- apply: make the edit',
+    '',
+]
+
+
+class MarketplaceSpec(NamedTuple):
+    plugins: int = 10
+    agents: int = 8
+    commands: int = 4
+    skills: int = 4
+    body_lines: int = 40
+    invalid_ratio: float = 0.0
+    missing_ratio: float = 0.0
+    seed: int = 0
+
+    @property
+    def file_count(self) -> int:
+        return self.plugins * (self.agents + self.commands + self.skills)
+
+
+def _body(title: str, lines: int) -> str:
+    out = [f'# {title}', '']
+    while len(out) < lines:
+        out.extend(BODY_LINES)
+    return '\n'.join(out[:max(lines, 2)]) + '\n'
+
+
+def _document(fields: list, body: str, invalid: bool) -> str:
+    header = list(fields)
+    if invalid:
+        # The breakage seen in real plugins: an unquoted colon inside the
+        # description. Both YAML loaders reject it before the regex
+        # fallback parses it, so these files take the slowest path.
+        header = [line + '. Context: colons: break YAML' if line.startswith('description: ') else line
+                  for line in header]
+    return '---\n' + '\n'.join(header) + '\n---\n\n' + body
+
+
+def agent_md(plugin: str, index: int, body_lines: int, invalid: bool = False) -> str:
+    name = f'{plugin}-agent-{index:03d}'
+    return _document([
+        f'name: {name}',
+        f'description: Synthetic agent {index} of {plugin} for validator benchmarks',
+        f'color: {COLORS[index % len(COLORS)]}',
+        'tools: Read, Write, Edit, Grep',
+        f'skills: {plugin}-skill-000',
+        'metadata:',
+        '  capabilities: benchmarking, synthetic workloads',
+    ], _body(name, body_lines), invalid)
+
+
+def command_md(plugin: str, index: int, body_lines: int, invalid: bool = False) -> str:
+    return _document([
+        f'description: Synthetic command {index} of {plugin}',
+        'argument-hint: plan, apply',
+        'allowed-tools: Task, Read',
+    ], _body(f'Command {index}', body_lines) + 'Run with $ARGUMENTS\n', invalid)
+
+
+def skill_md(name: str, body_lines: int, invalid: bool = False) -> str:
+    return _document([
+        f'name: {name}',
+        f'description: Synthetic skill {name} used to measure how validation scales',
+        'user-invocable: false',
+    ], _body(name, body_lines), invalid)
+
+
+def generate(out_dir: Path, spec: MarketplaceSpec) -> Dict[str, int]:
+    """Write the marketplace under out_dir; returns counts of what was written."""
+    rng = random.Random(spec.seed)
+    counts = {'files': 0, 'invalid': 0, 'entries': 0, 'missing': 0}
+    manifest_plugins = []
+
+    def write(path: Path, render) -> None:
+        invalid = rng.random() < spec.invalid_ratio
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(render(invalid), encoding='utf-8')
+        counts['files'] += 1
+        counts['invalid'] += invalid
+
+    def declare(entries: list, declared: str) -> None:
+        counts['entries'] += 1
+        if rng.random() < spec.missing_ratio:
+            counts['missing'] += 1
+            declared = declared.replace('/', '/missing-', 1) if '/' in declared else 'missing-' + declared
+        entries.append(declared)
+
+    for p in range(spec.plugins):
+        plugin = f'plugin-{p:04d}'
+        plugin_dir = out_dir / 'plugins' / plugin
+        entry = {
+            'name': plugin,
+            'description': f'Synthetic plugin {p}',
+            'source': f'./plugins/{plugin}',
+            'version': '1.0.0',
+            'agents': [],
+            'commands': [],
+            'skills': [],
+        }
+
+        for a in range(spec.agents):
+            write(plugin_dir / 'agents' / f'{plugin}-agent-{a:03d}.md',
+                  lambda invalid, a=a: agent_md(plugin, a, spec.body_lines, invalid))
+            declare(entry['agents'], f'./agents/{plugin}-agent-{a:03d}.md')
+
+        for c in range(spec.commands):
+            write(plugin_dir / 'commands' / f'command-{c:03d}.md',
+                  lambda invalid, c=c: command_md(plugin, c, spec.body_lines, invalid))
+            declare(entry['commands'], f'./commands/command-{c:03d}.md')
+
+        for s in range(spec.skills):
+            skill = f'{plugin}-skill-{s:03d}'
+            write(plugin_dir / 'skills' / skill / 'SKILL.md',
+                  lambda invalid, skill=skill: skill_md(skill, spec.body_lines, invalid))
+            declare(entry['skills'], f'./skills/{skill}')
+
+        manifest_plugins.append(entry)
+
+    manifest_path = out_dir / '.claude-plugin' / 'marketplace.json'
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({
+        'name': 'synthetic-marketplace',
+        'owner': {'name': 'benchmarks'},
+        'plugins': manifest_plugins,
+    }, indent=2) + '\n', encoding='utf-8')
+    return counts
+
+
+def copy_scripts(out_dir: Path) -> None:
+    """Copy the validators in, so they treat out_dir as their repo root."""
+    target = out_dir / 'scripts'
+    target.mkdir(parents=True, exist_ok=True)
+    for script in SCRIPTS_DIR.glob('*.py'):
+        shutil.copy2(script, target / script.name)
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic marketplace for benchmarks',
+    )
+    parser.add_argument('out', type=Path, metavar='OUT', help='Directory to create')
+    defaults = MarketplaceSpec()
+    parser.add_argument('--plugins', type=int, default=defaults.plugins,
+                        help=f'Plugins (default: {defaults.plugins})')
+    parser.add_argument('--agents', type=int, default=defaults.agents,
+                        help=f'Agents per plugin (default: {defaults.agents})')
+    parser.add_argument('--commands', type=int, default=defaults.commands,
+                        help=f'Commands per plugin (default: {defaults.commands})')
+    parser.add_argument('--skills', type=int, default=defaults.skills,
+                        help=f'Skills per plugin (default: {defaults.skills})')
+    parser.add_argument('--body-lines', type=int, default=defaults.body_lines,
+                        help=f'Markdown body lines per file (default: {defaults.body_lines})')
+    parser.add_argument('--invalid-ratio', type=float, default=defaults.invalid_ratio,
+                        help='Fraction of files with invalid YAML frontmatter (default: 0)')
+    parser.add_argument('--missing-ratio', type=float, default=defaults.missing_ratio,
+                        help='Fraction of manifest entries naming missing files (default: 0)')
+    parser.add_argument('--seed', type=int, default=defaults.seed,
+                        help=f'Random seed (default: {defaults.seed})')
+    parser.add_argument('--scripts', action='store_true',
+                        help='Copy scripts/*.py into OUT/scripts so the validators run against OUT')
+    args = parser.parse_args()
+
+    if args.out.exists() and any(args.out.iterdir()):
+        print(f"Error: {args.out} exists and is not empty")
+        return 2
+
+    spec = MarketplaceSpec(
+        plugins=args.plugins, agents=args.agents, commands=args.commands,
+        skills=args.skills, body_lines=args.body_lines,
+        invalid_ratio=args.invalid_ratio, missing_ratio=args.missing_ratio,
+        seed=args.seed,
+    )
+    counts = generate(args.out, spec)
+    if args.scripts:
+        copy_scripts(args.out)
+    print(f"Wrote {counts['files']} files ({counts['invalid']} invalid) and "
+          f"{counts['entries']} manifest entries ({counts['missing']} missing) to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Combined Validation CLI
+
+Runs the frontmatter and manifest checks in one process over one
+filesystem snapshot and prints a merged report. Equivalent to running
+validate-frontmatter.py and validate-manifests.py, with each directory
+under plugins/ listed once instead of walked and stat()ed by both.
+
+Usage:
+    python3 scripts/validate-all.py           # Both reports, human-readable
+    python3 scripts/validate-all.py --json    # {"is_valid", "frontmatter", "manifests"}
+    python3 scripts/validate-all.py --strict  # Frontmatter warnings are errors
+    python3 scripts/validate-all.py --changed # Only what the git changes affect
+    python3 scripts/validate-all.py --references  # Also scan skill reference files
+    python3 scripts/validate-all.py --no-index    # Skip the cross-file frontmatter checks
+
+Exit codes:
+    0 - Valid (no errors)
+    1 - Validation errors found
+    2 - plugins/ or the root manifest not found
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def _load_script(filename: str):
+    """Load a validator from this directory as a module, once."""
+    name = filename[:-len('.py')].replace('-', '_')
+    module = sys.modules.get(name)
+    if module is None:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(name, Path(__file__).parent / filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+class FsSnapshot:
+    """Directory listings taken once and shared by both validators.
+
+    Each directory is read with a single scandir() the first time anything
+    asks about it; exists() and is_dir() are then answered from its
+    parent's listing. Symlinks are followed, as Path.exists() and
+    Path.is_dir() do.
+    """
+
+    def __init__(self):
+        self.listings = {}  # type: Dict[str, Optional[Dict[str, bool]]]
+
+    def listdir(self, path) -> Optional[Dict[str, bool]]:
+        """{name: is_dir} for a directory, in scandir order, or None if it is not one."""
+        key = os.fspath(path)
+        if key in self.listings:
+            return self.listings[key]
+        entries = None  # type: Optional[Dict[str, bool]]
+        try:
+            with os.scandir(key) as it:
+                entries = {}
+                for entry in it:
+                    try:
+                        if entry.is_symlink() and not os.path.exists(entry.path):
+                            continue  # dangling: does not exist
+                        entries[entry.name] = entry.is_dir()
+                    except OSError:
+                        continue
+        except OSError:
+            entries = None
+        self.listings[key] = entries
+        return entries
+
+    def _lookup(self, path) -> Optional[bool]:
+        """is_dir for an existing path, None if it does not exist."""
+        parent, name = os.path.split(os.fspath(path))
+        if not name:
+            return True if self.listdir(parent) is not None else None
+        entries = self.listdir(parent)
+        if entries is None:
+            return None
+        return entries.get(name)
+
+    def exists(self, path) -> bool:
+        return self._lookup(path) is not None
+
+    def is_dir(self, path) -> bool:
+        return self._lookup(path) is True
+
+
+def format_summary(frontmatter_valid: bool, manifests_valid: bool) -> str:
+    if frontmatter_valid and manifests_valid:
+        return "+ Frontmatter and manifest checks passed"
+    failed = []
+    if not frontmatter_valid:
+        failed.append("frontmatter")
+    if not manifests_valid:
+        failed.append("manifests")
+    return f"x Checks failed: {', '.join(failed)}"
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Validate frontmatter and manifests in one pass',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exit codes:
+  0  Valid (no errors)
+  1  Validation errors found
+  2  plugins/ or the root manifest not found
+
+Examples:
+  python3 scripts/validate-all.py
+  python3 scripts/validate-all.py --json
+  python3 scripts/validate-all.py --strict --cache
+  python3 scripts/validate-all.py --changed --cache
+        """
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Output results as JSON'
+    )
+    parser.add_argument(
+        '--strict',
+        action='store_true',
+        help='Treat frontmatter warnings as errors'
+    )
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help='Suppress output, only return exit code'
+    )
+    parser.add_argument(
+        '--no-warnings',
+        action='store_true',
+        help='Suppress warning output (still show errors)'
+    )
+    parser.add_argument(
+        '--group-by',
+        choices=['file', 'code'],
+        default='file',
+        help='Group frontmatter text output by file (default), or by issue code and then file'
+    )
+    parser.add_argument(
+        '--cache',
+        nargs='?',
+        const='.cache/validate-frontmatter.json',
+        default=None,
+        metavar='PATH',
+        help='Reuse frontmatter results for unchanged files (default: .cache/validate-frontmatter.json)'
+    )
+    parser.add_argument(
+        '--references',
+        action='store_true',
+        help='Also scan skill reference files (skills/*/references/**/*.md) for absolute paths'
+    )
+    parser.add_argument(
+        '--no-index',
+        action='store_true',
+        help='Skip cross-file checks: unknown skill/agent references and duplicate names'
+    )
+    parser.add_argument(
+        '--deps',
+        nargs='?',
+        const='.cache/validate-deps.json',
+        default=None,
+        metavar='PATH',
+        help='Keep a dependency graph of files and manifest entries (default: .cache/validate-deps.json)'
+    )
+    parser.add_argument(
+        '--changed',
+        action='store_true',
+        help='Only revalidate the files and manifest entries that the paths changed in git '
+             'affect; implies --deps, and validates everything while there is no graph yet'
+    )
+
+    args = parser.parse_args()
+    if args.no_index and (args.deps or args.changed):
+        parser.error('--deps and --changed cannot be combined with --no-index')
+
+    vf = _load_script('validate-frontmatter.py')
+    vm = _load_script('validate-manifests.py')
+
+    repo_root = Path(__file__).parent.resolve().parent
+    plugins_dir = repo_root / 'plugins'
+    manifest_path = repo_root / '.claude-plugin' / 'marketplace.json'
+    snapshot = FsSnapshot()
+
+    if not snapshot.is_dir(plugins_dir):
+        if not args.quiet:
+            print("Error: plugins directory not found")
+        return 2
+    if not snapshot.exists(manifest_path):
+        if not args.quiet:
+            print("Error: Root manifest not found")
+            print("  Expected: .claude-plugin/marketplace.json")
+        return 2
+
+    cache = None
+    if args.cache:
+        cache_path = Path(args.cache)
+        if not cache_path.is_absolute():
+            cache_path = repo_root / cache_path
+        cache = vf.ValidationCache.load(cache_path)
+    deps_path = None
+    if args.deps or args.changed:
+        deps_path = Path(args.deps or '.cache/validate-deps.json')
+        if not deps_path.is_absolute():
+            deps_path = repo_root / deps_path
+    graph = vf.DependencyGraph.load(deps_path, repo_root) if args.changed else None
+
+    if graph is not None:
+        changed_paths = vf.get_changed_paths(repo_root)
+        changed = vf.validate_changed(graph, changed_paths, cache=cache)
+        errors, warnings = list(changed.errors), list(changed.warnings)
+        files_checked = len(changed.files)
+        references = [f for f in changed_paths if args.references and vf.is_reference_file(f) and f.is_file()]
+        manifests = vm.FullValidationResult(manifest_path=str(manifest_path))
+        if changed.manifest_changed:
+            manifest, manifest_error = vm.load_manifest(manifest_path)
+            if not manifest_error:
+                manifests.schema_errors.extend(vm.check_manifest(manifest, manifest_path))
+                _, manifest_error = vm.manifest_plugins(manifest)
+            if manifest_error:
+                manifests.manifest_errors.append(manifest_error)
+        # Entries keep their manifest position, which schema errors point at
+        positions = {id(p): i for i, p in enumerate(graph.plugins)}
+        manifests.plugin_results.extend(vm.iter_plugin_results(
+            changed.plugins, repo_root, manifest_path=str(manifest_path),
+            indices=[positions[id(p)] for p in changed.plugins]))
+    else:
+        files = vf.find_plugin_files(plugins_dir, snapshot)
+        index = None
+        if not args.no_index:
+            index = vf.SymbolIndex()
+            for roster in vf.find_team_rosters(plugins_dir):
+                index.add_team_members(roster)
+        errors, warnings = vf.validate_files(files, cache=cache, index=index)
+        files_checked = len(files)
+        references = vf.find_reference_files(plugins_dir) if args.references else []
+        manifests = vm.validate_manifest_paths(manifest_path, base_dir=repo_root, snapshot=snapshot)
+        if deps_path is not None:
+            graph = vf.DependencyGraph.from_index(repo_root, index, vf.read_manifest_plugins(manifest_path))
+
+    if references:
+        for _, reference_errors, reference_warnings in vf.iter_reference_results(references):
+            errors.extend(reference_errors)
+            warnings.extend(reference_warnings)
+        files_checked += len(references)
+
+    try:
+        if cache is not None:
+            cache.save()
+        if deps_path is not None:
+            graph.save(deps_path)
+    except OSError as e:
+        if not args.quiet:
+            print(f"Warning: could not write cache: {e}", file=sys.stderr)
+    if args.strict:
+        errors.extend(warnings)
+        warnings = []
+    frontmatter = vf.ValidationResult(errors=errors, warnings=warnings, files_checked=files_checked)
+
+    is_valid = frontmatter.is_valid and manifests.is_valid
+    if not args.quiet:
+        if args.json:
+            import json
+            print(json.dumps({
+                'is_valid': is_valid,
+                'frontmatter': frontmatter.to_dict(),
+                'manifests': manifests.to_dict(),
+            }, indent=2))
+        else:
+            print(vf.format_issues_text(frontmatter, show_warnings=not args.no_warnings,
+                                        group_by=args.group_by))
+            print(vm.format_validation_text(manifests))
+            print(format_summary(frontmatter.is_valid, manifests.is_valid))
+
+    return 0 if is_valid else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
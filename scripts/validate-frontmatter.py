@@ -9,13 +9,25 @@ Designed for CI/CD pipelines and pre-commit hooks.
 Usage:
     python3 scripts/validate-frontmatter.py           # Validate all plugins
     python3 scripts/validate-frontmatter.py --json    # JSON output
+    python3 scripts/validate-frontmatter.py --ndjson  # Streamed JSON lines, then a summary
     python3 scripts/validate-frontmatter.py --changed # Only changed files (git)
+    python3 scripts/validate-frontmatter.py --staged  # Staged content from the index
+    python3 scripts/validate-frontmatter.py --rev-range A..B  # Every commit in a range, from git objects
+    python3 scripts/validate-frontmatter.py FILE...   # Only these files (hooks)
     python3 scripts/validate-frontmatter.py --strict  # Treat warnings as errors
+    python3 scripts/validate-frontmatter.py --references  # Also scan skills/*/references/
+    python3 scripts/validate-frontmatter.py --jobs    # Parallel, auto worker count
+    python3 scripts/validate-frontmatter.py --max-frontmatter-bytes N --max-depth N --max-aliases N --parse-timeout S
+    python3 scripts/validate-frontmatter.py --pipeline  # Overlap discovery, reads and parsing
+    python3 scripts/validate-frontmatter.py --cache   # Reuse results for unchanged files
+    python3 scripts/validate-frontmatter.py --changed --deps  # Changed files and their dependents
+    python3 scripts/validate-frontmatter.py --profile # Timing tables on stderr
+    python3 scripts/validate-frontmatter.py --watch   # Revalidate on every edit
 
 Exit codes:
     0 - Valid (no errors)
     1 - Validation errors found
-    2 - No files to validate
+    2 - No files to validate, or --rev-range does not resolve
 
 Reference:
     docs/reference/agent-frontmatter.md
@@ -24,19 +36,34 @@ Reference:
     plugins/workspace/agents/handoff.md (Verification Checklist)
 """
 
-import argparse
-import json
+# Startup time matters in git hooks: modules only some paths need (yaml,
+# json, subprocess, hashlib, concurrent.futures) and argparse, which only
+# main() needs, are imported where used, and annotations are left
+# unevaluated rather than building typing subscripts for every def.
+from __future__ import annotations
+
+import os
 import re
-import subprocess
 import sys
+import time
 from pathlib import Path
-from typing import Dict, List, NamedTuple, Optional, Tuple
+from typing import Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Pattern, Set, Tuple, Union
+
+
+_yaml_module = None
+
 
-try:
-    import yaml
-except ImportError:
-    print("Error: PyYAML not installed. Run: pip install pyyaml")
-    sys.exit(2)
+def _yaml():
+    """Import PyYAML on first use; flat frontmatter never needs it."""
+    global _yaml_module
+    if _yaml_module is None:
+        try:
+            import yaml
+        except ImportError:
+            print("Error: PyYAML not installed. Run: pip install pyyaml")
+            sys.exit(2)
+        _yaml_module = yaml
+    return _yaml_module
 
 
 # Valid colors per agent-frontmatter.md
@@ -69,14 +96,186 @@ MCP_WRAPPER_AGENTS = frozenset([
 AGENT_PATTERN = re.compile(r'plugins/[^/]+/agents/[^/]+\.md$')
 COMMAND_PATTERN = re.compile(r'plugins/[^/]+/commands/[^/]+\.md$')
 SKILL_PATTERN = re.compile(r'plugins/[^/]+/skills/([^/]+)/SKILL\.md$')
+PLUGIN_PATTERN = re.compile(r'plugins/([^/]+)/(?:agents/[^/]+|commands/[^/]+|skills/[^/]+/SKILL)\.md$')
+
+# Agent types built into Claude Code that a skill's 'agent:' may name
+BUILTIN_AGENTS = frozenset(['general-purpose', 'Explore', 'Plan'])
+
+# Skills that come from Claude Code itself or from other tools' plugins,
+# so an agent's 'skills:' may name them without a definition in this tree
+# (--external-skill adds more)
+EXTERNAL_SKILLS = frozenset(['claude-code-guide', 'codex', 'cursor', 'gemini'])
+
+# Team roster files whose agent names are checked against the index
+TEAM_MEMBERS_GLOB = '*/skills/*/team-members.json'
+TEAM_MEMBERS_PATTERN = re.compile(r'plugins/[^/]+/skills/[^/]+/team-members\.json$')
+
+# Result cache: bump CACHE_FORMAT when the entry layout changes and
+# PARSER_VERSION when extract_frontmatter changes what it returns
+CACHE_FORMAT = 4
+PARSER_VERSION = 3
+PARSE_RULE_ID = 'frontmatter'
+DEFAULT_CACHE_FILE = Path('.cache') / 'validate-frontmatter.json'
+
+# Dependency graph for incremental runs: bump DEPS_FORMAT when its layout changes
+DEPS_FORMAT = 2
+DEFAULT_DEPS_FILE = Path('.cache') / 'validate-deps.json'
+
+# Relative to the repo root
+MANIFEST_PATH = Path('.claude-plugin') / 'marketplace.json'
+
+# Below this many files a process pool costs more to start than it saves
+PARALLEL_MIN_FILES = 32
+
+# --pipeline: reader threads, and directory batches in flight between stages
+PIPELINE_READERS = 4
+PIPELINE_DEPTH = 16
+
+# Default limits on one file's frontmatter (see ParseLimits); 0 disables one
+FRONTMATTER_MAX_BYTES = 64 * 1024
+FRONTMATTER_MAX_DEPTH = 32
+FRONTMATTER_MAX_ALIASES = 100
+FRONTMATTER_PARSE_SECONDS = 5.0
+
+
+class IssueCode(NamedTuple):
+    """How to render an issue code: message template, severity and field.
 
+    Templates and a field of '{0}' take the issue's params positionally.
+    """
+    template: str
+    severity: str = 'error'  # 'error' or 'warning'
+    field: Optional[str] = None
+
+
+# Stable issue codes. Never renumber or reuse one: cache entries, JSON
+# output and anything filtering on codes depend on them.
+ISSUE_CODES = {
+    # File-level
+    'FM001': IssueCode("Missing or invalid YAML frontmatter"),
+    'FM002': IssueCode("Cannot read file: {0}"),
+    'FM003': IssueCode("Frontmatter is over {0} bytes, or its closing '---' is missing"),
+    'FM004': IssueCode("Frontmatter nests deeper than {0} levels"),
+    'FM005': IssueCode("Frontmatter aliases repeat collections more than {0} times"),
+    'FM006': IssueCode("Frontmatter took longer than {0}s to parse"),
+    # Shared by all file types
+    'FM101': IssueCode("Missing required field '{0}'", field='{0}'),
+    'FM102': IssueCode("Field '{0}' should be under 'metadata:' block", 'warning', '{0}'),
+    'FM103': IssueCode("Non-standard field '{0}' - wrap in 'metadata:' block", 'warning', '{0}'),
+    'FM104': IssueCode("Field 'name' must be lowercase-hyphenated (got: {0})", field='name'),
+    # Agents
+    'FM201': IssueCode("Agents must use 'tools', not 'allowed-tools'", field='allowed-tools'),
+    'FM202': IssueCode("Missing recommended field 'skills' - agents should have skills for discoverability",
+                       'warning', 'skills'),
+    'FM203': IssueCode("Missing 'metadata.capabilities' - agents should have capabilities for discoverability",
+                       'warning', 'metadata.capabilities'),
+    'FM204': IssueCode("Invalid color '{0}'. Valid: " + ', '.join(sorted(VALID_COLORS)), field='color'),
+    'FM205': IssueCode("Non-wrapper agent has MCP tools: {0}", 'warning', 'tools'),
+    'FM206': IssueCode("Use ${{CLAUDE_PLUGIN_ROOT}} instead of absolute paths", 'warning'),
+    # Commands
+    'FM301': IssueCode("Commands must use 'allowed-tools', not 'tools'", field='tools'),
+    'FM302': IssueCode("Missing 'tools' field - commands typically need tools to execute", 'warning', 'tools'),
+    'FM303': IssueCode("Command missing $ARGUMENTS placeholder - commands should include user input", 'warning'),
+    'FM304': IssueCode("Table-based routing detected - use natural language bullet points instead", 'warning'),
+    # Skills
+    'FM401': IssueCode("Skills must use 'allowed-tools', not 'tools'", field='tools'),
+    'FM402': IssueCode("Skill name '{0}' must match directory name '{1}'", field='name'),
+    'FM403': IssueCode("Description too short - should explain WHAT the skill provides AND WHEN to use it",
+                       'warning', 'description'),
+    'FM404': IssueCode("Skills cannot use $ARGUMENTS - they receive no user input. Use commands or agents instead."),
+    # Cross-file (symbol index)
+    'FM501': IssueCode("Unknown {1} '{2}' referenced in '{0}'", 'warning', '{0}'),
+    'FM502': IssueCode("Unknown agent '{0}' at {1}", 'warning'),
+    'FM503': IssueCode("Duplicate {0} name '{1}' - also defined in {2}", field='name'),
+    'FM504': IssueCode("{0} name '{1}' is also defined by plugin '{2}' ({3})", 'warning', 'name'),
+    # Skill reference files (--references)
+    'FM601': IssueCode("Use ${{CLAUDE_PLUGIN_ROOT}} instead of absolute paths", 'warning'),
+    'FM602': IssueCode("Only the first {0} of {1} bytes were scanned", 'warning'),
+}  # type: Dict[str, IssueCode]
+
+
+# Interned file paths and params: issues with the same file, or the same
+# params (the same field flagged in many files), share one object. The
+# table only deduplicates, so clear_interned() can empty it at any time
+# without touching issues already made; long-running modes do so whenever
+# they replace results, so it holds only what recent runs produced.
+_interned = {}  # type: Dict[object, object]
+
+# Issues built the old way, from a message rather than a code, keep
+# (message, field, severity) as their params
+LEGACY_CODE = ''
 
-class ValidationIssue(NamedTuple):
+
+def intern_file(file_path: str) -> str:
+    return _interned.setdefault(file_path, file_path)
+
+
+def intern_params(params) -> Tuple[str, ...]:
+    if not params:
+        return ()
+    params = tuple(str(p) for p in params)
+    return _interned.setdefault(params, params)
+
+
+def clear_interned() -> None:
+    _interned.clear()
+
+
+class _IssueFields(NamedTuple):
     file: str
     line: int
-    message: str
-    field: Optional[str] = None
-    severity: str = 'error'  # 'error' or 'warning'
+    code: str
+    params: Tuple[str, ...] = ()
+
+
+class ValidationIssue(_IssueFields):
+    """One issue: an interned file, a line, a code and the code's params.
+
+    The message, field and severity are rendered from ISSUE_CODES when
+    read, so nothing but the params is stored per issue. The keyword form
+    ValidationIssue(file, line, message=..., field=..., severity=...) of
+    earlier versions still builds an issue, with no code.
+    """
+    __slots__ = ()
+
+    def __new__(cls, file: str, line: int = 1, code: str = LEGACY_CODE, params: Tuple[str, ...] = (),
+                message: Optional[str] = None, field: Optional[str] = None, severity: str = 'error'):
+        if message is not None:
+            code, params = LEGACY_CODE, (message, field or '', severity)
+        return tuple.__new__(cls, (file, line, code, params))
+
+    @classmethod
+    def new(cls, file_path: str, code: str, *params, line: int = 1) -> 'ValidationIssue':
+        return tuple.__new__(cls, (intern_file(file_path), line, code, intern_params(params)))
+
+    @property
+    def message(self) -> str:
+        if self.code == LEGACY_CODE:
+            return self.params[0]
+        return ISSUE_CODES[self.code].template.format(*self.params)
+
+    @property
+    def field(self) -> Optional[str]:
+        if self.code == LEGACY_CODE:
+            return self.params[1] or None
+        field = ISSUE_CODES[self.code].field
+        return self.params[0] if field == '{0}' else field
+
+    @property
+    def severity(self) -> str:
+        if self.code == LEGACY_CODE:
+            return self.params[2]
+        return ISSUE_CODES[self.code].severity
+
+    def to_dict(self) -> dict:
+        return {
+            'file': self.file,
+            'line': self.line,
+            'code': self.code or None,
+            'message': self.message,
+            'field': self.field,
+            'severity': self.severity,
+        }
 
 
 class ValidationResult(NamedTuple):
@@ -94,632 +293,3647 @@ class ValidationResult(NamedTuple):
             'files_checked': self.files_checked,
             'error_count': len(self.errors),
             'warning_count': len(self.warnings),
-            'errors': [
-                {
-                    'file': e.file,
-                    'line': e.line,
-                    'message': e.message,
-                    'field': e.field,
-                    'severity': e.severity,
-                }
-                for e in self.errors
-            ],
-            'warnings': [
-                {
-                    'file': w.file,
-                    'line': w.line,
-                    'message': w.message,
-                    'field': w.field,
-                    'severity': w.severity,
-                }
-                for w in self.warnings
-            ]
+            'errors': [e.to_dict() for e in self.errors],
+            'warnings': [w.to_dict() for w in self.warnings]
         }
 
 
-def extract_frontmatter(content: str) -> Tuple[Optional[dict], int, str]:
-    """Extract YAML frontmatter from markdown content.
+class _Timer:
+    __slots__ = ('table', 'name', 'start')
+
+    def __init__(self, table: Dict[str, List[float]], name: str):
+        self.table = table
+        self.name = name
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        _add_timing(self.table, self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _add_timing(table: Dict[str, List[float]], name: str, seconds: float) -> None:
+    entry = table.get(name)
+    if entry is None:
+        table[name] = [seconds, 1]
+    else:
+        entry[0] += seconds
+        entry[1] += 1
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class Profiler:
+    """Wall-clock timings for --profile, per phase, per rule and per file.
+
+    Phases do not overlap, except that a rule's time includes any lazy
+    body read it triggers ('read-body').
+    """
+
+    def __init__(self):
+        self.phases = {}  # type: Dict[str, List[float]]
+        self.rules = {}  # type: Dict[str, List[float]]
+        self.file_times = []  # type: List[Tuple[float, str]]
+
+    def phase(self, name: str) -> _Timer:
+        return _Timer(self.phases, name)
+
+    def rule(self, rule_id: str) -> _Timer:
+        return _Timer(self.rules, rule_id)
+
+    def time_files(self, func: Callable) -> Callable:
+        """Wrap a per-file job so its wall time is recorded against the file."""
+
+        def timed(job):
+            start = time.perf_counter()
+            result = func(job)
+            path = job[0] if isinstance(job, tuple) else job
+            self.file_times.append((time.perf_counter() - start, str(path)))
+            return result
+
+        return timed
+
+    def report(self, slowest: int = 10) -> str:
+        """Format timing tables as text."""
+        times = sorted(t for t, _ in self.file_times)
+        lines = [f"PROFILE: {len(times)} files in {sum(times) * 1000:.2f} ms", ""]
+
+        for title, table in (('Phase', self.phases), ('Rule', self.rules)):
+            if not table:
+                continue
+            lines.append(f"{title:<28} {'Total ms':>10} {'Calls':>8} {'Mean us':>10}")
+            for name, (total, calls) in sorted(table.items(), key=lambda kv: -kv[1][0]):
+                lines.append(f"  {name:<26} {total * 1000:>10.3f} {calls:>8} {total / calls * 1e6:>10.1f}")
+            lines.append("")
+
+        if times:
+            lines.append(
+                f"Per file: p50 {_percentile(times, 50) * 1000:.3f} ms, "
+                f"p95 {_percentile(times, 95) * 1000:.3f} ms, "
+                f"max {times[-1] * 1000:.3f} ms"
+            )
+            lines.append("")
+            lines.append("Slowest files:")
+            for seconds, path in sorted(self.file_times, reverse=True)[:slowest]:
+                lines.append(f"  {seconds * 1000:>10.3f} ms  {path}")
+
+        return '\n'.join(lines)
+
+
+# Set by enable_profiling(); None keeps timing hooks to a single check
+_profiler = None  # type: Optional[Profiler]
+
+
+def enable_profiling(profiler: Optional[Profiler]) -> None:
+    """Install (or with None, remove) the profiler the timing hooks report to."""
+    global _profiler
+    _profiler = profiler
+
+
+def _phase(name: str):
+    return _NULL_TIMER if _profiler is None else _profiler.phase(name)
+
+
+def _rule_timer(rule_id: str):
+    return _NULL_TIMER if _profiler is None else _profiler.rule(rule_id)
+
+
+# Body tokens, scanned in one pass. Each rule declares the tokens it reads
+# and scan_body() compiles just those into a single alternation. The table
+# patterns are case-insensitive; the literals are not.
+BODY_TOKENS = {
+    'arguments': r'(?-i:\$ARGUMENTS)',
+    # Hardcoded paths like /Users/, ~/.claude/plugins/, etc.
+    'abspath': r'(?-i:/Users/|/home/|~/.claude/plugins/)',
+    # Patterns like "| Keyword | Action |" or "| Trigger | Agent |"
+    'table': (
+        r'\|\s*(?:Keyword|Trigger|Command|Input|First Word)\s*\|\s*(?:Action|Agent|Route)'
+        r'|\|\s*\w+\s*\|\s*(?:code-reviewer|engineer|architect)'
+    ),
+}
+
+# Agents report at most this many absolute-path lines
+MAX_ABSOLUTE_PATH_WARNINGS = 3
+
+_BODY_SCANNERS = {}  # type: Dict[FrozenSet[str], Pattern]
+
+
+class BodyScan(NamedTuple):
+    has_arguments: bool
+    table_routing: bool
+    absolute_path_lines: List[int]
+
+
+def _body_scanner(tokens: FrozenSet[str]) -> Pattern:
+    scanner = _BODY_SCANNERS.get(tokens)
+    if scanner is None:
+        scanner = re.compile(
+            '|'.join(f'(?P<{name}>{BODY_TOKENS[name]})' for name in sorted(tokens)),
+            re.IGNORECASE
+        )
+        _BODY_SCANNERS[tokens] = scanner
+    return scanner
+
+
+def scan_body(content: str, tokens: FrozenSet[str] = frozenset(BODY_TOKENS),
+              abspath_limit: Optional[int] = None) -> BodyScan:
+    """Scan a body once for every requested token.
+
+    Stops as soon as each token has what its rule needs: one hit for
+    'arguments' and 'table', `abspath_limit` non-comment lines for 'abspath'.
+    """
+    has_arguments = False
+    table_routing = False
+    absolute_path_lines = []  # type: List[int]
+    if not tokens:
+        return BodyScan(has_arguments, table_routing, absolute_path_lines)
+
+    pending = set(tokens)
+    line_num = 1
+    counted_to = 0
+    last_abspath_line = 0
+
+    for match in _body_scanner(tokens).finditer(content):
+        kind = match.lastgroup
+        if kind == 'arguments':
+            has_arguments = True
+            pending.discard(kind)
+        elif kind == 'table':
+            table_routing = True
+            pending.discard(kind)
+        elif 'abspath' in pending:
+            pos = match.start()
+            line_num += content.count('\n', counted_to, pos)
+            counted_to = pos
+            if line_num != last_abspath_line:
+                last_abspath_line = line_num
+                line_start = content.rfind('\n', 0, pos) + 1
+                line_end = content.find('\n', pos)
+                line = (content[line_start:] if line_end == -1 else content[line_start:line_end]).strip()
+                # Exclude comments explaining paths
+                if not line.startswith('#') and not line.startswith('//'):
+                    absolute_path_lines.append(line_num)
+                    if abspath_limit is not None and len(absolute_path_lines) >= abspath_limit:
+                        pending.discard(kind)
+        if not pending:
+            break
+
+    return BodyScan(has_arguments, table_routing, absolute_path_lines)
+
+
+def check_table_routing(content: str) -> bool:
+    """Check if content contains table-based routing (anti-pattern)."""
+    return scan_body(content, frozenset(['table'])).table_routing
+
+
+def check_absolute_paths(content: str, limit: Optional[int] = None) -> List[int]:
+    """Check for absolute paths instead of ${CLAUDE_PLUGIN_ROOT}."""
+    return scan_body(content, frozenset(['abspath']), abspath_limit=limit).absolute_path_lines
+
+
+class LazyBody:
+    """Markdown body after the frontmatter, read from disk on first use.
+
+    Supports `in` and str() so body rules can treat it like the string
+    extract_frontmatter() returns.
+    """
+
+    __slots__ = ('path', 'offset', 'tokens', '_text', '_scan')
+
+    def __init__(self, path: Optional[Path], offset: int, text: Optional[str] = None):
+        self.path = path
+        self.offset = offset  # opaque text-mode tell() cookie
+        self.tokens = frozenset(BODY_TOKENS)  # narrowed by prepare_body()
+        self._text = text
+        self._scan = None  # type: Optional[BodyScan]
+
+    @classmethod
+    def from_text(cls, text: str) -> 'LazyBody':
+        """Wrap an in-memory body so rules can share one scan of it."""
+        return cls(None, 0, text)
+
+    @property
+    def loaded(self) -> bool:
+        return self._text is not None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            with _phase('read-body'), open(self.path, encoding='utf-8') as f:
+                f.seek(self.offset)
+                self._text = f.read()
+        return self._text
+
+    def scan(self) -> BodyScan:
+        """Scan for self.tokens once; later rules reuse the result."""
+        if self._scan is None:
+            self._scan = scan_body(self.text, self.tokens,
+                                   abspath_limit=MAX_ABSOLUTE_PATH_WARNINGS)
+        return self._scan
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.text
+
+    def __str__(self) -> str:
+        return self.text
+
+
+Body = Union[str, LazyBody]
+
+
+class FrontmatterDict(dict):
+    """Parsed frontmatter, plus the file lines each key spans.
+
+    key_lines maps every top-level key, and 'parent.key' for the keys one
+    level under it (metadata.capabilities), to its (first, last) line in
+    the file. Each parser fills it in during the same pass that builds
+    the dict. Keys that are not strings have no entry.
+    """
+
+    __slots__ = ('key_lines',)
+
+    key_lines: Dict[str, Tuple[int, int]]
+
+
+def key_line(frontmatter: dict, field: Optional[str]) -> int:
+    """The line a field starts on, else its parent key's, else 1 (the opening ---)."""
+    key_lines = getattr(frontmatter, 'key_lines', None)
+    if not key_lines or not field:
+        return 1
+    span = key_lines.get(field)
+    if span is None and '.' in field:
+        span = key_lines.get(field.partition('.')[0])
+    return span[0] if span else 1
+
+
+# Native parser for the common case: top-level "key: value" lines plus one
+# level of indented "key: value" lines under an empty key (metadata:).
+# Anything it cannot map to exactly what yaml.safe_load returns makes it
+# give up so the YAML loaders handle the file.
+_SIMPLE_KEY_RE = re.compile(r'([A-Za-z][A-Za-z0-9_-]*):(?: +(.*))?\Z')
+_SIMPLE_NESTED_RE = re.compile(r'( +)([A-Za-z][A-Za-z0-9_-]*): +(.*)\Z')
+
+# Plain scalars YAML 1.1 resolves to bool or null rather than str. Exact
+# spellings resolve natively; other casings (tRUE) bail out to PyYAML.
+_YAML_CONSTANTS = {
+    spelling: value
+    for words, value in (('yes true on', True), ('no false off', False), ('null', None))
+    for word in words.split()
+    for spelling in (word, word.title(), word.upper())
+}  # type: Dict[str, Optional[bool]]
+_YAML_CONSTANTS['~'] = None
+_YAML_SPECIAL_WORDS = frozenset(word.lower() for word in _YAML_CONSTANTS)
+
+# First characters that are YAML indicators, or that may start an int,
+# float, timestamp, merge key or value key
+_UNSAFE_PLAIN_START = frozenset('-?:,[]{}#&*!|>\'"%@`0123456789+.<=')
+
+
+class _NotSimple(Exception):
+    pass
+
+
+def _simple_scalar(value: str) -> Union[str, bool, None]:
+    """Return what YAML would load for a one-line scalar, or raise _NotSimple."""
+    if not value.isprintable() or '\t' in value:
+        raise _NotSimple
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        inner = value[1:-1]
+        if '"' in inner or '\\' in inner:
+            raise _NotSimple
+        return inner
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        inner = value[1:-1]
+        if "'" in inner.replace("''", ''):
+            raise _NotSimple
+        return inner.replace("''", "'")
+    if value in _YAML_CONSTANTS:
+        return _YAML_CONSTANTS[value]
+    if (value[0] in _UNSAFE_PLAIN_START or value.lower() in _YAML_SPECIAL_WORDS
+            or ': ' in value or ' #' in value or value.endswith(':')):
+        raise _NotSimple
+    return value
+
+
+def _simple_key(key: str) -> str:
+    if key.lower() in _YAML_SPECIAL_WORDS:
+        raise _NotSimple
+    return key
+
+
+def parse_simple_mapping(header_lines: List[str]) -> Optional[FrontmatterDict]:
+    """Parse flat frontmatter without YAML, or return None if it is not flat.
+
+    Returns the same dict yaml.safe_load would for the subset it accepts:
+    plain, single- or double-quoted one-line strings, YAML 1.1 bool and null
+    words, and one level of nesting under a key with no value. Key lines
+    count from file line 2, where the header starts.
+    """
+    parsed = FrontmatterDict()
+    key_lines = parsed.key_lines = {}
+    nested_key = None  # type: Optional[str]
+    nested = None  # type: Optional[dict]
+    nested_indent = None  # type: Optional[str]
+    try:
+        for number, line in enumerate(header_lines, 2):
+            stripped = line.strip()
+            if not stripped or stripped.startswith('#'):
+                continue
+            if line[0] == ' ':
+                match = _SIMPLE_NESTED_RE.match(line.rstrip(' '))
+                if nested is None or match is None:
+                    raise _NotSimple
+                indent, key, value = match.groups()
+                if nested_indent is None:
+                    nested_indent = indent
+                elif indent != nested_indent:
+                    raise _NotSimple
+                nested[_simple_key(key)] = _simple_scalar(value)
+                key_lines[f'{nested_key}.{key}'] = (number, number)
+                key_lines[nested_key] = (key_lines[nested_key][0], number)
+                continue
+
+            match = _SIMPLE_KEY_RE.match(line.rstrip(' '))
+            if match is None:
+                raise _NotSimple
+            if nested is not None and not nested:
+                parsed[nested_key] = None  # "key:" with nothing under it
+            key, value = match.groups()
+            key = _simple_key(key)
+            key_lines[key] = (number, number)
+            if value:
+                parsed[key] = _simple_scalar(value)
+                nested_key = nested = None
+            else:
+                nested_key = key
+                nested = parsed[key] = {}
+                nested_indent = None
+    except _NotSimple:
+        return None
+
+    if nested is not None and not nested:
+        parsed[nested_key] = None
+    return parsed or None
+
+
+# Top-level "key: value" lines for the regex fallback parser
+_FALLBACK_KEY = r'^([a-z][a-z0-9-]*)\s*:\s*(.*)$'
+# Indented "key:" lines, which the fallback only locates
+_FALLBACK_NESTED = r'^\s+([a-z][a-z0-9_-]*)\s*:'
+
+
+def parse_fallback(header_lines: List[str]) -> Optional[FrontmatterDict]:
+    """Regex-based extraction for files with unquoted colons in values.
+
+    This handles cases like "description: ... Context: ..." which break YAML.
+    A key's span runs to the last non-blank line before the next top-level key.
+    """
+    # Compiled on first use (and then cached by re): case-insensitive
+    # patterns cost a millisecond to build, and most runs never get here
+    key_re = re.compile(_FALLBACK_KEY, re.IGNORECASE)
+    nested_re = re.compile(_FALLBACK_NESTED, re.IGNORECASE)
+    parsed = FrontmatterDict()
+    key_lines = parsed.key_lines = {}
+    key = None  # type: Optional[str]
+    for number, line in enumerate(header_lines, 2):
+        # Match top-level keys (not indented)
+        match = key_re.match(line)
+        if match:
+            key = match.group(1).lower()
+            value = match.group(2).strip()
+            key_lines[key] = (number, number)
+            # Handle multi-line or array values
+            if value.startswith('[') or value.startswith('-') or not value:
+                # Skip complex values, just note the key exists
+                parsed[key] = value if value else True
+            else:
+                parsed[key] = value
+        elif key is not None and line.strip():
+            key_lines[key] = (key_lines[key][0], number)
+            nested = nested_re.match(line)
+            if nested:
+                key_lines[f'{key}.{nested.group(1)}'] = (number, number)
+
+    return parsed if parsed else None
+
+
+# ── Parse limits ──
+
+
+class ParseLimits(NamedTuple):
+    """Bounds on what one file's frontmatter may cost to parse; 0 disables one.
+
+    max_bytes caps the UTF-8 size of the lines between the --- markers, and
+    so how far a file with no closing marker is scanned. max_depth and
+    max_aliases bound nesting and how often aliases make a walk of the
+    result re-enter a collection (billion laughs stays small in memory,
+    but not for whatever walks it). seconds bounds the YAML loaders.
+    """
+    max_bytes: int = FRONTMATTER_MAX_BYTES
+    max_depth: int = FRONTMATTER_MAX_DEPTH
+    max_aliases: int = FRONTMATTER_MAX_ALIASES
+    seconds: float = FRONTMATTER_PARSE_SECONDS
+
+
+_limits = ParseLimits()
+
+
+def set_parse_limits(limits: ParseLimits) -> None:
+    """Apply limits to every later parse in this process (also a pool initializer)."""
+    global _limits
+    _limits = limits
+
+
+def parse_version() -> str:
+    """Cache version of the parse rule: the parser's, and the limits that decide its issues.
+
+    The time limit is left out; timed-out results are never cached.
+    """
+    return f"{PARSER_VERSION}:{_limits.max_bytes}:{_limits.max_depth}:{_limits.max_aliases}"
+
+
+class FrontmatterLimitError(Exception):
+    """Frontmatter breached a ParseLimits bound; carries the issue to report."""
+
+    def __init__(self, code: str, *params):
+        super().__init__(code, *params)
+        self.code = code
+        self.params = tuple(str(p) for p in params)
+
+    @property
+    def cacheable(self) -> bool:
+        # Whether a parse times out depends on the machine, not the content
+        return self.code != 'FM006'
+
+    def issue(self, file_path) -> ValidationIssue:
+        return ValidationIssue.new(str(file_path), self.code, *self.params)
+
+
+def _check_header_size(header_lines: List[str], chars: int) -> None:
+    """Raise FM003 if the header is over max_bytes; chars is its length in characters."""
+    limit = _limits.max_bytes
+    # UTF-8 takes at most 4 bytes per character, so most headers need no encoding
+    if limit and (chars > limit or (chars * 4 > limit
+                                    and len('\n'.join(header_lines).encode('utf-8', 'surrogatepass')) > limit)):
+        raise FrontmatterLimitError('FM003', limit)
+
+
+_FLOW_BRACKET_RE = re.compile(r'[\[\]{}]')
+_SEQUENCE_DASHES_RE = re.compile(r'(?:-(?: +|\Z))*')
+_BLOCK_SCALAR_RE = re.compile(r'(?:^|[:\-] )[|>][-+0-9]*\s*(?:#.*)?\Z')
+
+
+def estimate_depth(header_lines: List[str], text: str) -> int:
+    """An upper bound on how deeply YAML nests these lines, without parsing them.
+
+    Indentation levels and leading "- " markers bound block nesting,
+    bracket depth bounds flow nesting; the sum bounds both. Lines inside a
+    block scalar (| or >) are text and do not count. libyaml's loader
+    recurses once per level and crashes the process on deep enough input,
+    so this runs before any YAML loader sees the text.
+    """
+    block = 0
+    indents = []  # type: List[int]
+    scalar_indent = None  # type: Optional[int]
+    for line in header_lines:
+        stripped = line.lstrip(' ')
+        if not stripped or stripped.startswith('#'):
+            continue
+        indent = len(line) - len(stripped)
+        if scalar_indent is not None:
+            if indent > scalar_indent:
+                continue
+            scalar_indent = None
+        while indents and indents[-1] >= indent:
+            indents.pop()
+        indents.append(indent)
+        dashes = _SEQUENCE_DASHES_RE.match(stripped).group().count('-')
+        block = max(block, len(indents) + dashes)
+        if _BLOCK_SCALAR_RE.search(stripped):
+            scalar_indent = indent
+
+    flow = depth = 0
+    if '[' in text or '{' in text:
+        for bracket in _FLOW_BRACKET_RE.findall(text):
+            depth += 1 if bracket in '[{' else -1
+            flow = max(flow, depth)
+    return block + flow
+
+
+def check_structure(value, max_depth: int, max_aliases: int) -> None:
+    """Raise FM004 or FM005 if loaded YAML nests too deeply or aliases repeat too much.
+
+    Walks the value as its consumers would, following aliases, but stops
+    as soon as a limit is passed, so the walk is bounded too.
+    """
+    seen = set()  # type: set
+    repeats = 0
+    stack = [(value, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, dict):
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        if max_depth and depth > max_depth:
+            raise FrontmatterLimitError('FM004', max_depth)
+        if id(node) in seen:
+            repeats += 1
+            if max_aliases and repeats > max_aliases:
+                raise FrontmatterLimitError('FM005', max_aliases)
+        else:
+            seen.add(id(node))
+        stack.extend((child, depth + 1) for child in children)
+
+
+class _ParseDeadline:
+    """Raise FM006 in the parsing code once `seconds` have passed.
+
+    Uses SIGALRM, which only the main thread receives, so in other
+    threads and where SIGALRM does not exist it does nothing. Each worker
+    process of a parallel run keeps its own deadline. A timer the host
+    already had running is restored afterwards.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.armed = False
+
+    def _expire(self, signum, frame):
+        raise FrontmatterLimitError('FM006', self.seconds)
+
+    def __enter__(self) -> '_ParseDeadline':
+        import signal
+        if not self.seconds or not hasattr(signal, 'setitimer'):
+            return self
+        try:
+            self.previous_handler = signal.signal(signal.SIGALRM, self._expire)
+        except ValueError:
+            return self  # not the main thread
+        self.previous_timer = signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        self.started = time.perf_counter()
+        self.armed = True
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        if self.armed:
+            import signal
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self.previous_handler)
+            delay, interval = self.previous_timer
+            if delay:
+                remaining = delay - (time.perf_counter() - self.started)
+                signal.setitimer(signal.ITIMER_REAL, max(remaining, 1e-6), interval)
+            self.armed = False
+        return False
+
+
+def _node_span(key_node, value_node, header_lines: List[str]) -> Tuple[int, int]:
+    """File lines from a YAML key to the end of its value (marks count from 0 at line 2)."""
+    first = key_node.start_mark.line
+    end = value_node.end_mark
+    last = end.line
+    # A block value ends where whatever follows it starts; an alias's node
+    # keeps the anchor's marks, which may come before the key
+    if last > first and (last >= len(header_lines) or not header_lines[last][:end.column].strip()):
+        last -= 1
+        while last > first and not header_lines[last].strip():
+            last -= 1
+    return first + 2, max(first, last) + 2
+
+
+def _yaml_key_lines(node, header_lines: List[str]) -> Dict[str, Tuple[int, int]]:
+    """FrontmatterDict.key_lines for a composed top-level mapping node."""
+    key_lines = {}  # type: Dict[str, Tuple[int, int]]
+    for key_node, value_node in node.value:
+        key = key_node.value
+        if not isinstance(key, str):
+            continue  # a collection used as a key
+        key_lines[key] = _node_span(key_node, value_node, header_lines)
+        if value_node.id == 'mapping':
+            for sub_key_node, sub_value_node in value_node.value:
+                if isinstance(sub_key_node.value, str):
+                    key_lines[f'{key}.{sub_key_node.value}'] = _node_span(
+                        sub_key_node, sub_value_node, header_lines)
+    return key_lines
+
+
+def _load_yaml_mapping(header_lines: List[str], text: str, loader) -> Tuple[Optional[dict], bool]:
+    """Load text, the joined header_lines, with a YAML loader; returns
+    (FrontmatterDict or None, whether it parsed).
+
+    Does what yaml.load does, composing the node graph then constructing
+    it, but keeps the root node to read each key's position from. Merge
+    keys (<<) are flattened in that node, so a merged key is placed where
+    its anchor defines it.
+    """
+    yaml = _yaml()
+    try:
+        instance = loader(text)
+        try:
+            node = instance.get_single_node()
+            parsed = instance.construct_document(node) if node is not None else None
+        finally:
+            instance.dispose()
+    except yaml.YAMLError:
+        return None, False
+    if not isinstance(parsed, dict):
+        return None, True
+    frontmatter = FrontmatterDict(parsed)
+    frontmatter.key_lines = _yaml_key_lines(node, header_lines)
+    return frontmatter, True
+
+
+def _parse_frontmatter(header_lines: List[str]) -> Optional[dict]:
+    """Parse the lines between the --- markers into a dict.
+
+    Tries, in order: the native flat-mapping parser, libyaml's CSafeLoader
+    when available, pure-Python SafeLoader (only if libyaml rejected the
+    text), then a regex fallback for frontmatter that is not valid YAML.
+    YAML is only loaded within the current ParseLimits; breaching one
+    raises FrontmatterLimitError.
+    """
+    with _phase('native'):
+        parsed = parse_simple_mapping(header_lines)
+    if parsed is not None:
+        return parsed
+
+    frontmatter_text = '\n'.join(header_lines)
+    limits = _limits
+    if limits.max_depth and estimate_depth(header_lines, frontmatter_text) > limits.max_depth:
+        raise FrontmatterLimitError('FM004', limits.max_depth)
+    yaml = _yaml()
+    # libyaml bindings when PyYAML was built with them
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+    # Try standard YAML parsing next
+    with _ParseDeadline(limits.seconds):
+        with _phase('yaml'):
+            parsed, loaded = _load_yaml_mapping(header_lines, frontmatter_text, loader)
+        if not loaded and loader is not yaml.SafeLoader:
+            with _phase('yaml-python'):
+                parsed, loaded = _load_yaml_mapping(header_lines, frontmatter_text, yaml.SafeLoader)
+    if parsed is not None:
+        check_structure(parsed, limits.max_depth, limits.max_aliases)
+        return parsed
+
+    with _phase('fallback'):
+        return parse_fallback(header_lines)
+
+
+def extract_frontmatter(content: str) -> Tuple[Optional[dict], int, str]:
+    """Extract YAML frontmatter from markdown content.
+
+    Returns:
+        tuple of (parsed frontmatter dict or None, line number where frontmatter ends, body content);
+        the dict is a FrontmatterDict whose key_lines locate each key
+
+    Raises FrontmatterLimitError when the frontmatter breaches ParseLimits.
+    """
+    if not content.startswith('---'):
+        return None, 0, content
+
+    # Find closing --- without splitting the body into lines
+    header_lines = []
+    chars = 0
+    limit = _limits.max_bytes
+    start = content.find('\n') + 1
+    while start:
+        newline = content.find('\n', start)
+        line = content[start:] if newline == -1 else content[start:newline]
+        if line.strip() == '---':
+            _check_header_size(header_lines, chars)
+            body = '' if newline == -1 else content[newline + 1:]
+            end_line = len(header_lines) + 2
+            return _parse_frontmatter(header_lines), end_line, body
+        header_lines.append(line)
+        chars += len(line) + 1
+        if limit and chars > limit:
+            raise FrontmatterLimitError('FM003', limit)
+        start = newline + 1
+
+    return None, 0, content
+
+
+def read_frontmatter(file_path: Path) -> Tuple[Optional[dict], int, LazyBody]:
+    """Stream a file's frontmatter, stopping at the closing ---.
+
+    Same result as extract_frontmatter(file_path.read_text()), except the
+    body is a LazyBody that is only read if a rule asks for it. Reading
+    stops once the header passes ParseLimits.max_bytes.
+    """
+    limit = _limits.max_bytes
+    with _phase('read'), open(file_path, encoding='utf-8') as f:
+        if not f.readline().startswith('---'):
+            return None, 0, LazyBody(file_path, 0)
+
+        header_lines = []
+        chars = 0
+        while True:
+            # A line longer than the limit is never read whole
+            line = f.readline(limit + 1) if limit else f.readline()
+            if not line:
+                return None, 0, LazyBody(file_path, 0)
+            if line.strip() == '---':
+                break
+            chars += len(line) if line.endswith('\n') else len(line) + 1
+            if limit and chars > limit:
+                raise FrontmatterLimitError('FM003', limit)
+            header_lines.append(line[:-1] if line.endswith('\n') else line)
+        offset = f.tell()
+
+    _check_header_size(header_lines, chars)
+    end_line = len(header_lines) + 2
+    return _parse_frontmatter(header_lines), end_line, LazyBody(file_path, offset)
+
+
+def is_array(value) -> bool:
+    """Check if value is an array (list) instead of comma-separated string."""
+    return isinstance(value, list)
+
+
+_NAME_RE = re.compile(r'^[a-z][a-z0-9-]*$')
+
+
+def validate_lowercase_hyphenated(value: str) -> bool:
+    """Validate name is lowercase-hyphenated."""
+    if not isinstance(value, str):
+        return False
+    return bool(_NAME_RE.match(value))
+
+
+# MCP tool patterns, checked in order
+_MCP_PATTERNS = [
+    (re.compile(r'mcp__(?!claude_ai_Linear).*linear', re.IGNORECASE), 'Linear MCP - delegate to linear-service agent'),
+    (re.compile(r'mcp__.*[Nn]otion', re.IGNORECASE), 'Notion MCP - delegate to life-notion agent'),
+    (re.compile(r'mcp__.*calendar', re.IGNORECASE), 'Calendar MCP - delegate to life-calendar agent'),
+]
+
+
+def check_mcp_tools(tools_str: str, agent_name: str) -> Optional[str]:
+    """Check if non-wrapper agent has MCP tools (anti-pattern)."""
+    if not tools_str:
+        return None
+
+    # Check if agent is a wrapper
+    if agent_name in MCP_WRAPPER_AGENTS:
+        return None
+
+    # Every pattern needs the prefix, so most tool lists exit here
+    if 'mcp__' not in tools_str.lower():
+        return None
+
+    for pattern, message in _MCP_PATTERNS:
+        if pattern.search(tools_str):
+            return message
+
+    return None
+
+
+class Rule(NamedTuple):
+    """A single validation rule.
+
+    Bump `version` whenever a rule's behaviour changes: cached results are
+    stored per rule, so only rules whose version moved are re-run.
+    """
+    id: str
+    version: int
+    check: Callable[[dict, str, Body], List[ValidationIssue]]
+    tokens: FrozenSet[str] = frozenset()  # BODY_TOKENS the rule reads
+
+
+def _split_issues(issues: List[ValidationIssue], errors: List[ValidationIssue], warnings: List[ValidationIssue]) -> None:
+    """Append issues to errors or warnings by severity."""
+    for issue in issues:
+        if issue.severity == 'warning':
+            warnings.append(issue)
+        else:
+            errors.append(issue)
+
+
+def prepare_body(body: Body, rules: List[Rule]) -> LazyBody:
+    """Set up one shared body scan covering the tokens these rules read."""
+    if not isinstance(body, LazyBody):
+        body = LazyBody.from_text(body)
+    body.tokens = frozenset().union(*(rule.tokens for rule in rules))
+    return body
+
+
+def _body_scan(body: Body) -> BodyScan:
+    if isinstance(body, LazyBody):
+        return body.scan()
+    return scan_body(body, abspath_limit=MAX_ABSOLUTE_PATH_WARNINGS)
+
+
+def locate_issues(issues: List[ValidationIssue], frontmatter: dict) -> List[ValidationIssue]:
+    """Move issues about a field from line 1 to the line the field is on.
+
+    Rules report at line 1 unless they know better; the field comes from
+    ISSUE_CODES and its line from the parser's key_lines, so a field that
+    is missing stays at 1 (or goes to its parent, for metadata.x).
+    """
+    if not getattr(frontmatter, 'key_lines', None):
+        return issues
+    located = []
+    for issue in issues:
+        if issue.line == 1:
+            line = key_line(frontmatter, issue.field)
+            if line != 1:
+                issue = issue._replace(line=line)
+        located.append(issue)
+    return located
+
+
+def apply_rules(rules: List[Rule], frontmatter: dict, file_path: str, body: Body) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+    """Run rules in order and split their issues into errors and warnings."""
+    errors = []  # type: List[ValidationIssue]
+    warnings = []  # type: List[ValidationIssue]
+    body = prepare_body(body, rules)
+    for rule in rules:
+        with _rule_timer(rule.id):
+            issues = rule.check(frontmatter, file_path, body)
+        if issues:
+            _split_issues(locate_issues(issues, frontmatter), errors, warnings)
+    return errors, warnings
+
+
+def _check_name_format(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """Name must be lowercase-hyphenated."""
+    if 'name' in frontmatter and not validate_lowercase_hyphenated(frontmatter['name']):
+        return [ValidationIssue.new(file_path, 'FM104', frontmatter['name'])]
+    return []
+
+
+def _check_known_fields(known_fields: frozenset) -> Callable[[dict, str, Body], List[ValidationIssue]]:
+    """Build a rule flagging fields that belong in metadata or are non-standard."""
+
+    def check(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+        issues = []
+        for field in frontmatter.keys():
+            if field in METADATA_FIELDS:
+                issues.append(ValidationIssue.new(file_path, 'FM102', field))
+            elif field not in known_fields:
+                issues.append(ValidationIssue.new(file_path, 'FM103', field))
+        return issues
+
+    return check
+
+
+def _check_required(required: List[str]) -> Callable[[dict, str, Body], List[ValidationIssue]]:
+    """Build a rule flagging missing required fields."""
+
+    def check(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+        return [
+            ValidationIssue.new(file_path, 'FM101', field)
+            for field in required
+            if field not in frontmatter
+        ]
+
+    return check
+
+
+# ── Agent rules (agent-frontmatter.md and handoff checklist) ──
+
+
+def _check_agent_tools_field(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """ERROR if agent uses 'allowed-tools' instead of 'tools'."""
+    if 'allowed-tools' in frontmatter and 'tools' not in frontmatter:
+        return [ValidationIssue.new(file_path, 'FM201')]
+    return []
+
+
+def _check_agent_skills(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """Recommended field (warning per handoff)."""
+    if 'skills' not in frontmatter:
+        return [ValidationIssue.new(file_path, 'FM202')]
+    return []
+
+
+def _check_agent_capabilities(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """Capabilities now live in metadata.capabilities."""
+    metadata = frontmatter.get('metadata', {})
+    if not isinstance(metadata, dict):
+        metadata = {}
+    if 'capabilities' not in metadata:
+        return [ValidationIssue.new(file_path, 'FM203')]
+    return []
+
+
+def _check_agent_color(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """Color must be one of VALID_COLORS."""
+    if 'color' in frontmatter and frontmatter['color'] not in VALID_COLORS:
+        return [ValidationIssue.new(file_path, 'FM204', frontmatter['color'])]
+    return []
+
+
+def _check_agent_mcp_tools(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """MCP delegation check."""
+    agent_name = frontmatter.get('name', '')
+    tools_str = frontmatter.get('tools', '')
+    if isinstance(tools_str, str):
+        mcp_issue = check_mcp_tools(tools_str, agent_name)
+        if mcp_issue:
+            return [ValidationIssue.new(file_path, 'FM205', mcp_issue)]
+    return []
+
+
+def _check_agent_absolute_paths(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """Check for absolute paths in body."""
+    return [
+        ValidationIssue.new(file_path, 'FM206', line=line_num)
+        for line_num in _body_scan(body).absolute_path_lines
+    ]
+
+
+# Arrays are valid YAML - Claude accepts both formats, so no rule checks
+# array vs comma-separated values
+AGENT_RULES = [
+    Rule('agent-tools-field', 1, _check_agent_tools_field),
+    Rule('agent-required-fields', 1, _check_required(['name', 'description', 'color', 'tools'])),
+    Rule('agent-skills', 1, _check_agent_skills),
+    Rule('agent-capabilities', 1, _check_agent_capabilities),
+    Rule('agent-name-format', 1, _check_name_format),
+    Rule('agent-color', 1, _check_agent_color),
+    Rule('agent-mcp-tools', 1, _check_agent_mcp_tools),
+    Rule('agent-absolute-paths', 1, _check_agent_absolute_paths, frozenset(['abspath'])),
+    Rule('agent-known-fields', 1, _check_known_fields(AGENT_FIELDS)),
+]
+
+
+def validate_agent(frontmatter: dict, file_path: str, body: Body) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+    """Validate agent frontmatter per agent-frontmatter.md and handoff checklist."""
+    return apply_rules(AGENT_RULES, frontmatter, file_path, body)
+
+
+# ── Command rules (command-frontmatter.md) ──
+
+
+def _check_command_tools_field(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """ERROR if command uses 'tools' instead of 'allowed-tools'."""
+    if 'tools' in frontmatter and 'allowed-tools' not in frontmatter:
+        return [ValidationIssue.new(file_path, 'FM301')]
+    return []
+
+
+def _check_command_has_tools(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """Tools are recommended but not strictly required (some commands just route)."""
+    if 'tools' not in frontmatter and 'allowed-tools' not in frontmatter:
+        return [ValidationIssue.new(file_path, 'FM302')]
+    return []
+
+
+def _check_command_arguments(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """Commands should include the $ARGUMENTS placeholder."""
+    if not _body_scan(body).has_arguments:
+        return [ValidationIssue.new(file_path, 'FM303')]
+    return []
+
+
+def _check_command_table_routing(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """Table-based routing is an anti-pattern per handoff."""
+    if _body_scan(body).table_routing:
+        return [ValidationIssue.new(file_path, 'FM304')]
+    return []
+
+
+COMMAND_RULES = [
+    Rule('command-tools-field', 1, _check_command_tools_field),
+    Rule('command-required-fields', 1, _check_required(['description'])),
+    Rule('command-has-tools', 1, _check_command_has_tools),
+    Rule('command-arguments', 1, _check_command_arguments, frozenset(['arguments'])),
+    Rule('command-table-routing', 1, _check_command_table_routing, frozenset(['table'])),
+    Rule('command-known-fields', 1, _check_known_fields(COMMAND_FIELDS)),
+]
+
+
+def validate_command(frontmatter: dict, file_path: str, body: Body) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+    """Validate command frontmatter per command-frontmatter.md spec."""
+    return apply_rules(COMMAND_RULES, frontmatter, file_path, body)
+
+
+# ── Skill rules (skill-frontmatter.md) ──
+
+
+def _check_skill_tools_field(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """ERROR if skill uses 'tools' instead of 'allowed-tools'."""
+    if 'tools' in frontmatter and 'allowed-tools' not in frontmatter:
+        return [ValidationIssue.new(file_path, 'FM401')]
+    return []
+
+
+def _check_skill_name_matches_dir(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """Skill name should match directory name."""
+    if 'name' not in frontmatter:
+        return []
+    match = SKILL_PATTERN.search(file_path.replace('\\', '/'))
+    if match:
+        dir_name = match.group(1)
+        if frontmatter['name'] != dir_name:
+            return [ValidationIssue.new(file_path, 'FM402', frontmatter['name'], dir_name)]
+    return []
+
+
+def _check_skill_description(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """Description should explain WHAT + WHEN (per handoff)."""
+    desc = frontmatter.get('description', '')
+    if desc and len(desc) < 20:
+        return [ValidationIssue.new(file_path, 'FM403')]
+    return []
+
+
+def _check_skill_arguments(frontmatter: dict, file_path: str, body: Body) -> List[ValidationIssue]:
+    """$ARGUMENTS in skills is an anti-pattern."""
+    if _body_scan(body).has_arguments:
+        return [ValidationIssue.new(file_path, 'FM404')]
+    return []
+
+
+SKILL_RULES = [
+    Rule('skill-tools-field', 1, _check_skill_tools_field),
+    Rule('skill-required-fields', 1, _check_required(['name', 'description'])),
+    Rule('skill-name-format', 1, _check_name_format),
+    Rule('skill-name-matches-dir', 1, _check_skill_name_matches_dir),
+    Rule('skill-description', 1, _check_skill_description),
+    Rule('skill-arguments', 1, _check_skill_arguments, frozenset(['arguments'])),
+    Rule('skill-known-fields', 1, _check_known_fields(SKILL_FIELDS)),
+]
+
+
+def validate_skill(frontmatter: dict, file_path: str, body: Body) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+    """Validate skill frontmatter per skill-frontmatter.md spec."""
+    return apply_rules(SKILL_RULES, frontmatter, file_path, body)
+
+
+RULES_BY_TYPE = {
+    'agent': AGENT_RULES,
+    'command': COMMAND_RULES,
+    'skill': SKILL_RULES,
+}  # type: Dict[str, List[Rule]]
+
+
+def get_file_type(file_path: str) -> Optional[str]:
+    """Determine file type from path."""
+    # Normalize path separators
+    normalized = file_path.replace('\\', '/')
+
+    if AGENT_PATTERN.search(normalized):
+        return 'agent'
+    elif COMMAND_PATTERN.search(normalized):
+        return 'command'
+    elif SKILL_PATTERN.search(normalized):
+        return 'skill'
+    return None
+
+
+def _read_error(file_path: Path, error: Exception) -> ValidationIssue:
+    return ValidationIssue.new(str(file_path), 'FM002', error)
+
+
+def _missing_frontmatter(file_path: Path) -> ValidationIssue:
+    return ValidationIssue.new(str(file_path), 'FM001')
+
+
+def validate_file(file_path: Path) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+    """Validate a single file's frontmatter and content.
+
+    Only the frontmatter is read up front; the body is loaded when the first
+    body rule needs it.
+    """
+    errors, warnings, _ = validate_file_symbols(file_path)
+    return errors, warnings
+
+
+def validate_file_symbols(file_path: Path) -> Tuple[List[ValidationIssue], List[ValidationIssue], Optional['FileSymbols']]:
+    """validate_file, plus the names the file defines and references."""
+    # Determine file type
+    file_type = get_file_type(str(file_path))
+    if file_type is None:
+        return [], [], None  # Not a validatable file
+
+    # Read and extract frontmatter
+    try:
+        frontmatter, end_line, body = read_frontmatter(file_path)
+    except FrontmatterLimitError as e:
+        return [e.issue(file_path)], [], None
+    except Exception as e:
+        return [_read_error(file_path, e)], [], None
+
+    if frontmatter is None:
+        return [_missing_frontmatter(file_path)], [], None
+
+    # Validate based on file type
+    symbols = extract_symbols(frontmatter, str(file_path), file_type)
+    try:
+        errors, warnings = apply_rules(RULES_BY_TYPE[file_type], frontmatter, str(file_path), body)
+    except (OSError, UnicodeDecodeError) as e:
+        # The body is read lazily, so a bad body surfaces here
+        return [_read_error(file_path, e)], [], symbols
+    return errors, warnings, symbols
+
+
+# ── Skill reference files ──
+
+
+# Markdown a skill keeps beside SKILL.md, scanned with --references
+REFERENCES_GLOB = '*/skills/*/references/**/*.md'
+REFERENCE_PATTERN = re.compile(r'plugins/[^/]+/skills/[^/]+/references/.+\.md$')
+
+# Only this much of a reference file is scanned (FM602 reports the rest)
+REFERENCE_MAX_BYTES = 8 * 1024 * 1024
+
+# Newlines are counted a slice at a time, so a scan never copies more
+# than this much of a mapped file
+_NEWLINE_CHUNK = 1024 * 1024
+
+# The agent body patterns, as bytes
+_REFERENCE_ABSPATH = re.compile(BODY_TOKENS['abspath'].encode('ascii'))
+_COMMENT_START = re.compile(rb'[ \t\r\f\v]*(?:#|//)')
+
+
+def find_reference_files(plugins_dir: Path) -> List[Path]:
+    return sorted(plugins_dir.glob(REFERENCES_GLOB))
+
+
+def is_reference_file(file_path: Path) -> bool:
+    return REFERENCE_PATTERN.search(file_path.as_posix()) is not None
+
+
+def _count_newlines(data, start: int, end: int) -> int:
+    count = 0
+    while start < end:
+        stop = min(end, start + _NEWLINE_CHUNK)
+        count += data[start:stop].count(b'\n')
+        start = stop
+    return count
+
+
+def scan_reference(file_path: Path, limit: Optional[int] = MAX_ABSOLUTE_PATH_WARNINGS,
+                   max_bytes: int = REFERENCE_MAX_BYTES) -> Tuple[List[int], int]:
+    """Lines of a reference file with absolute paths, and the file's size.
+
+    The file is memory-mapped and never decoded: the bytes pattern runs
+    over the mapping, and a hit only costs counting the newlines since the
+    previous one and checking whether its line is a comment, as
+    check_absolute_paths() does. Only the first max_bytes are scanned.
+    """
+    import mmap
+
+    lines = []  # type: List[int]
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return lines, size  # an empty file cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            line_num = 1
+            counted_to = 0
+            last_line = 0
+            for match in _REFERENCE_ABSPATH.finditer(data, 0, min(size, max_bytes)):
+                pos = match.start()
+                line_num += _count_newlines(data, counted_to, pos)
+                counted_to = pos
+                if line_num == last_line:
+                    continue
+                last_line = line_num
+                if _COMMENT_START.match(data, data.rfind(b'\n', 0, pos) + 1):
+                    continue
+                lines.append(line_num)
+                if limit is not None and len(lines) >= limit:
+                    break
+    return lines, size
+
+
+def validate_reference(file_path: Path) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+    """Body rules for one reference file: absolute paths, and whether it was cut short."""
+    try:
+        with _phase('references'):
+            lines, size = scan_reference(file_path, max_bytes=REFERENCE_MAX_BYTES)
+    except (OSError, ValueError) as e:
+        return [_read_error(file_path, e)], []
+    warnings = [ValidationIssue.new(str(file_path), 'FM601', line=line) for line in lines]
+    if size > REFERENCE_MAX_BYTES:
+        warnings.append(ValidationIssue.new(str(file_path), 'FM602', REFERENCE_MAX_BYTES, size))
+    return [], warnings
+
+
+def iter_reference_results(files: List[Path]) -> Iterator[Tuple[Path, List[ValidationIssue], List[ValidationIssue]]]:
+    """Scan reference files, yielding (file, errors, warnings) in input order."""
+    for file_path in files:
+        errors, warnings = validate_reference(file_path)
+        yield file_path, errors, warnings
+
+
+# ── Cross-file symbol index ──
+
+
+class FileSymbols(NamedTuple):
+    """The name a file defines and the names its frontmatter references."""
+    kind: str  # 'agent', 'command' or 'skill'
+    name: str
+    references: List[Tuple[str, str, str, int]]  # (kind, name, field, line)
+    line: int = 1  # of the 'name' key, or 1 when the name comes from the path
+
+
+def _names(value) -> List[str]:
+    """Names from a comma-separated string or a YAML list."""
+    if isinstance(value, str):
+        value = value.split(',')
+    elif not isinstance(value, list):
+        return []
+    return [name for name in (str(v).strip() for v in value) if name]
+
+
+def extract_symbols(frontmatter: dict, file_path: str, file_type: str) -> FileSymbols:
+    """Agents and skills are named by 'name' (else their file or directory),
+    commands by their file name, as they are invoked."""
+    normalized = file_path.replace('\\', '/')
+    if file_type == 'skill':
+        match = SKILL_PATTERN.search(normalized)
+        default = match.group(1) if match else ''
+    else:
+        default = normalized.rsplit('/', 1)[-1][:-len('.md')]
+    name = frontmatter.get('name') if file_type != 'command' else None
+    line = 1
+    if isinstance(name, str) and name.strip():
+        name, line = name.strip(), key_line(frontmatter, 'name')
+    else:
+        name = default
+
+    skills_line = key_line(frontmatter, 'skills')
+    references = [('skill', ref, 'skills', skills_line) for ref in _names(frontmatter.get('skills'))]
+    if file_type == 'skill':
+        agent_line = key_line(frontmatter, 'agent')
+        references.extend(('agent', ref, 'agent', agent_line) for ref in _names(frontmatter.get('agent'))
+                          if ref not in BUILTIN_AGENTS)
+    return FileSymbols(file_type, name, references, line)
+
+
+_external_skills = EXTERNAL_SKILLS
+
+
+def set_external_skills(names) -> None:
+    """Skill names every later check() accepts without a definition."""
+    global _external_skills
+    _external_skills = frozenset(names)
+
+
+class SymbolIndex:
+    """Every agent, command and skill name in the tree, keyed by plugin.
+
+    Files are added as they are validated; check() then resolves every
+    reference and finds every duplicate with dict lookups, so the cost
+    is linear in files plus references. A reference may be qualified as
+    'plugin:name' to name a specific plugin's definition; an unqualified
+    skill in the external set (see set_external_skills) always resolves.
+    """
+
+    def __init__(self):
+        # file -> its symbols (None if it has no frontmatter), in the order added
+        self.files = {}  # type: Dict[str, Optional[FileSymbols]]
+        # (kind, name) -> [(plugin, file, line)] in the order files were added
+        self.definitions = {}  # type: Dict[Tuple[str, str], List[Tuple[str, str, int]]]
+        # plugin -> (kind, name) defined there
+        self.by_plugin = {}  # type: Dict[str, set]
+        # (file, kind, name, field, line) in the order they were seen
+        self.references = []  # type: List[Tuple[str, str, str, str, int]]
+        # (file, agent name, location) from team rosters, and the plugin they belong to
+        self.roster_references = []  # type: List[Tuple[str, str, str, Optional[str]]]
+
+    def add(self, file_path: str, symbols: Optional[FileSymbols]) -> None:
+        self.files[file_path] = symbols
+        if symbols is None:
+            return
+        kind, name = symbols.kind, symbols.name
+        match = PLUGIN_PATTERN.search(file_path.replace('\\', '/'))
+        plugin = match.group(1) if match else ''
+        self.definitions.setdefault((kind, name), []).append((plugin, file_path, symbols.line))
+        self.by_plugin.setdefault(plugin, set()).add((kind, name))
+        for ref_kind, ref_name, field, line in symbols.references:
+            self.references.append((file_path, ref_kind, ref_name, field, line))
+
+    def add_team_members(self, roster_path: Path) -> None:
+        """Record agent names from a team-members.json roster.
+
+        Every string under an "agent" key or in an "agents" list is a
+        reference. One inside an object with a "plugin" key belongs to that
+        plugin, and is skipped by check() when the plugin is not in the tree.
+        """
+        import json
+        try:
+            with open(roster_path, encoding='utf-8') as f:
+                roster = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.add_roster(str(roster_path), roster)
+
+    def add_roster(self, file_path: str, roster) -> None:
+        """add_team_members() for a roster already parsed."""
+        def walk(node, location: str, plugin: Optional[str]) -> None:
+            if isinstance(node, dict):
+                if isinstance(node.get('plugin'), str):
+                    plugin = node['plugin']
+                for key, value in node.items():
+                    if key == 'agent' and isinstance(value, str):
+                        self.roster_references.append((file_path, value, f"{location}/{key}", plugin))
+                    elif key == 'agents' and isinstance(value, list):
+                        for i, item in enumerate(value):
+                            if isinstance(item, str):
+                                self.roster_references.append((file_path, item, f"{location}/{key}/{i}", plugin))
+                    else:
+                        walk(value, f"{location}/{key}", plugin)
+            elif isinstance(node, list):
+                for i, item in enumerate(node):
+                    walk(item, f"{location}/{i}", plugin)
+
+        walk(roster, '', None)
+
+    def defines(self, kind: str, name: str) -> bool:
+        plugin, sep, bare = name.partition(':')
+        if sep:
+            return (kind, bare) in self.by_plugin.get(plugin, ())
+        if kind == 'skill' and name in _external_skills:
+            return True
+        return (kind, name) in self.definitions
+
+    def check(self) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+        """Issues for unresolved references and duplicate names."""
+        errors = []  # type: List[ValidationIssue]
+        warnings = []  # type: List[ValidationIssue]
+
+        for (kind, name), defined_in in self.definitions.items():
+            first_plugin, first_file, _ = defined_in[0]
+            for plugin, file_path, line in defined_in[1:]:
+                if plugin == first_plugin:
+                    errors.append(ValidationIssue.new(file_path, 'FM503', kind, name, first_file, line=line))
+                else:
+                    warnings.append(ValidationIssue.new(
+                        file_path, 'FM504', kind.capitalize(), name, first_plugin, first_file, line=line))
+
+        for file_path, kind, name, field, line in self.references:
+            if not self.defines(kind, name):
+                warnings.append(ValidationIssue.new(file_path, 'FM501', field, kind, name, line=line))
+
+        for file_path, name, location, plugin in self.roster_references:
+            if plugin is not None and plugin not in self.by_plugin:
+                continue  # a plugin outside this tree
+            if not self.defines('agent', name):
+                warnings.append(ValidationIssue.new(file_path, 'FM502', name, location))
+
+        return errors, warnings
+
+
+def find_team_rosters(plugins_dir: Path) -> List[Path]:
+    return sorted(plugins_dir.glob(TEAM_MEMBERS_GLOB))
+
+
+def git_blob_id(data: bytes) -> str:
+    """Hash content the way `git hash-object` does, so ids match the index."""
+    import hashlib
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode file bytes the way Path.read_text() does (UTF-8, universal newlines)."""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+class ValidationCache:
+    """Persistent per-file validation results.
+
+    Entries are keyed by file path and hold the content's git blob id, the
+    stat fingerprint it was seen with, and each rule's issues tagged with
+    that rule's version. An unchanged stat skips hashing entirely; a changed
+    rule version re-runs only that rule.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries = {}  # type: Dict[str, dict]
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> 'ValidationCache':
+        """Load a cache file, starting empty if it is missing, corrupt or stale."""
+        import json
+
+        cache = cls(path)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+        if isinstance(data, dict) and data.get('format') == CACHE_FORMAT:
+            cache.entries = data.get('entries', {})
+        return cache
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.entries.get(key)
+
+    def put(self, key: str, entry: Optional[dict]) -> None:
+        if entry is None:
+            if self.entries.pop(key, None) is not None:
+                self.dirty = True
+        elif self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self.dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically if anything changed."""
+        if not self.dirty:
+            return
+        import json
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': CACHE_FORMAT, 'entries': self.entries}, f,
+                      separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def _replay_issues(file_path: str, results: Dict[str, list], rule_ids: List[str]) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+    """Rebuild errors and warnings from cached per-rule results, in rule order."""
+    errors = []  # type: List[ValidationIssue]
+    warnings = []  # type: List[ValidationIssue]
+    file = intern_file(file_path)
+    for rule_id in rule_ids:
+        if rule_id in results:
+            _split_issues(
+                [ValidationIssue(file, line, code, intern_params(params)) for line, code, params in results[rule_id]],
+                errors, warnings
+            )
+    return errors, warnings
+
+
+def _rule_versions(file_type: str) -> Tuple[Dict[str, int], List[str]]:
+    """Current version of every cached rule for a file type, and their order."""
+    rules = RULES_BY_TYPE[file_type]
+    versions = {rule.id: rule.version for rule in rules}
+    versions[PARSE_RULE_ID] = parse_version()
+    return versions, [PARSE_RULE_ID] + [rule.id for rule in rules]
+
+
+def _current_results(entry: Optional[dict], blob: str, file_type: str) -> Dict[str, list]:
+    """Cached per-rule issues still valid for this blob at current rule versions."""
+    if entry is None or entry.get('blob') != blob or entry.get('type') != file_type:
+        return {}
+    versions, _ = _rule_versions(file_type)
+    return {
+        rule_id: issues
+        for rule_id, (version, issues) in entry['rules'].items()
+        if versions.get(rule_id) == version
+    }
+
+
+def _results_complete(fresh: Dict[str, list], rule_ids: List[str]) -> bool:
+    parse_issues = fresh.get(PARSE_RULE_ID)
+    # A parse failure stands alone: no other rule ran
+    return bool(parse_issues) or (parse_issues is not None and all(r in fresh for r in rule_ids))
+
+
+def cached_blob_issues(file_path: Path, blob: str, entry: Optional[dict]) -> Optional[Tuple[List[ValidationIssue], List[ValidationIssue]]]:
+    """Issues for a blob replayed from its cache entry, or None if any rule must run."""
+    file_type = get_file_type(str(file_path))
+    if file_type is None:
+        return [], []
+    _, rule_ids = _rule_versions(file_type)
+    fresh = _current_results(entry, blob, file_type)
+    if not _results_complete(fresh, rule_ids):
+        return None
+    return _replay_issues(str(file_path), fresh, rule_ids)
+
+
+def validate_blob(file_path: Path, blob: str, data: Optional[bytes], entry: Optional[dict]) -> Tuple[List[ValidationIssue], List[ValidationIssue], Optional[dict]]:
+    """Validate content with a known blob id, reusing current cached rule results.
+
+    data is the content, or None to stream it from file_path if any rule
+    has to run. Returns (errors, warnings, new cache entry); the entry has
+    no stat fingerprint and is None when the file is not validatable or
+    its parse ran out of time.
+    """
+    path_str = str(file_path)
+    file_type = get_file_type(path_str)
+    if file_type is None:
+        return [], [], None
+
+    rules = RULES_BY_TYPE[file_type]
+    versions, rule_ids = _rule_versions(file_type)
+    fresh = _current_results(entry, blob, file_type)
+
+    limit_error = None  # type: Optional[FrontmatterLimitError]
+    if _results_complete(fresh, rule_ids):
+        results = fresh
+        symbols = entry.get('symbols')
+    else:
+        try:
+            if data is None:
+                # Only stale rules run: stream the header and leave the body on
+                # disk unless one of them needs it
+                frontmatter, _, body = read_frontmatter(file_path)
+            else:
+                frontmatter, _, body = extract_frontmatter(_decode_text(data))
+        except FrontmatterLimitError as e:
+            frontmatter, limit_error = None, e
+        if PARSE_RULE_ID not in fresh:
+            # New parser output can change what every rule sees
+            fresh = {}
+        if limit_error is not None:
+            results = {PARSE_RULE_ID: [[1, limit_error.code, list(limit_error.params)]]}
+            symbols = None
+        elif frontmatter is None:
+            results = {PARSE_RULE_ID: [[1, 'FM001', []]]}
+            symbols = None
+        else:
+            results = {PARSE_RULE_ID: []}
+            kind, name, references, line = extract_symbols(frontmatter, path_str, file_type)
+            symbols = [kind, name, [list(ref) for ref in references], line]
+            body = prepare_body(body, [rule for rule in rules if rule.id not in fresh])
+            for rule in rules:
+                if rule.id in fresh:
+                    results[rule.id] = fresh[rule.id]
+                else:
+                    with _rule_timer(rule.id):
+                        issues = locate_issues(rule.check(frontmatter, path_str, body), frontmatter)
+                    results[rule.id] = [[i.line, i.code, list(i.params)] for i in issues]
+
+    errors, warnings = _replay_issues(path_str, results, rule_ids)
+    if limit_error is not None and not limit_error.cacheable:
+        return errors, warnings, None
+    new_entry = {
+        'type': file_type,
+        'blob': blob,
+        'stat': None,
+        'rules': {rule_id: [versions[rule_id], issues] for rule_id, issues in results.items()},
+        'symbols': symbols,
+    }
+    return errors, warnings, new_entry
+
+
+def entry_symbols(entry: Optional[dict]) -> Optional[FileSymbols]:
+    """The FileSymbols recorded in a cache entry from validate_blob."""
+    if entry is None or entry.get('symbols') is None:
+        return None
+    kind, name, references, line = entry['symbols']
+    return FileSymbols(kind, name, [tuple(ref) for ref in references], line)
+
+
+def validate_file_cached(file_path: Path, entry: Optional[dict]) -> Tuple[List[ValidationIssue], List[ValidationIssue], Optional[dict]]:
+    """Validate a file, reusing cached per-rule results that are still current.
+
+    Returns (errors, warnings, new cache entry). The entry is None when the
+    file is not validatable or cannot be read; read errors are never cached.
+    """
+    if get_file_type(str(file_path)) is None:
+        return [], [], None
+
+    try:
+        st = file_path.stat()
+        fingerprint = [st.st_size, st.st_mtime_ns]
+        data = None
+        if entry is not None and entry.get('stat') == fingerprint:
+            blob = entry['blob']
+        else:
+            with _phase('read'):
+                data = file_path.read_bytes()
+            with _phase('hash'):
+                blob = git_blob_id(data)
+        errors, warnings, new_entry = validate_blob(file_path, blob, data, entry)
+    except (OSError, UnicodeDecodeError):
+        # Let the uncached path produce the usual "Cannot read file" issue
+        errors, warnings = validate_file(file_path)
+        return errors, warnings, None
+
+    if new_entry is not None:
+        new_entry['stat'] = fingerprint
+    return errors, warnings, new_entry
+
+
+def find_plugin_files(plugins_dir: Path, snapshot=None) -> List[Path]:
+    """Find all validatable markdown files in plugins directory.
+
+    snapshot, if given, answers directory listings instead of the filesystem
+    (see validate-all.py), so other validators can reuse them.
+    """
+    if snapshot is not None:
+        return _find_plugin_files_in(snapshot, plugins_dir)
+    return [file_path for batch in iter_plugin_file_batches(plugins_dir) for file_path in batch]
+
+
+def iter_plugin_file_batches(plugins_dir: Path) -> Iterator[List[Path]]:
+    """find_plugin_files() one plugin at a time, in the same order, so
+    callers can start on the first files while the rest are being listed."""
+    for plugin_dir in plugins_dir.iterdir():
+        if not plugin_dir.is_dir():
+            continue
+        batch = []  # type: List[Path]
+
+        # Agents
+        agents_dir = plugin_dir / 'agents'
+        if agents_dir.exists():
+            batch.extend(agents_dir.glob('*.md'))
+
+        # Commands
+        commands_dir = plugin_dir / 'commands'
+        if commands_dir.exists():
+            batch.extend(commands_dir.glob('*.md'))
+
+        # Skills (SKILL.md only, not references)
+        skills_dir = plugin_dir / 'skills'
+        if skills_dir.exists():
+            for skill_dir in skills_dir.iterdir():
+                if skill_dir.is_dir():
+                    skill_file = skill_dir / 'SKILL.md'
+                    if skill_file.exists():
+                        batch.append(skill_file)
+
+        if batch:
+            yield batch
+
+
+def _find_plugin_files_in(snapshot, plugins_dir: Path) -> List[Path]:
+    """find_plugin_files() over snapshot listings, in the same order."""
+    files = []  # type: List[Path]
+
+    for plugin_name, plugin_is_dir in (snapshot.listdir(plugins_dir) or {}).items():
+        if not plugin_is_dir:
+            continue
+        plugin_dir = plugins_dir / plugin_name
+        entries = snapshot.listdir(plugin_dir) or {}
+
+        for kind in ('agents', 'commands'):
+            if kind in entries:
+                kind_dir = plugin_dir / kind
+                files.extend(kind_dir / name for name in (snapshot.listdir(kind_dir) or {})
+                             if name.endswith('.md'))
+
+        if 'skills' in entries:
+            skills_dir = plugin_dir / 'skills'
+            for skill_name, skill_is_dir in (snapshot.listdir(skills_dir) or {}).items():
+                if skill_is_dir:
+                    skill_file = skills_dir / skill_name / 'SKILL.md'
+                    if snapshot.exists(skill_file):
+                        files.append(skill_file)
+
+    return files
+
+
+def resolve_jobs(jobs: int, file_count: int) -> int:
+    """Pick the worker count for a run.
+
+    jobs <= 0 means one worker per CPU. Small inputs always run serially.
+    """
+    if file_count < PARALLEL_MIN_FILES:
+        return 1
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return max(1, min(jobs, file_count))
+
+
+def _map_ordered(func: Callable, items: list, workers: int) -> Iterator:
+    """Apply func to items, in a process pool when workers > 1, preserving order."""
+    if workers == 1:
+        for item in items:
+            yield func(item)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # A few chunks per worker keeps IPC overhead low without starving
+    # workers at the tail of the run
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_parse_limits, initargs=(_limits,)) as pool:
+        yield from pool.map(func, items, chunksize=chunksize)
+
+
+def _validate_cached_job(job: Tuple[Path, Optional[dict]]) -> Tuple[List[ValidationIssue], List[ValidationIssue], Optional[dict]]:
+    return validate_file_cached(*job)
+
+
+def iter_file_results(files: List[Path], jobs: int = 1, cache: Optional[ValidationCache] = None,
+                      index: Optional[SymbolIndex] = None) -> Iterator[Tuple[Path, List[ValidationIssue], List[ValidationIssue]]]:
+    """Validate files, yielding (file, errors, warnings) in input order.
+
+    With more than one worker the files are fanned out to a process pool;
+    results are still yielded in input order so output matches a serial run.
+    With a cache, lookups and updates happen here in the parent process, as
+    do additions to index.
+    """
+    workers = resolve_jobs(jobs, len(files))
+    func = validate_file_symbols if cache is None else _validate_cached_job
+    if _profiler is not None:
+        # Timings are only attributable in-process
+        workers = 1
+        func = _profiler.time_files(func)
+
+    if cache is None:
+        for file_path, (errors, warnings, symbols) in zip(files, _map_ordered(func, files, workers)):
+            if index is not None:
+                index.add(str(file_path), symbols)
+            yield file_path, errors, warnings
+        return
+
+    jobs_list = [(file_path, cache.get(str(file_path))) for file_path in files]
+    for file_path, (errors, warnings, entry) in zip(files, _map_ordered(func, jobs_list, workers)):
+        cache.put(str(file_path), entry)
+        if index is not None:
+            index.add(str(file_path), entry_symbols(entry))
+        yield file_path, errors, warnings
+
+
+def with_index_issues(file_results: Iterator[Tuple[Path, List[ValidationIssue], List[ValidationIssue]]],
+                      index: SymbolIndex) -> Iterator[Tuple[Optional[Path], List[ValidationIssue], List[ValidationIssue]]]:
+    """Pass file results through, then yield (None, errors, warnings) from index.check()."""
+    yield from file_results
+    errors, warnings = index.check()
+    yield None, errors, warnings
+
+
+def validate_files(files: List[Path], jobs: int = 1, cache: Optional[ValidationCache] = None,
+                   index: Optional[SymbolIndex] = None) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+    """Validate files and merge their issues in input order.
+
+    With an index, files are added to it and its cross-file issues follow
+    the per-file ones.
+    """
+    all_errors = []  # type: List[ValidationIssue]
+    all_warnings = []  # type: List[ValidationIssue]
+
+    file_results = iter_file_results(files, jobs, cache, index)
+    if index is not None:
+        file_results = with_index_issues(file_results, index)
+    for _, errors, warnings in file_results:
+        all_errors.extend(errors)
+        all_warnings.extend(warnings)
+
+    return all_errors, all_warnings
+
+
+# ── Pipelined mode ──
+
+
+def _read_batch(batch: List[Path], cache: Optional[ValidationCache]) -> List[tuple]:
+    """Read stage: (file, data, stat fingerprint, error) per file.
+
+    data is None when the cache already has the file at this fingerprint.
+    """
+    read = []
+    for file_path in batch:
+        try:
+            with open(file_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                fingerprint = [st.st_size, st.st_mtime_ns]
+                entry = cache.get(str(file_path)) if cache is not None else None
+                data = None if entry is not None and entry.get('stat') == fingerprint else f.read()
+        except OSError as e:
+            read.append((file_path, None, None, e))
+        else:
+            read.append((file_path, data, fingerprint, None))
+    return read
+
+
+async def _pipeline_stages(plugins_dir: Path, cache: Optional[ValidationCache], sink, readers: int,
+                           slots, stop) -> None:
+    """Discovery and read stages, putting read batches on sink in discovery order.
+
+    Discovery runs as one task in the thread pool and hands each plugin's
+    files to the loop, which starts a read for them on another pool
+    thread; the loop then awaits the reads in order. The consumer releases
+    a slot per batch it takes, so at most `slots` batches are listed but
+    not yet validated, and sink never has to block.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    loop = asyncio.get_running_loop()
+    reads = asyncio.Queue()  # read futures in discovery order, bounded by slots
+
+    def start_read(batch: List[Path]) -> None:
+        reads.put_nowait(loop.run_in_executor(pool, _read_batch, batch, cache))
+
+    def discover() -> None:
+        try:
+            for batch in iter_plugin_file_batches(plugins_dir):
+                slots.acquire()
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(start_read, batch)
+        finally:
+            loop.call_soon_threadsafe(reads.put_nowait, None)
+
+    # Readers, plus one thread for discovery
+    with ThreadPoolExecutor(max_workers=readers + 1) as pool:
+        listing = loop.run_in_executor(pool, discover)
+        while True:
+            read = await reads.get()
+            if read is None:
+                break
+            sink.put(await read)
+        await listing
+
+
+def iter_pipelined_results(plugins_dir: Path, cache: Optional[ValidationCache] = None,
+                           index: Optional[SymbolIndex] = None, readers: int = PIPELINE_READERS,
+                           depth: int = PIPELINE_DEPTH) -> Iterator[Tuple[Path, List[ValidationIssue], List[ValidationIssue]]]:
+    """Discover, read and validate the whole tree as overlapping stages.
+
+    Discovery and reads run under an asyncio loop on a background thread
+    while files are parsed and validated here, so the CPU works on one
+    plugin while the next is read. Yields (file, errors, warnings) in
+    find_plugin_files() order, starting before discovery has finished.
+    Cache and index are used as iter_file_results() uses them.
+    """
+    import asyncio
+    import queue
+    import threading
+
+    sink = queue.Queue()
+    slots = threading.Semaphore(depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            asyncio.run(_pipeline_stages(plugins_dir, cache, sink, readers, slots, stop))
+        except BaseException as e:
+            sink.put(e)
+        else:
+            sink.put(None)
+
+    producer = threading.Thread(target=produce, name='validate-pipeline', daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = sink.get()
+            if item is None:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            slots.release()
+            for file_path, data, fingerprint, error in item:
+                if error is not None:
+                    errors, warnings, entry = [_read_error(file_path, error)], [], None
+                else:
+                    entry = cache.get(str(file_path)) if cache is not None else None
+                    blob = entry['blob'] if data is None else git_blob_id(data)
+                    try:
+                        errors, warnings, entry = validate_blob(file_path, blob, data, entry)
+                    except (OSError, UnicodeDecodeError) as e:
+                        errors, warnings, entry = [_read_error(file_path, e)], [], None
+                    if entry is not None:
+                        entry['stat'] = fingerprint
+                if cache is not None:
+                    cache.put(str(file_path), entry)
+                if index is not None:
+                    index.add(str(file_path), entry_symbols(entry))
+                yield file_path, errors, warnings
+    finally:
+        # If the caller stopped early, wake discovery so it sees stop
+        stop.set()
+        slots.release()
+        producer.join()
+
+
+# ── Dependency graph ──
+
+
+def read_manifest_plugins(manifest_path: Path) -> List[dict]:
+    """A manifest's plugin entries, in place even where one is not an object;
+    empty if it is missing or not valid JSON (validate-manifests.py reports why)."""
+    import json
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return []
+    plugins = manifest.get('plugins') if isinstance(manifest, dict) else None
+    return plugins if isinstance(plugins, list) else []
+
+
+def _entry_paths(plugin: dict) -> List[str]:
+    """Repo-relative paths a manifest entry's check looks at, resolved lexically."""
+    import posixpath
+
+    if not isinstance(plugin, dict):
+        return []
+    name = plugin.get('name', 'unknown')
+    source = plugin.get('source', f'./plugins/{name}')
+    if not isinstance(source, str) or source.startswith('/'):
+        return []
+    source = posixpath.normpath(source)
+    paths = [source, f'{source}/.claude-plugin/plugin.json']
+    for key in ('agents', 'commands', 'skills', 'hooks'):
+        declared = plugin.get(key) or []
+        if isinstance(declared, str):
+            declared = [declared]
+        elif not isinstance(declared, list):
+            continue  # inline hooks
+        for path in declared:
+            if not isinstance(path, str) or path.startswith('/'):
+                continue
+            path = posixpath.normpath(posixpath.join(source, path))
+            paths.append(path)
+            if key == 'skills':
+                paths.append(f'{path}/SKILL.md')
+    return paths
+
+
+def _entry_listed_dirs(plugin: dict) -> List[str]:
+    """Repo-relative directories whose entries an entry's orphan check lists."""
+    import posixpath
+
+    if not isinstance(plugin, dict):
+        return []
+    name = plugin.get('name', 'unknown')
+    source = plugin.get('source', f'./plugins/{name}')
+    if not isinstance(source, str) or source.startswith('/'):
+        return []
+    source = posixpath.normpath(source)
+    return [f'{source}/{key}' for key in ('agents', 'commands', 'skills') if isinstance(plugin.get(key), list)]
+
+
+class DependencyGraph:
+    """What every file defines and references, kept between runs.
+
+    Holds each plugin file's FileSymbols, each team roster's agent
+    references and the manifest's plugin entries, keyed by repo-relative
+    path. Reverse lookups (who defines or references a name, which
+    entries declare a path) are derived from these in memory, so an
+    incremental run reads only the files a change can affect. Paths are
+    matched lexically; a symlinked plugin is only revalidated through
+    its real path.
+    """
+
+    def __init__(self, repo_root: Path):
+        self.repo_root = repo_root
+        self.files = {}  # type: Dict[str, Optional[FileSymbols]]
+        # roster -> [(agent name, location, plugin)]
+        self.rosters = {}  # type: Dict[str, List[Tuple[str, str, Optional[str]]]]
+        self.plugins = []  # type: List[dict]
+
+    def relative(self, path) -> str:
+        return Path(os.path.relpath(os.path.abspath(path), self.repo_root)).as_posix()
+
+    @classmethod
+    def from_index(cls, repo_root: Path, index: SymbolIndex, plugins: List[dict]) -> 'DependencyGraph':
+        """The graph of a whole-tree run, from its index and manifest entries."""
+        graph = cls(repo_root)
+        for file_path, symbols in index.files.items():
+            graph.files[graph.relative(file_path)] = symbols
+        for file_path, name, location, plugin in index.roster_references:
+            graph.rosters.setdefault(graph.relative(file_path), []).append((name, location, plugin))
+        graph.plugins = list(plugins)
+        return graph
+
+    @classmethod
+    def load(cls, path: Path, repo_root: Path) -> Optional['DependencyGraph']:
+        """Load a saved graph, or None if it is missing, corrupt or stale."""
+        import json
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('format') != DEPS_FORMAT:
+            return None
+        graph = cls(repo_root)
+        for rel, symbols in data['files'].items():
+            graph.files[rel] = None if symbols is None else FileSymbols(
+                symbols[0], symbols[1], [tuple(ref) for ref in symbols[2]], symbols[3])
+        graph.rosters = {rel: [tuple(ref) for ref in refs] for rel, refs in data['rosters'].items()}
+        graph.plugins = data['plugins']
+        return graph
+
+    def save(self, path: Path) -> None:
+        """Write the graph atomically."""
+        import json
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format': DEPS_FORMAT,
+                'files': {rel: None if s is None else [s.kind, s.name, [list(r) for r in s.references], s.line]
+                          for rel, s in self.files.items()},
+                'rosters': {rel: [list(ref) for ref in refs] for rel, refs in self.rosters.items()},
+                'plugins': self.plugins,
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def symbol_index(self) -> SymbolIndex:
+        """A SymbolIndex over every recorded file and roster, without reading them."""
+        index = SymbolIndex()
+        for rel, symbols in self.files.items():
+            index.add(str(self.repo_root / rel), symbols)
+        for rel, refs in self.rosters.items():
+            file_path = str(self.repo_root / rel)
+            index.roster_references.extend((file_path, name, location, plugin)
+                                           for name, location, plugin in refs)
+        return index
+
+    def dependents(self) -> Dict[Tuple[str, str], set]:
+        """(kind, name) -> files and rosters that define or reference it."""
+        by_name = {}  # type: Dict[Tuple[str, str], set]
+        for rel, symbols in self.files.items():
+            if symbols is None:
+                continue
+            by_name.setdefault((symbols.kind, symbols.name), set()).add(rel)
+            for kind, name, _, _ in symbols.references:
+                by_name.setdefault((kind, name.partition(':')[2] or name), set()).add(rel)
+        for rel, refs in self.rosters.items():
+            for name, _, _ in refs:
+                by_name.setdefault(('agent', name.partition(':')[2] or name), set()).add(rel)
+        return by_name
+
+    def update_roster(self, rel: str) -> None:
+        """Re-read one roster, dropping it if it is gone."""
+        index = SymbolIndex()
+        roster_path = self.repo_root / rel
+        index.add_team_members(roster_path)
+        if roster_path.is_file():
+            self.rosters[rel] = [(name, location, plugin) for _, name, location, plugin in index.roster_references]
+        else:
+            self.rosters.pop(rel, None)
+
+    def affected_plugins(self, rels: List[str]) -> Tuple[List[dict], bool]:
+        """Manifest entries whose check a change to these paths can alter.
+
+        An edited manifest is re-read and its new or changed entries are
+        affected; otherwise an entry is affected when it declares a changed
+        path (a skill through its SKILL.md), one lies under a changed
+        directory, or a changed path is a component its orphan check would
+        list. Returns (entries in manifest order, manifest changed).
+        """
+        import json
+        import posixpath
+
+        affected = set()  # type: set
+        manifest_changed = MANIFEST_PATH.as_posix() in rels
+        if manifest_changed:
+            previous = {json.dumps(p, sort_keys=True) for p in self.plugins}
+            self.plugins = read_manifest_plugins(self.repo_root / MANIFEST_PATH)
+            affected.update(i for i, p in enumerate(self.plugins)
+                            if json.dumps(p, sort_keys=True) not in previous)
+
+        declared = {}  # type: Dict[str, set]
+        listed = {}  # type: Dict[str, set]
+        for i, plugin in enumerate(self.plugins):
+            for path in _entry_paths(plugin):
+                declared.setdefault(path, set()).add(i)
+                parent = posixpath.dirname(path)
+                while parent:
+                    declared.setdefault(parent, set()).add(i)
+                    parent = posixpath.dirname(parent)
+            for path in _entry_listed_dirs(plugin):
+                listed.setdefault(path, set()).add(i)
+        for rel in rels:
+            affected.update(declared.get(rel, ()))
+            # A component appearing in, or leaving, a directory the orphan check lists
+            parent = posixpath.dirname(rel)
+            affected.update(listed.get(parent, ()))
+            if rel.endswith('/SKILL.md'):
+                affected.update(listed.get(posixpath.dirname(parent), ()))
+        return [self.plugins[i] for i in sorted(affected)], manifest_changed
+
+
+class ChangedResult(NamedTuple):
+    files: List[Path]  # plugin files and rosters revalidated
+    errors: List[ValidationIssue]
+    warnings: List[ValidationIssue]
+    plugins: List[dict]  # manifest entries to re-check
+    manifest_changed: bool
+
+
+def validate_changed(graph: DependencyGraph, changed: List[Path], jobs: int = 1,
+                     cache: Optional[ValidationCache] = None) -> ChangedResult:
+    """Revalidate what a set of changed paths affects, updating graph.
+
+    Changed plugin files are validated first. Only when one now defines a
+    different name (or was added or deleted) are the files and rosters
+    that define or reference the old or new name revalidated too. Cross-
+    file issues are resolved against the whole graph but reported only
+    for revalidated files, so the result for them matches a full run.
+    """
+    root = graph.repo_root
+    rels = sorted({graph.relative(path) for path in changed})
+    errors = []  # type: List[ValidationIssue]
+    warnings = []  # type: List[ValidationIssue]
+    revalidated = []  # type: List[str]
+
+    def revalidate(batch: List[str]) -> set:
+        """Validate files and record their symbols; returns the names whose definitions moved."""
+        index = SymbolIndex()
+        existing = [root / rel for rel in batch if (root / rel).is_file()]
+        for _, file_errors, file_warnings in iter_file_results(existing, jobs, cache, index):
+            errors.extend(file_errors)
+            warnings.extend(file_warnings)
+        fresh = {graph.relative(file_path): symbols for file_path, symbols in index.files.items()}
+        moved = set()
+        for rel in batch:
+            old = graph.files.get(rel)
+            if rel in fresh:
+                new = graph.files[rel] = fresh[rel]
+                revalidated.append(rel)
+            else:
+                graph.files.pop(rel, None)
+                new = None
+            old_key = (old.kind, old.name) if old is not None else None
+            new_key = (new.kind, new.name) if new is not None else None
+            if old_key != new_key:
+                moved.update(key for key in (old_key, new_key) if key is not None)
+        return moved
+
+    moved = revalidate([rel for rel in rels if get_file_type(rel)])
+
+    rosters = {rel for rel in rels if TEAM_MEMBERS_PATTERN.search(rel)}
+    for rel in rosters:
+        graph.update_roster(rel)
+
+    if moved:
+        by_name = graph.dependents()
+        dependents = set()  # type: set
+        for key in moved:
+            dependents.update(by_name.get(key, ()))
+        done = set(revalidated)
+        revalidate(sorted(rel for rel in dependents if rel in graph.files and rel not in done))
+        rosters.update(rel for rel in dependents if rel in graph.rosters)
+
+    reported = {str(root / rel) for rel in revalidated} | {str(root / rel) for rel in rosters}
+    index_errors, index_warnings = graph.symbol_index().check()
+    errors.extend(issue for issue in index_errors if issue.file in reported)
+    warnings.extend(issue for issue in index_warnings if issue.file in reported)
+
+    plugins, manifest_changed = graph.affected_plugins(rels)
+    files = [root / rel for rel in revalidated] + [root / rel for rel in sorted(rosters) if rel in graph.rosters]
+    return ChangedResult(files, errors, warnings, plugins, manifest_changed)
+
+
+def get_changed_files() -> List[Path]:
+    """Get list of changed markdown files from git."""
+    import subprocess
+
+    try:
+        # Get files changed in PR (compared to base branch)
+        result = subprocess.run(
+            ['git', 'diff', '--name-only', '--diff-filter=ACMR', 'origin/main...HEAD'],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        files = result.stdout.strip().split('\n')
+    except subprocess.CalledProcessError:
+        # Fallback: get uncommitted changes
+        try:
+            result = subprocess.run(
+                ['git', 'diff', '--name-only', '--diff-filter=ACMR', 'HEAD'],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            files = result.stdout.strip().split('\n')
+        except subprocess.CalledProcessError:
+            return []
+
+    # Filter to markdown files in plugins
+    return [
+        Path(f) for f in files
+        if f.endswith('.md') and f.startswith('plugins/')
+    ]
+
+
+def get_changed_paths(repo_root: Path) -> List[Path]:
+    """Every path changed in git, deletions included, as absolute paths.
+
+    Compares against the same base as get_changed_files(); a rename is
+    reported as its old and new path.
+    """
+    import subprocess
+
+    for base in ('origin/main...HEAD', 'HEAD'):
+        try:
+            result = subprocess.run(
+                ['git', 'diff', '--name-only', '--no-renames', base],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=repo_root
+            )
+        except (OSError, subprocess.CalledProcessError):
+            continue
+        return [repo_root / f for f in result.stdout.splitlines() if f]
+    return []
+
+
+def get_staged_files(repo_root: Path) -> List[Tuple[Path, str]]:
+    """Staged plugin files and their blob ids in the index.
+
+    Reads `git diff --cached --raw`, which already carries each new blob
+    id, so nothing is hashed or read from the working tree. Symlinks and
+    submodules are skipped.
+    """
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ['git', 'diff', '--cached', '--raw', '--no-abbrev', '-z', '--diff-filter=ACMR'],
+            capture_output=True,
+            check=True,
+            cwd=repo_root
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return []
+
+    staged = []
+    fields = result.stdout.decode('utf-8', 'surrogateescape').split('\0')
+    i = 0
+    while i < len(fields) - 1:
+        # ":old_mode new_mode old_blob new_blob status", then one path, or
+        # two (source, destination) for renames and copies
+        meta = fields[i].lstrip(':').split()
+        paths = 2 if meta[4][0] in 'RC' else 1
+        path = fields[i + paths]
+        i += paths + 1
+        if meta[1] not in ('100644', '100755'):
+            continue
+        if path.endswith('.md') and path.startswith('plugins/') and get_file_type(path):
+            staged.append((repo_root / path, meta[3]))
+    return staged
+
+
+def iter_git_blobs(blob_ids: List[str], cwd: Path) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """Stream (blob id, content) pairs from one `git cat-file --batch` process.
+
+    Ids are written from a thread while content is read, so neither pipe
+    fills up; content is None for ids git does not have.
+    """
+    import subprocess
+    import threading
+
+    proc = subprocess.Popen(
+        ['git', 'cat-file', '--batch'],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        cwd=cwd
+    )
+
+    def feed():
+        try:
+            proc.stdin.write(''.join(f"{blob}\n" for blob in blob_ids).encode('ascii'))
+        except BrokenPipeError:
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    try:
+        for blob in blob_ids:
+            # "<id> blob <size>", or "<id> missing"
+            header = proc.stdout.readline().split()
+            if len(header) != 3:
+                yield blob, None
+                continue
+            data = proc.stdout.read(int(header[2]))
+            proc.stdout.read(1)  # trailing newline
+            yield blob, data
+    finally:
+        writer.join()
+        proc.stdout.close()
+        proc.wait()
+
+
+def iter_staged_results(staged: List[Tuple[Path, str]], repo_root: Path, cache: Optional[ValidationCache] = None) -> Iterator[Tuple[Path, List[ValidationIssue], List[ValidationIssue]]]:
+    """Validate staged content, yielding (file, errors, warnings) in input order.
+
+    Blobs whose cached results are current are replayed without fetching
+    them; the rest stream through a single cat-file process and are
+    validated in memory, each distinct blob fetched once.
+    """
+    issues = {}  # type: Dict[int, Tuple[List[ValidationIssue], List[ValidationIssue]]]
+    wanted = {}  # type: Dict[str, List[int]]
+    for index, (file_path, blob) in enumerate(staged):
+        entry = cache.get(str(file_path)) if cache is not None else None
+        replayed = cached_blob_issues(file_path, blob, entry)
+        if replayed is None:
+            wanted.setdefault(blob, []).append(index)
+        else:
+            issues[index] = replayed
+
+    for blob, data in (iter_git_blobs(list(wanted), repo_root) if wanted else ()):
+        for index in wanted[blob]:
+            file_path = staged[index][0]
+            if data is None:
+                issues[index] = [_read_error(file_path, LookupError(f"blob {blob} not in git"))], []
+                continue
+            entry = cache.get(str(file_path)) if cache is not None else None
+            try:
+                errors, warnings, new_entry = validate_blob(file_path, blob, data, entry)
+            except UnicodeDecodeError as e:
+                issues[index] = [_read_error(file_path, e)], []
+                continue
+            issues[index] = errors, warnings
+            if cache is not None:
+                cache.put(str(file_path), new_entry)
+
+    for index, (file_path, _) in enumerate(staged):
+        errors, warnings = issues[index]
+        yield file_path, errors, warnings
+
+
+# ── Commit ranges ──
+
+# Tree entry modes: a subdirectory, and the files a checkout writes as such
+TREE_MODE = '40000'
+BLOB_MODES = frozenset(['100644', '100755'])
+
+
+def get_range_commits(rev_range: str, repo_root: Path) -> List[Tuple[str, str, str]]:
+    """(commit, root tree, subject) for every commit in a range, oldest first.
+
+    Parents always come before their children, so the first commit an
+    issue is seen in is the one that introduced it. Raises ValueError
+    with git's message when the range does not resolve.
+    """
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ['git', 'rev-list', '--reverse', '--topo-order', '--format=%T %s', rev_range, '--'],
+            capture_output=True,
+            check=True,
+            cwd=repo_root
+        )
+    except OSError as e:
+        raise ValueError(str(e))
+    except subprocess.CalledProcessError as e:
+        raise ValueError(e.stderr.decode('utf-8', 'replace').strip() or f"cannot list {rev_range}")
+
+    # "commit <id>", then the format line, for each commit
+    lines = result.stdout.decode('utf-8', 'replace').splitlines()
+    commits = []
+    for header, line in zip(lines[::2], lines[1::2]):
+        tree, _, subject = line.partition(' ')
+        commits.append((header.split()[1], tree, subject))
+    return commits
+
+
+class GitObjects:
+    """Objects read one at a time from a long-running `git cat-file --batch`."""
+
+    def __init__(self, repo_root: Path):
+        import subprocess
+        self.proc = subprocess.Popen(
+            ['git', 'cat-file', '--batch'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=repo_root
+        )
+
+    def read(self, oid: str) -> Optional[bytes]:
+        """An object's content, or None if git does not have it."""
+        self.proc.stdin.write(f"{oid}\n".encode('ascii'))
+        self.proc.stdin.flush()
+        # "<id> <type> <size>", or "<id> missing"
+        header = self.proc.stdout.readline().split()
+        if len(header) != 3:
+            return None
+        data = self.proc.stdout.read(int(header[2]))
+        self.proc.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self) -> None:
+        self.proc.stdin.close()
+        self.proc.stdout.close()
+        self.proc.wait()
+
+
+def parse_tree(data: bytes, oid_size: int) -> Dict[str, Tuple[str, str]]:
+    """name -> (mode, object id) from a raw tree object, in tree order.
+
+    Entries are "<mode> <name>\\0" followed by the binary id, which is
+    oid_size bytes (20 for SHA-1 repositories, 32 for SHA-256).
+    """
+    entries = {}  # type: Dict[str, Tuple[str, str]]
+    pos = 0
+    while pos < len(data):
+        space = data.index(b' ', pos)
+        nul = data.index(b'\0', space)
+        end = nul + 1 + oid_size
+        name = data[space + 1:nul].decode('utf-8', 'surrogateescape')
+        entries[name] = (data[pos:space].decode('ascii'), data[nul + 1:end].hex())
+        pos = end
+    return entries
+
+
+class _CommitSnapshot:
+    """exists(), is_dir(), listdir() and read_text() for the manifest check, answered from a commit's trees."""
+
+    def __init__(self, validator: 'RangeValidator', tree: str):
+        self.validator = validator
+        self.tree = tree
+
+    def _entry(self, path) -> Optional[Tuple[str, str]]:
+        # The manifest check resolves declared paths against the real root
+        rel = os.path.relpath(path, self.validator.real_root)
+        if rel == '..' or rel.startswith('../'):
+            return None
+        return self.validator.lookup(self.tree, rel)
+
+    def exists(self, path) -> bool:
+        return self._entry(path) is not None
+
+    def is_dir(self, path) -> bool:
+        entry = self._entry(path)
+        return entry is not None and entry[0] == TREE_MODE
+
+    def listdir(self, path) -> Optional[Dict[str, bool]]:
+        entry = self._entry(path)
+        if entry is None or entry[0] != TREE_MODE:
+            return None
+        return {name: mode == TREE_MODE for name, (mode, _) in self.validator.tree(entry[1]).items()}
+
+    def read_text(self, path) -> str:
+        entry = self._entry(path)
+        data = self.validator.objects.read(entry[1]) if entry is not None and entry[0] in BLOB_MODES else None
+        if data is None:
+            raise FileNotFoundError(f"{path} not in commit")
+        return data.decode('utf-8')
+
+
+class CommitResult(NamedTuple):
+    commit: str
+    subject: str
+    frontmatter: ValidationResult
+    manifests: object  # validate-manifests.py FullValidationResult
+
+    @property
+    def is_valid(self) -> bool:
+        return self.frontmatter.is_valid and self.manifests.is_valid
+
+
+class RangeValidator:
+    """Validates commits straight from git objects, memoizing by object id.
+
+    Trees are parsed once per tree id and plugin file lists built once per
+    plugin tree id. File results are kept per (path, blob id), rosters and
+    manifests per blob id, and manifest entry results per (position, entry,
+    source tree id). Cross-file issues are only recomputed when a name defined or
+    referenced, or a roster, differs from the previous commit. Validating
+    one commit after another therefore reads and parses only the objects
+    that differ between them.
+    """
+
+    def __init__(self, repo_root: Path, oid_size: int, use_index: bool = True):
+        self.repo_root = repo_root
+        self.real_root = os.path.realpath(repo_root)
+        self.oid_size = oid_size
+        self.use_index = use_index
+        self.objects = GitObjects(repo_root)
+        self.trees = {}  # type: Dict[str, Dict[str, Tuple[str, str]]]
+        # plugin tree -> ([(file, blob)], [(roster, blob)]), paths relative to the plugin
+        self.plugin_files = {}  # type: Dict[str, Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]]
+        # (path, blob) -> (errors, warnings, symbols)
+        self.results = {}  # type: Dict[Tuple[str, str], Tuple[List[ValidationIssue], List[ValidationIssue], Optional[FileSymbols]]]
+        self.rosters = {}  # type: Dict[str, object]
+        # manifest blob -> (entries, manifest error, top-level schema errors, each entry as sorted JSON)
+        self.manifests = {}  # type: Dict[str, Tuple[List[dict], Optional[str], list, List[str]]]
+        self.plugin_results = {}  # type: Dict[Tuple[int, str, Optional[str]], object]
+        self.paths = {}  # type: Dict[str, str]
+        # (symbols by file, rosters) of the previous commit, and its cross-file issues
+        self.index_input = None  # type: Optional[tuple]
+        self.index_issues = [], []  # type: Tuple[List[ValidationIssue], List[ValidationIssue]]
+        self.blobs_parsed = 0
+        self._vm = None
+
+    @property
+    def vm(self):
+        """The validate-manifests.py module, loaded on first use."""
+        if self._vm is None:
+            self._vm = _load_sibling('validate-manifests.py')
+        return self._vm
+
+    def close(self) -> None:
+        self.objects.close()
+
+    def tree(self, oid: str) -> Dict[str, Tuple[str, str]]:
+        entries = self.trees.get(oid)
+        if entries is None:
+            entries = self.trees[oid] = parse_tree(self.objects.read(oid) or b'', self.oid_size)
+        return entries
+
+    def lookup(self, tree: str, rel: str) -> Optional[Tuple[str, str]]:
+        """(mode, object id) of a repo-relative path in a commit's tree, or None."""
+        entry = (TREE_MODE, tree)
+        for part in rel.split('/'):
+            if part in ('', '.'):
+                continue
+            if entry[0] != TREE_MODE:
+                return None
+            entry = self.tree(entry[1]).get(part)
+            if entry is None:
+                return None
+        return entry
+
+    def _subtree(self, entries: Dict[str, Tuple[str, str]], name: str) -> Dict[str, Tuple[str, str]]:
+        mode, oid = entries.get(name, ('', ''))
+        return self.tree(oid) if mode == TREE_MODE else {}
+
+    def _list_plugin(self, plugin_tree: str) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        """A plugin's files and rosters as find_plugin_files() and
+        find_team_rosters() would find them in a checkout of this tree."""
+        listing = self.plugin_files.get(plugin_tree)
+        if listing is not None:
+            return listing
+        files = []  # type: List[Tuple[str, str]]
+        rosters = []  # type: List[Tuple[str, str]]
+        entries = self.tree(plugin_tree)
+        for kind in ('agents', 'commands'):
+            files.extend((f'{kind}/{name}', oid) for name, (mode, oid) in self._subtree(entries, kind).items()
+                         if name.endswith('.md') and mode in BLOB_MODES)
+        for skill, (mode, oid) in self._subtree(entries, 'skills').items():
+            if mode != TREE_MODE:
+                continue
+            skill_entries = self.tree(oid)
+            for name, found in (('SKILL.md', files), ('team-members.json', rosters)):
+                file_mode, blob = skill_entries.get(name, ('', ''))
+                if file_mode in BLOB_MODES:
+                    found.append((f'skills/{skill}/{name}', blob))
+        listing = self.plugin_files[plugin_tree] = (files, rosters)
+        return listing
+
+    def _validate_blobs(self, wanted: List[Tuple[str, str]]) -> None:
+        """Validate (path, blob) pairs not seen before, fetching each blob once."""
+        by_blob = {}  # type: Dict[str, List[str]]
+        for rel, blob in wanted:
+            by_blob.setdefault(blob, []).append(rel)
+        for blob, data in iter_git_blobs(list(by_blob), self.repo_root):
+            for rel in by_blob[blob]:
+                file_path = self.repo_root / rel
+                if data is None:
+                    self.results[rel, blob] = [_read_error(file_path, LookupError(f"blob {blob} not in git"))], [], None
+                    continue
+                self.blobs_parsed += 1
+                try:
+                    errors, warnings, entry = validate_blob(file_path, blob, data, None)
+                except UnicodeDecodeError as e:
+                    self.results[rel, blob] = [_read_error(file_path, e)], [], None
+                    continue
+                self.results[rel, blob] = errors, warnings, entry_symbols(entry)
+
+    def _roster(self, blob: str):
+        if blob not in self.rosters:
+            import json
+            try:
+                self.rosters[blob] = json.loads(self.objects.read(blob) or b'')
+            except ValueError:
+                self.rosters[blob] = None
+        return self.rosters[blob]
+
+    def path(self, rel: str) -> str:
+        file_path = self.paths.get(rel)
+        if file_path is None:
+            file_path = self.paths[rel] = str(self.repo_root / rel)
+        return file_path
+
+    def _manifest_plugins(self, blob: str) -> Tuple[List[dict], Optional[str], list, List[str]]:
+        if blob not in self.manifests:
+            import json
+            plugins, schema_errors = [], []  # type: Tuple[List[dict], list]
+            try:
+                text = (self.objects.read(blob) or b'').decode('utf-8')
+            except UnicodeDecodeError as e:
+                error = f"Error reading manifest: {e}"  # type: Optional[str]
+            else:
+                manifest, error = self.vm.parse_manifest(text)
+                if not error:
+                    schema_errors = self.vm.check_manifest(manifest, self.repo_root / MANIFEST_PATH)
+                    plugins, error = self.vm.manifest_plugins(manifest)
+            self.manifests[blob] = plugins, error, schema_errors, [json.dumps(p, sort_keys=True) for p in plugins]
+        return self.manifests[blob]
+
+    def _index_issues(self, files: List[Tuple[str, str]], rosters: List[Tuple[str, str]]) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+        """Cross-file issues, reused while no file's symbols and no roster changed."""
+        index_input = ([(rel, self.results[rel, blob][2]) for rel, blob in files], rosters)
+        if index_input != self.index_input:
+            index = SymbolIndex()
+            for rel, symbols in index_input[0]:
+                index.add(self.path(rel), symbols)
+            for rel, blob in rosters:
+                index.add_roster(self.path(rel), self._roster(blob))
+            self.index_input = index_input
+            self.index_issues = index.check()
+        return self.index_issues
+
+    def _source_tree(self, tree: str, plugin: dict) -> Optional[str]:
+        """Id of the tree an entry's source names; every path it declares lies inside."""
+        import posixpath
+
+        if not isinstance(plugin, dict):
+            return None
+        name = plugin.get('name', 'unknown')
+        source = plugin.get('source', f'./plugins/{name}')
+        if not isinstance(source, str) or source.startswith('/'):
+            return None
+        rel = posixpath.normpath(source)
+        if rel == '..' or rel.startswith('../'):
+            return None
+        entry = self.lookup(tree, rel)
+        return entry[1] if entry is not None else None
+
+    def validate(self, tree: str) -> Tuple[ValidationResult, object]:
+        """Frontmatter and manifest results for one commit's root tree."""
+        files = []  # type: List[Tuple[str, str]]
+        rosters = []  # type: List[Tuple[str, str]]
+        for plugin, (mode, oid) in self._subtree(self.tree(tree), 'plugins').items():
+            if mode == TREE_MODE:
+                plugin_files, plugin_rosters = self._list_plugin(oid)
+                files.extend((f'plugins/{plugin}/{rel}', blob) for rel, blob in plugin_files)
+                rosters.extend((f'plugins/{plugin}/{rel}', blob) for rel, blob in plugin_rosters)
+
+        wanted = [key for key in files if key not in self.results]
+        if wanted:
+            with _phase('parse'):
+                self._validate_blobs(wanted)
+
+        errors = []  # type: List[ValidationIssue]
+        warnings = []  # type: List[ValidationIssue]
+        for key in files:
+            file_errors, file_warnings, _ = self.results[key]
+            errors.extend(file_errors)
+            warnings.extend(file_warnings)
+        if self.use_index:
+            index_errors, index_warnings = self._index_issues(files, rosters)
+            errors.extend(index_errors)
+            warnings.extend(index_warnings)
+        frontmatter = ValidationResult(errors=errors, warnings=warnings, files_checked=len(files))
+
+        manifest_path = self.repo_root / MANIFEST_PATH
+        manifests = self.vm.FullValidationResult(manifest_path=str(manifest_path))
+        mode, blob = self.lookup(tree, MANIFEST_PATH.as_posix()) or ('', '')
+        if mode not in BLOB_MODES:
+            manifests.manifest_errors.append(f"Manifest not found: {manifest_path}")
+            return frontmatter, manifests
+        plugins, manifest_error, schema_errors, entry_keys = self._manifest_plugins(blob)
+        if manifest_error:
+            manifests.manifest_errors.append(manifest_error)
+        manifests.schema_errors.extend(schema_errors)
+        snapshot = _CommitSnapshot(self, tree)
+        # Schema errors name the entry's position, so results are reused
+        # only for an identical entry at the same position
+        for i, (plugin, entry_key) in enumerate(zip(plugins, entry_keys)):
+            key = (i, entry_key, self._source_tree(tree, plugin))
+            result = self.plugin_results.get(key)
+            if result is None:
+                result = self.plugin_results[key] = self.vm._validate_plugin(
+                    plugin, self.repo_root, snapshot, manifests.manifest_path, f'/plugins/{i}')
+            manifests.plugin_results.append(result)
+        return frontmatter, manifests
+
+
+def iter_range_results(rev_range: str, repo_root: Path, use_index: bool = True) -> Iterator[CommitResult]:
+    """Validate every commit in a range from git objects, oldest first.
+
+    Raises ValueError when the range does not resolve.
+    """
+    commits = get_range_commits(rev_range, repo_root)
+    if not commits:
+        return
+    validator = RangeValidator(repo_root, oid_size=len(commits[0][0]) // 2, use_index=use_index)
+    try:
+        for commit, tree, subject in commits:
+            frontmatter, manifests = validator.validate(tree)
+            yield CommitResult(commit, subject, frontmatter, manifests)
+    finally:
+        validator.close()
+
+
+def manifest_issues(manifests) -> List[dict]:
+    """A manifest check's errors as flat records, manifest-level ones first."""
+    issues = [{'manifest_error': error} for error in manifests.manifest_errors]
+    issues.extend(error.to_dict() for error in manifests.schema_errors)
+    for plugin_result in manifests.plugin_results:
+        issues.extend(error.to_dict() for error in plugin_result.schema_errors)
+        issues.extend(error.to_dict() for error in plugin_result.errors)
+    return issues
+
+
+def introduced_issues(results: List[CommitResult]) -> List[Tuple[List[ValidationIssue], List[ValidationIssue], List[dict]]]:
+    """For each commit, the (errors, warnings, manifest issues) no earlier commit had.
+
+    Issues are matched without their line, which moves with unrelated
+    edits to the file.
+    """
+    seen = set()  # type: set
+    introduced = []
+    for result in results:
+        new = ([], [], [])  # type: Tuple[List[ValidationIssue], List[ValidationIssue], List[dict]]
+        for issues, found in ((result.frontmatter.errors, new[0]), (result.frontmatter.warnings, new[1])):
+            for issue in issues:
+                key = (issue.file, issue.code, issue.params)
+                if key not in seen:
+                    seen.add(key)
+                    found.append(issue)
+        for record in manifest_issues(result.manifests):
+            key = tuple(sorted(record.items()))
+            if key not in seen:
+                seen.add(key)
+                new[2].append(record)
+        introduced.append(new)
+    return introduced
+
+
+def _format_manifest_issue(record: dict) -> str:
+    if 'manifest_error' in record:
+        return record['manifest_error']
+    if 'pointer' in record:
+        return f"{record['file']}#{record['pointer']} ({record['error']}): {record['message']}"
+    return f"{record['plugin_name']}: {record['file_type']} {record['declared_path']} ({record['error']})"
+
+
+def format_range_text(results: List[CommitResult], show_warnings: bool = True) -> str:
+    """One line of counts per commit, then the issues that commit introduced."""
+    lines = []
+    for result, (errors, warnings, manifest_new) in zip(results, introduced_issues(results)):
+        frontmatter = result.frontmatter
+        manifest_errors = result.manifests.total_errors
+        mark = '✓' if result.is_valid else '✗'
+        lines.append(f"{mark} {result.commit[:12]} {result.subject}")
+        lines.append(f"    {len(frontmatter.errors)} error(s), {len(frontmatter.warnings)} warning(s) "
+                     f"in {frontmatter.files_checked} files; {manifest_errors} manifest error(s)")
+        new = errors + warnings if show_warnings else errors
+        for issue in sorted(new, key=lambda i: (i.file, i.line)):
+            field_info = f" [{issue.field}]" if issue.field else ""
+            lines.append(f"    + {issue.file}:{issue.line}{field_info} {issue.code}: {issue.message}")
+        for record in manifest_new:
+            lines.append(f"    + manifest: {_format_manifest_issue(record)}")
+
+    failing = sum(not result.is_valid for result in results)
+    lines.append("")
+    if failing:
+        lines.append(f"✗ {failing} of {len(results)} commits have errors")
+    else:
+        lines.append(f"✓ All {len(results)} commits valid")
+    return '\n'.join(lines)
+
+
+def range_to_dict(results: List[CommitResult]) -> dict:
+    """Every commit's full results, and each issue with the commit that introduced it."""
+    introduced = []
+    for result, (errors, warnings, manifest_new) in zip(results, introduced_issues(results)):
+        for issue in errors + warnings:
+            record = issue.to_dict()
+            record['commit'] = result.commit
+            introduced.append(record)
+        for record in manifest_new:
+            introduced.append(dict(record, commit=result.commit))
+    return {
+        'is_valid': all(result.is_valid for result in results),
+        'commits': [
+            {
+                'commit': result.commit,
+                'subject': result.subject,
+                'is_valid': result.is_valid,
+                'frontmatter': result.frontmatter.to_dict(),
+                'manifests': result.manifests.to_dict(),
+            }
+            for result in results
+        ],
+        'introduced': introduced,
+    }
+
+
+def _format_issue_section(title: str, issues: List[ValidationIssue], group_by: str = 'file') -> List[str]:
+    """Issues grouped by file, in file order; or by code, then file, in code order."""
+    if group_by == 'code':
+        by_code = {}  # type: Dict[str, Dict[str, List[ValidationIssue]]]
+        for issue in issues:
+            by_file = by_code.get(issue.code or '')
+            if by_file is None:
+                by_code[issue.code or ''] = by_file = {}
+            file_issues = by_file.get(issue.file)
+            if file_issues is None:
+                by_file[issue.file] = file_issues = []
+            file_issues.append(issue)
+
+        lines = ["", f"{title}:"]
+        for code, by_file in sorted(by_code.items()):
+            count = sum(len(file_issues) for file_issues in by_file.values())
+            lines.append(f"  {code or 'No code'} ({count}):")
+            for file_path, file_issues in sorted(by_file.items()):
+                lines.append(f"    {file_path}:")
+                for issue in file_issues:
+                    field_info = f" [{issue.field}]" if issue.field else ""
+                    lines.append(f"      Line {issue.line}{field_info}: {issue.message}")
+            lines.append("")
+        return lines
+
+    by_file = {}  # type: Dict[str, List[ValidationIssue]]
+    for issue in issues:
+        file_issues = by_file.get(issue.file)
+        if file_issues is None:
+            by_file[issue.file] = file_issues = []
+        file_issues.append(issue)
+
+    lines = ["", f"{title}:"]
+    for file_path, file_issues in sorted(by_file.items()):
+        lines.append(f"  {file_path}:")
+        for issue in file_issues:
+            field_info = f" [{issue.field}]" if issue.field else ""
+            lines.append(f"    Line {issue.line}{field_info}: {issue.message}")
+        lines.append("")
+    return lines
+
+
+def format_issues_text(result: ValidationResult, show_warnings: bool = True, group_by: str = 'file') -> str:
+    """Format validation result as human-readable text.
+
+    group_by='code' lists issues under each code, then by file, instead of
+    by file alone.
+    """
+    lines = []
+
+    if result.is_valid and not result.warnings:
+        lines.append(f"✓ All {result.files_checked} files valid")
+    elif result.is_valid and result.warnings:
+        lines.append(f"✓ {result.files_checked} files valid with {len(result.warnings)} warning(s)")
+    else:
+        lines.append(f"✗ Found {len(result.errors)} error(s) in {result.files_checked} files")
+
+    if result.errors:
+        lines.extend(_format_issue_section("ERRORS", result.errors, group_by))
+
+    if show_warnings and result.warnings:
+        lines.extend(_format_issue_section("WARNINGS", result.warnings, group_by))
+
+    return '\n'.join(lines)
+
+
+def write_ndjson(file_results: Iterator[Tuple[Path, List[ValidationIssue], List[ValidationIssue]]],
+                 files_checked: Optional[int], strict: bool = False, out=None) -> Tuple[int, int]:
+    """Stream issues as JSON lines while files are validated.
+
+    Writes one {"type": "issue", ...} record per issue, a file's errors
+    before its warnings, flushing after each file so consumers see results
+    as they are produced. A final {"type": "summary", ...} record carries
+    the counts. In strict mode warnings are written with severity "error".
+    Issues are not kept, so memory stays flat however large the tree.
+    With out=None results are consumed without output. files_checked=None
+    counts the files as they stream past.
+
+    Returns (error_count, warning_count).
+    """
+    import json
+    error_count = 0
+    warning_count = 0
+    counted = 0
+    for file_path, errors, warnings in file_results:
+        counted += file_path is not None
+        if strict and warnings:
+            errors = errors + warnings
+            warnings = []
+        error_count += len(errors)
+        warning_count += len(warnings)
+        if out is not None and (errors or warnings):
+            for issue in errors + warnings:
+                record = {'type': 'issue'}
+                record.update(issue.to_dict())
+                if strict:
+                    record['severity'] = 'error'
+                out.write(json.dumps(record) + '\n')
+            out.flush()
+    if out is not None:
+        if files_checked is None:
+            files_checked = counted
+        out.write(json.dumps(_ndjson_summary(files_checked, error_count, warning_count)) + '\n')
+        out.flush()
+    return error_count, warning_count
+
+
+def _ndjson_summary(files_checked: int, error_count: int, warning_count: int) -> dict:
+    return {
+        'type': 'summary',
+        'is_valid': error_count == 0,
+        'files_checked': files_checked,
+        'error_count': error_count,
+        'warning_count': warning_count,
+    }
+
+
+# ── Watch mode ──
+
+# Editors save in bursts (write, rename, chmod); events this close together
+# are handled as one change
+WATCH_DEBOUNCE = 0.05
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+
+def _load_sibling(filename: str):
+    """Load another script from this directory as a module, once."""
+    name = filename[:-len('.py')].replace('-', '_')
+    module = sys.modules.get(name)
+    if module is None:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(name, Path(__file__).parent / filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    """(size, mtime_ns) of a path, or None if it is gone."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _contains(outer: Path, inner: Path) -> bool:
+    return outer == inner or outer in inner.parents
+
+
+class WatchEntry(NamedTuple):
+    stat: Tuple[int, int]  # (size, mtime_ns) when last validated
+    blob: str
+    frontmatter: Optional[dict]
+    errors: List[ValidationIssue]
+    warnings: List[ValidationIssue]
+    symbols: Optional[FileSymbols] = None
+
+
+class WatchState:
+    """Parsed frontmatter, issues and manifest results kept between edits.
+
+    apply() takes the paths a watcher reported and revalidates only what
+    they affect. A file whose stat changed is re-read, and re-parsed only if
+    its content changed. A manifest edit re-runs the manifest check for the
+    plugins whose entries changed; anything else appearing or disappearing
+    re-runs it for the plugins that contain it.
+
+    Unless use_index is off, result() adds the cross-file issues a whole-
+    tree run reports. The symbol index is rebuilt from the kept symbols
+    only when a file's symbols or a roster changed, and every reference
+    is then resolved again, so files that name a moved definition are
+    re-checked without being re-read.
+    """
+
+    def __init__(self, repo_root: Path, use_index: bool = True):
+        self.repo_root = repo_root
+        self.plugins_dir = repo_root / 'plugins'
+        self.manifest_path = repo_root / MANIFEST_PATH
+        self.files = {}  # type: Dict[Path, WatchEntry]
+        self.order = []  # type: List[Path]
+        self.manifest_error = None  # type: Optional[str]
+        self.schema_errors = []  # type: list
+        self.plugin_results = []  # type: List[Tuple[dict, object]]
+        self.use_index = use_index
+        self.rosters = []  # type: List[Path]
+        self.index_input = None  # type: Optional[tuple]
+        self.index_issues = [], []  # type: Tuple[List[ValidationIssue], List[ValidationIssue]]
+        self._manifests = None
+
+    @property
+    def manifests(self):
+        """The validate-manifests.py module, loaded on first use."""
+        if self._manifests is None:
+            self._manifests = _load_sibling('validate-manifests.py')
+        return self._manifests
+
+    def load(self) -> None:
+        """Validate every plugin file and the manifest."""
+        self.order = find_plugin_files(self.plugins_dir)
+        for file_path in self.order:
+            self._refresh_file(file_path)
+        self.rosters = find_team_rosters(self.plugins_dir)
+        self._refresh_manifest()
 
-    Returns:
-        tuple of (parsed frontmatter dict or None, line number where frontmatter ends, body content)
-    """
-    if not content.startswith('---'):
-        return None, 0, content
+    def apply(self, paths) -> Tuple[int, int]:
+        """Revalidate what the changed paths affect.
 
-    # Find closing ---
-    lines = content.split('\n')
-    end_line = None
-    for i, line in enumerate(lines[1:], start=2):
-        if line.strip() == '---':
-            end_line = i
-            break
+        Returns (files, plugins) revalidated.
+        """
+        # Issues kept from earlier runs hold their own references
+        clear_interned()
+        files_done = 0
+        plugins_done = 0
+        moved = []  # type: List[Path]
+        manifest_changed = False
+        rediscover = False
 
-    if end_line is None:
-        return None, 0, content
+        for path in paths:
+            if _contains(path, self.manifest_path):
+                manifest_changed = True
+            if path in self.files:
+                if self._refresh_file(path):
+                    files_done += 1
+                if path not in self.files:
+                    moved.append(path)
+                    rediscover = True
+            elif _contains(self.plugins_dir, path) or _contains(path, self.plugins_dir):
+                moved.append(path)
+                rediscover = True
 
-    frontmatter_text = '\n'.join(lines[1:end_line-1])
-    body = '\n'.join(lines[end_line:])
+        if rediscover:
+            # Keep discovery order so results list files as a full run would
+            self.order = find_plugin_files(self.plugins_dir) if self.plugins_dir.is_dir() else []
+            current = set(self.order)
+            for file_path in sorted(current - self.files.keys()):
+                self._refresh_file(file_path)
+                files_done += 1
+            for file_path in self.files.keys() - current:
+                del self.files[file_path]
+                files_done += 1
+            self.rosters = find_team_rosters(self.plugins_dir) if self.plugins_dir.is_dir() else []
 
-    # Try standard YAML parsing first
-    try:
-        parsed = yaml.safe_load(frontmatter_text)
-        if isinstance(parsed, dict):
-            return parsed, end_line, body
-    except yaml.YAMLError:
-        pass
+        if manifest_changed:
+            plugins_done += self._refresh_manifest()
+        if moved:
+            plugins_done += self._refresh_plugins_containing(moved)
+        return files_done, plugins_done
 
-    # Fallback: regex-based extraction for files with unquoted colons in values
-    # This handles cases like "description: ... Context: ..." which break YAML
-    parsed = {}
-    for line in lines[1:end_line-1]:
-        # Match top-level keys (not indented)
-        match = re.match(r'^([a-z][a-z0-9-]*)\s*:\s*(.*)$', line, re.IGNORECASE)
-        if match:
-            key = match.group(1).lower()
-            value = match.group(2).strip()
-            # Handle multi-line or array values
-            if value.startswith('[') or value.startswith('-') or not value:
-                # Skip complex values, just note the key exists
-                parsed[key] = value if value else True
-            else:
-                parsed[key] = value
+    def _refresh_file(self, file_path: Path) -> bool:
+        """Revalidate one file if its content changed; True if it was."""
+        key = _stat_key(file_path)
+        entry = self.files.get(file_path)
+        if key is None:
+            return self.files.pop(file_path, None) is not None
+        if entry is not None and entry.stat == key:
+            return False
 
-    return parsed if parsed else None, end_line, body
+        try:
+            with _phase('read'):
+                data = file_path.read_bytes()
+        except OSError as e:
+            self.files[file_path] = WatchEntry(key, '', None, [_read_error(file_path, e)], [])
+            return True
+        blob = git_blob_id(data)
+        if entry is not None and entry.blob == blob:
+            # Touched or rewritten with the same content
+            self.files[file_path] = entry._replace(stat=key)
+            return False
 
+        frontmatter = None
+        symbols = None
+        try:
+            frontmatter, _, body = extract_frontmatter(_decode_text(data))
+        except UnicodeDecodeError as e:
+            errors, warnings = [_read_error(file_path, e)], []
+        except FrontmatterLimitError as e:
+            errors, warnings = [e.issue(file_path)], []
+        else:
+            if frontmatter is None:
+                errors, warnings = [_missing_frontmatter(file_path)], []
+            else:
+                file_type = get_file_type(str(file_path))
+                symbols = extract_symbols(frontmatter, str(file_path), file_type)
+                errors, warnings = apply_rules(RULES_BY_TYPE[file_type], frontmatter, str(file_path), body)
+        self.files[file_path] = WatchEntry(key, blob, frontmatter, errors, warnings, symbols)
+        return True
 
-def is_array(value) -> bool:
-    """Check if value is an array (list) instead of comma-separated string."""
-    return isinstance(value, list)
+    def _plugin_dir(self, plugin: dict) -> Optional[Path]:
+        if not isinstance(plugin, dict):
+            return None
+        name = plugin.get('name', 'unknown')
+        source = plugin.get('source', f'./plugins/{name}')
+        if not isinstance(source, str) or source.startswith('/'):
+            return None
+        clean_source = source[2:] if source.startswith('./') else source
+        return Path(os.path.normpath(self.repo_root / clean_source))
 
+    def _refresh_manifest(self) -> int:
+        """Re-read the manifest, re-checking only new or changed plugin entries."""
+        import json
 
-def validate_lowercase_hyphenated(value: str) -> bool:
-    """Validate name is lowercase-hyphenated."""
-    if not isinstance(value, str):
-        return False
-    return bool(re.match(r'^[a-z][a-z0-9-]*$', value))
+        manifest, self.manifest_error = self.manifests.load_manifest(self.manifest_path)
+        plugins = []  # type: List[dict]
+        self.schema_errors = []
+        if not self.manifest_error:
+            self.schema_errors = self.manifests.check_manifest(manifest, self.manifest_path)
+            plugins, self.manifest_error = self.manifests.manifest_plugins(manifest)
+        # Schema errors name the entry's position, so a result is reused
+        # only for an identical entry at the same position
+        previous = {}  # type: Dict[Tuple[int, str], object]
+        for i, (plugin, result) in enumerate(self.plugin_results):
+            previous[i, json.dumps(plugin, sort_keys=True)] = result
 
+        revalidated = 0
+        self.plugin_results = []
+        for i, plugin in enumerate(plugins):
+            result = previous.get((i, json.dumps(plugin, sort_keys=True)))
+            if result is None:
+                result = self._validate_plugin(plugin, i)
+                revalidated += 1
+            self.plugin_results.append((plugin, result))
+        return revalidated
 
-def check_table_routing(content: str) -> bool:
-    """Check if content contains table-based routing (anti-pattern)."""
-    # Look for patterns like "| Keyword | Action |" or "| Trigger | Agent |"
-    table_routing_patterns = [
-        r'\|\s*(Keyword|Trigger|Command|Input|First Word)\s*\|\s*(Action|Agent|Route)',
-        r'\|\s*\w+\s*\|\s*(code-reviewer|engineer|architect)',
-    ]
-    for pattern in table_routing_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            return True
-    return False
+    def _refresh_plugins_containing(self, paths: List[Path]) -> int:
+        """Re-check manifest entries for plugins where files came or went."""
+        revalidated = 0
+        for i, (plugin, _) in enumerate(self.plugin_results):
+            plugin_dir = self._plugin_dir(plugin)
+            if plugin_dir is None:
+                continue
+            if any(_contains(plugin_dir, path) or _contains(path, plugin_dir) for path in paths):
+                self.plugin_results[i] = (plugin, self._validate_plugin(plugin, i))
+                revalidated += 1
+        return revalidated
 
+    def _validate_plugin(self, plugin: dict, i: int):
+        return self.manifests._validate_plugin(
+            plugin, self.repo_root, manifest_path=str(self.manifest_path), pointer=f'/plugins/{i}')
 
-def check_absolute_paths(content: str) -> List[int]:
-    """Check for absolute paths instead of ${CLAUDE_PLUGIN_ROOT}."""
-    lines_with_absolute = []
-    for i, line in enumerate(content.split('\n'), start=1):
-        # Look for hardcoded paths like /Users/, ~/.claude/plugins/, etc.
-        if re.search(r'(/Users/|/home/|~/.claude/plugins/)', line):
-            # Exclude comments explaining paths
-            if not line.strip().startswith('#') and not line.strip().startswith('//'):
-                lines_with_absolute.append(i)
-    return lines_with_absolute
+    def result(self) -> ValidationResult:
+        """Current frontmatter issues for every watched file, in discovery order."""
+        errors = []  # type: List[ValidationIssue]
+        warnings = []  # type: List[ValidationIssue]
+        for file_path in self.order:
+            entry = self.files[file_path]
+            errors.extend(entry.errors)
+            warnings.extend(entry.warnings)
+        if self.use_index:
+            index_errors, index_warnings = self._index_issues()
+            errors.extend(index_errors)
+            warnings.extend(index_warnings)
+        return ValidationResult(errors=errors, warnings=warnings, files_checked=len(self.order))
 
+    def _index_issues(self) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
+        """Cross-file issues, reused while no file's symbols and no roster changed."""
+        index_input = ([(file_path, self.files[file_path].symbols) for file_path in self.order],
+                       [(roster, _stat_key(roster)) for roster in self.rosters])
+        if index_input != self.index_input:
+            index = SymbolIndex()
+            for roster in self.rosters:
+                index.add_team_members(roster)
+            for file_path, symbols in index_input[0]:
+                index.add(str(file_path), symbols)
+            self.index_input = index_input
+            self.index_issues = index.check()
+        return self.index_issues
 
-def check_mcp_tools(tools_str: str, agent_name: str) -> Optional[str]:
-    """Check if non-wrapper agent has MCP tools (anti-pattern)."""
-    if not tools_str:
-        return None
+    def check(self, files: List[Path]) -> ValidationResult:
+        """Issues for just these files, as validate_files() would report them.
 
-    # Check if agent is a wrapper
-    if agent_name in MCP_WRAPPER_AGENTS:
-        return None
+        Watched files are refreshed by stat and served from memory; anything
+        else is validated from scratch and not kept.
+        """
+        errors = []  # type: List[ValidationIssue]
+        warnings = []  # type: List[ValidationIssue]
+        for file_path in files:
+            if file_path in self.files:
+                self._refresh_file(file_path)
+            entry = self.files.get(file_path)
+            if entry is None:
+                file_errors, file_warnings = validate_file(file_path)
+            else:
+                file_errors, file_warnings = entry.errors, entry.warnings
+            errors.extend(file_errors)
+            warnings.extend(file_warnings)
+        return ValidationResult(errors=errors, warnings=warnings, files_checked=len(files))
 
-    # Look for MCP tool patterns
-    mcp_patterns = [
-        (r'mcp__(?!claude_ai_Linear).*linear', 'Linear MCP - delegate to linear-service agent'),
-        (r'mcp__.*[Nn]otion', 'Notion MCP - delegate to life-notion agent'),
-        (r'mcp__.*calendar', 'Calendar MCP - delegate to life-calendar agent'),
-    ]
+    def manifest_result(self):
+        """Current manifest check, as validate_manifest_paths would return it."""
+        result = self.manifests.FullValidationResult(manifest_path=str(self.manifest_path))
+        if self.manifest_error:
+            result.manifest_errors.append(self.manifest_error)
+        result.schema_errors.extend(self.schema_errors)
+        result.plugin_results.extend(r for _, r in self.plugin_results)
+        return result
 
-    for pattern, message in mcp_patterns:
-        if re.search(pattern, tools_str, re.IGNORECASE):
-            return message
 
-    return None
+class PollingWatcher:
+    """Finds changes by stat()ing the watched trees every interval.
 
+    Directory listings are re-read only when a directory's mtime changes,
+    so an idle tick costs one stat per watched file and directory.  Each
+    directory's last listing is kept so a re-read is diffed against it
+    alone.
+    """
 
-def validate_agent(frontmatter: dict, file_path: str, body: str) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
-    """Validate agent frontmatter per agent-frontmatter.md and handoff checklist."""
-    errors = []
-    warnings = []
+    name = 'polling'
 
-    # ERROR if agent uses 'allowed-tools' instead of 'tools'
-    if 'allowed-tools' in frontmatter and 'tools' not in frontmatter:
-        errors.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Agents must use 'tools', not 'allowed-tools'",
-            field='allowed-tools'
-        ))
-
-    # Required fields per handoff checklist
-    required = ['name', 'description', 'color', 'tools']
-    for field in required:
-        if field not in frontmatter:
-            errors.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Missing required field '{field}'",
-                field=field
-            ))
-
-    # Recommended fields (warnings per handoff)
-    # Note: capabilities now lives in metadata.capabilities
-    if 'skills' not in frontmatter:
-        warnings.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Missing recommended field 'skills' - agents should have skills for discoverability",
-            field='skills',
-            severity='warning'
-        ))
-
-    # Check for capabilities in metadata block
-    metadata = frontmatter.get('metadata', {})
-    if not isinstance(metadata, dict):
-        metadata = {}
-    if 'capabilities' not in metadata:
-        warnings.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Missing 'metadata.capabilities' - agents should have capabilities for discoverability",
-            field='metadata.capabilities',
-            severity='warning'
-        ))
-
-    # Validate name format
-    if 'name' in frontmatter:
-        if not validate_lowercase_hyphenated(frontmatter['name']):
-            errors.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Field 'name' must be lowercase-hyphenated (got: {frontmatter['name']})",
-                field='name'
-            ))
-
-    # Validate color
-    if 'color' in frontmatter:
-        if frontmatter['color'] not in VALID_COLORS:
-            errors.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Invalid color '{frontmatter['color']}'. Valid: {', '.join(sorted(VALID_COLORS))}",
-                field='color'
-            ))
-
-    # Arrays are valid YAML - Claude accepts both formats
-    # No validation needed for array vs comma-separated
-
-    # MCP delegation check
-    agent_name = frontmatter.get('name', '')
-    tools_str = frontmatter.get('tools', '')
-    if isinstance(tools_str, str):
-        mcp_issue = check_mcp_tools(tools_str, agent_name)
-        if mcp_issue:
-            warnings.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Non-wrapper agent has MCP tools: {mcp_issue}",
-                field='tools',
-                severity='warning'
-            ))
-
-    # Check for absolute paths in body
-    abs_path_lines = check_absolute_paths(body)
-    for line_num in abs_path_lines[:3]:  # Limit to first 3
-        warnings.append(ValidationIssue(
-            file=file_path,
-            line=line_num,
-            message="Use ${CLAUDE_PLUGIN_ROOT} instead of absolute paths",
-            field=None,
-            severity='warning'
-        ))
-
-    # Check for fields that should be in metadata or are non-standard
-    for field in frontmatter.keys():
-        if field in METADATA_FIELDS:
-            warnings.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Field '{field}' should be under 'metadata:' block",
-                field=field,
-                severity='warning'
-            ))
-        elif field not in AGENT_FIELDS:
-            warnings.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Non-standard field '{field}' - wrap in 'metadata:' block",
-                field=field,
-                severity='warning'
-            ))
+    def __init__(self, roots: List[Path], interval: float = 0.5):
+        self.interval = interval
+        self.dirs = {}  # type: Dict[Path, int]
+        self.files = {}  # type: Dict[Path, Tuple[int, int]]
+        # directory -> (child files, child directories) from its last listing
+        self.children = {}  # type: Dict[Path, Tuple[Set[Path], Set[Path]]]
+        for root in roots:
+            self._list(root, set())
 
-    return errors, warnings
+    def _list(self, directory: Path, changed: set) -> None:
+        """(Re)read one directory's listing, recursing into new subdirectories."""
+        try:
+            mtime = directory.stat().st_mtime_ns
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        self.dirs[directory] = mtime
+        old_files, old_dirs = self.children.get(directory, (set(), set()))
+        files = set()  # type: Set[Path]
+        subdirs = set()  # type: Set[Path]
+        self.children[directory] = (files, subdirs)
 
+        for entry in entries:
+            path = Path(entry.path)
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                subdirs.add(path)
+                if path not in self.dirs:
+                    changed.add(path)
+                    self._list(path, changed)
+            elif path in self.files:
+                files.add(path)
+            else:
+                key = _stat_key(path)
+                if key is not None:
+                    self.files[path] = key
+                    files.add(path)
+                    changed.add(path)
 
-def validate_command(frontmatter: dict, file_path: str, body: str) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
-    """Validate command frontmatter per command-frontmatter.md spec."""
-    errors = []
-    warnings = []
+        for path in old_files - files:
+            if self.files.pop(path, None) is not None:
+                changed.add(path)
+        for path in old_dirs - subdirs:
+            self._forget(path, changed)
 
-    # ERROR if command uses 'tools' instead of 'allowed-tools'
-    if 'tools' in frontmatter and 'allowed-tools' not in frontmatter:
-        errors.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Commands must use 'allowed-tools', not 'tools'",
-            field='tools'
-        ))
-
-    # Required field: description
-    if 'description' not in frontmatter:
-        errors.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Missing required field 'description'",
-            field='description'
-        ))
-
-    # tools is recommended but not strictly required (some commands use allowed-tools or just route)
-    if 'tools' not in frontmatter and 'allowed-tools' not in frontmatter:
-        warnings.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Missing 'tools' field - commands typically need tools to execute",
-            field='tools',
-            severity='warning'
-        ))
-
-    # Arrays are valid YAML - Claude accepts both formats
-    # No validation needed for array vs comma-separated
-
-    # Check for $ARGUMENTS placeholder in commands
-    if '$ARGUMENTS' not in body:
-        warnings.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Command missing $ARGUMENTS placeholder - commands should include user input",
-            field=None,
-            severity='warning'
-        ))
-
-    # Check for table-based routing (anti-pattern per handoff)
-    if check_table_routing(body):
-        warnings.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Table-based routing detected - use natural language bullet points instead",
-            field=None,
-            severity='warning'
-        ))
-
-    # Check for fields that should be in metadata or are non-standard
-    for field in frontmatter.keys():
-        if field in METADATA_FIELDS:
-            warnings.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Field '{field}' should be under 'metadata:' block",
-                field=field,
-                severity='warning'
-            ))
-        elif field not in COMMAND_FIELDS:
-            warnings.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Non-standard field '{field}' - wrap in 'metadata:' block",
-                field=field,
-                severity='warning'
-            ))
+    def _forget(self, directory: Path, changed: set) -> None:
+        changed.add(directory)
+        parent = self.children.get(directory.parent)
+        if parent is not None:
+            parent[1].discard(directory)
+        self._drop(directory)
 
-    return errors, warnings
+    def _drop(self, directory: Path) -> None:
+        """Stop tracking a directory and everything listed under it."""
+        self.dirs.pop(directory, None)
+        files, subdirs = self.children.pop(directory, (set(), set()))
+        for path in files:
+            self.files.pop(path, None)
+        for path in subdirs:
+            self._drop(path)
 
+    def poll(self) -> set:
+        """Paths created, deleted or modified since the last poll."""
+        changed = set()  # type: set
+        for directory, mtime in list(self.dirs.items()):
+            if directory not in self.dirs:
+                continue  # forgotten along with its parent
+            key = _stat_key(directory)
+            if key is None:
+                self._forget(directory, changed)
+            elif key[1] != mtime:
+                self._list(directory, changed)
+        for path, key in list(self.files.items()):
+            current = _stat_key(path)
+            if current != key:
+                changed.add(path)
+                if current is None:
+                    del self.files[path]
+                    self.children[path.parent][0].discard(path)
+                else:
+                    self.files[path] = current
+        return changed
 
-def validate_skill(frontmatter: dict, file_path: str, body: str) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
-    """Validate skill frontmatter per skill-frontmatter.md spec."""
-    errors = []
-    warnings = []
+    pending = poll
 
-    # ERROR if skill uses 'tools' instead of 'allowed-tools'
-    if 'tools' in frontmatter and 'allowed-tools' not in frontmatter:
-        errors.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Skills must use 'allowed-tools', not 'tools'",
-            field='tools'
-        ))
-
-    # Required fields
-    required = ['name', 'description']
-    for field in required:
-        if field not in frontmatter:
-            errors.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Missing required field '{field}'",
-                field=field
-            ))
-
-    # Validate name format
-    if 'name' in frontmatter:
-        if not validate_lowercase_hyphenated(frontmatter['name']):
-            errors.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Field 'name' must be lowercase-hyphenated (got: {frontmatter['name']})",
-                field='name'
-            ))
-
-        # Skill name should match directory name
-        match = SKILL_PATTERN.search(file_path.replace('\\', '/'))
-        if match:
-            dir_name = match.group(1)
-            if frontmatter['name'] != dir_name:
-                errors.append(ValidationIssue(
-                    file=file_path,
-                    line=1,
-                    message=f"Skill name '{frontmatter['name']}' must match directory name '{dir_name}'",
-                    field='name'
-                ))
-
-    # Arrays are valid YAML - Claude accepts both formats
-    # No validation needed for array vs comma-separated
-
-    # Check description explains WHAT + WHEN (per handoff)
-    desc = frontmatter.get('description', '')
-    if desc and len(desc) < 20:
-        warnings.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Description too short - should explain WHAT the skill provides AND WHEN to use it",
-            field='description',
-            severity='warning'
-        ))
-
-    # Check for $ARGUMENTS in skills (anti-pattern)
-    if '$ARGUMENTS' in body:
-        errors.append(ValidationIssue(
-            file=file_path,
-            line=1,
-            message="Skills cannot use $ARGUMENTS - they receive no user input. Use commands or agents instead.",
-            field=None
-        ))
-
-    # Check for fields that should be in metadata or are non-standard
-    for field in frontmatter.keys():
-        if field in METADATA_FIELDS:
-            warnings.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Field '{field}' should be under 'metadata:' block",
-                field=field,
-                severity='warning'
-            ))
-        elif field not in SKILL_FIELDS:
-            warnings.append(ValidationIssue(
-                file=file_path,
-                line=1,
-                message=f"Non-standard field '{field}' - wrap in 'metadata:' block",
-                field=field,
-                severity='warning'
-            ))
+    def wait(self, timeout: Optional[float] = None) -> set:
+        """Block until something changes or timeout passes; returns the changes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self.poll()
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            time.sleep(self.interval)
 
-    return errors, warnings
+    def close(self) -> None:
+        pass
 
 
-def get_file_type(file_path: str) -> Optional[str]:
-    """Determine file type from path."""
-    # Normalize path separators
-    normalized = file_path.replace('\\', '/')
+class InotifyWatcher:
+    """Linux inotify watches on every directory under the watched trees."""
 
-    if AGENT_PATTERN.search(normalized):
-        return 'agent'
-    elif COMMAND_PATTERN.search(normalized):
-        return 'command'
-    elif SKILL_PATTERN.search(normalized):
-        return 'skill'
-    return None
+    name = 'inotify'
 
+    def __init__(self, roots: List[Path]):
+        import ctypes
 
-def validate_file(file_path: Path) -> Tuple[List[ValidationIssue], List[ValidationIssue]]:
-    """Validate a single file's frontmatter and content."""
-    errors = []
-    warnings = []
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.roots = list(roots)
+        self.watches = {}  # type: Dict[int, Path]
+        for root in self.roots:
+            self._watch_tree(root)
 
-    # Determine file type
-    file_type = get_file_type(str(file_path))
-    if file_type is None:
-        return [], []  # Not a validatable file
+    def _watch_tree(self, directory: Path) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(directory), INOTIFY_MASK)
+        if wd < 0:
+            return  # gone already, or not a directory
+        self.watches[wd] = directory
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                self._watch_tree(Path(entry.path))
 
-    # Read file
-    try:
-        content = file_path.read_text(encoding='utf-8')
-    except Exception as e:
-        return [ValidationIssue(
-            file=str(file_path),
-            line=1,
-            message=f"Cannot read file: {e}",
-            field=None
-        )], []
+    def _read_events(self) -> set:
+        import struct
 
-    # Extract frontmatter
-    frontmatter, end_line, body = extract_frontmatter(content)
+        changed = set()  # type: set
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = struct.unpack_from('iIII', data, offset)
+            name = data[offset + 16:offset + 16 + length].rstrip(b'\0')
+            offset += 16 + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: have the roots rescanned
+                changed.update(self.roots)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.watches[wd]
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch_tree(path)
+            changed.add(path)
+        return changed
 
-    if frontmatter is None:
-        errors.append(ValidationIssue(
-            file=str(file_path),
-            line=1,
-            message="Missing or invalid YAML frontmatter",
-            field=None
-        ))
-        return errors, warnings
+    def pending(self) -> set:
+        """Changes already queued, without blocking."""
+        import select
 
-    # Validate based on file type
-    if file_type == 'agent':
-        e, w = validate_agent(frontmatter, str(file_path), body)
-        errors.extend(e)
-        warnings.extend(w)
-    elif file_type == 'command':
-        e, w = validate_command(frontmatter, str(file_path), body)
-        errors.extend(e)
-        warnings.extend(w)
-    elif file_type == 'skill':
-        e, w = validate_skill(frontmatter, str(file_path), body)
-        errors.extend(e)
-        warnings.extend(w)
+        changed = set()  # type: set
+        while select.select([self.fd], [], [], 0)[0]:
+            changed |= self._read_events()
+        return changed
 
-    return errors, warnings
+    def wait(self, timeout: Optional[float] = None) -> set:
+        """Block until something changes or timeout passes; returns the changes."""
+        import select
 
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        changed = self._read_events()
+        while select.select([self.fd], [], [], WATCH_DEBOUNCE)[0]:
+            changed |= self._read_events()
+        return changed
 
-def find_plugin_files(plugins_dir: Path) -> List[Path]:
-    """Find all validatable markdown files in plugins directory."""
-    files = []
+    def close(self) -> None:
+        os.close(self.fd)
 
-    for plugin_dir in plugins_dir.iterdir():
-        if not plugin_dir.is_dir():
-            continue
 
-        # Agents
-        agents_dir = plugin_dir / 'agents'
-        if agents_dir.exists():
-            files.extend(agents_dir.glob('*.md'))
+def make_watcher(roots: List[Path], poll_interval: float = 0.5):
+    """inotify where the platform has it, stat polling otherwise."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots, poll_interval)
 
-        # Commands
-        commands_dir = plugin_dir / 'commands'
-        if commands_dir.exists():
-            files.extend(commands_dir.glob('*.md'))
 
-        # Skills (SKILL.md only, not references)
-        skills_dir = plugin_dir / 'skills'
-        if skills_dir.exists():
-            for skill_dir in skills_dir.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / 'SKILL.md'
-                    if skill_file.exists():
-                        files.append(skill_file)
+def format_watch_report(state: WatchState, show_warnings: bool = True, strict: bool = False) -> str:
+    """Frontmatter issues, plus the manifest report when it has errors."""
+    result = state.result()
+    if strict:
+        result = result._replace(errors=result.errors + result.warnings, warnings=[])
+    text = format_issues_text(result, show_warnings=show_warnings)
+    manifest_result = state.manifest_result()
+    if not manifest_result.is_valid:
+        text += '\n' + state.manifests.format_validation_text(manifest_result)
+    return text
 
-    return files
 
+def watch(repo_root: Path, show_warnings: bool = True, strict: bool = False, poll_interval: float = 0.5,
+          use_index: bool = True) -> int:
+    """Validate, then revalidate on every change until interrupted."""
+    state = WatchState(repo_root, use_index)
+    state.load()
+    watcher = make_watcher([state.plugins_dir, state.manifest_path.parent], poll_interval)
+    print(f"Watching {len(state.files)} files and {MANIFEST_PATH} ({watcher.name}); Ctrl-C to stop")
+    print(format_watch_report(state, show_warnings, strict), flush=True)
 
-def get_changed_files() -> List[Path]:
-    """Get list of changed markdown files from git."""
     try:
-        # Get files changed in PR (compared to base branch)
-        result = subprocess.run(
-            ['git', 'diff', '--name-only', '--diff-filter=ACMR', 'origin/main...HEAD'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        files = result.stdout.strip().split('\n')
-    except subprocess.CalledProcessError:
-        # Fallback: get uncommitted changes
+        while True:
+            changed = watcher.wait()
+            files_done, plugins_done = state.apply(changed)
+            if files_done or plugins_done:
+                print(f"[{time.strftime('%H:%M:%S')}] Revalidated {files_done} file(s), "
+                      f"{plugins_done} plugin(s)")
+                print(format_watch_report(state, show_warnings, strict), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+    valid = state.result().is_valid and state.manifest_result().is_valid
+    if strict:
+        valid = valid and not state.result().warnings
+    return 0 if valid else 1
+
+
+def _help_formatter(prog: str) -> 'argparse.HelpFormatter':
+    """Help formatter sized from os, sparing argparse its shutil import."""
+    import argparse
+
+    columns = os.environ.get('COLUMNS', '')
+    width = int(columns) if columns.isdigit() else 0
+    if width <= 0:
         try:
-            result = subprocess.run(
-                ['git', 'diff', '--name-only', '--diff-filter=ACMR', 'HEAD'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            files = result.stdout.strip().split('\n')
-        except subprocess.CalledProcessError:
-            return []
+            width = os.get_terminal_size(sys.__stdout__.fileno()).columns
+        except (AttributeError, OSError, ValueError):
+            width = 80
+    return argparse.RawDescriptionHelpFormatter(prog, width=width - 2)
 
-    # Filter to markdown files in plugins
-    return [
-        Path(f) for f in files
-        if f.endswith('.md') and f.startswith('plugins/')
-    ]
 
+def report_profile(profiler: Optional[Profiler], cprofile, profile_out: Optional[str]) -> None:
+    """Print the timing tables and write the pstats dump, if profiling."""
+    if profiler is None:
+        return
+    if cprofile is not None:
+        cprofile.disable()
+        cprofile.dump_stats(profile_out)
+    print(profiler.report(), file=sys.stderr)
+    enable_profiling(None)
 
-def format_issues_text(result: ValidationResult, show_warnings: bool = True) -> str:
-    """Format validation result as human-readable text."""
-    lines = []
 
-    if result.is_valid and not result.warnings:
-        lines.append(f"✓ All {result.files_checked} files valid")
-    elif result.is_valid and result.warnings:
-        lines.append(f"✓ {result.files_checked} files valid with {len(result.warnings)} warning(s)")
-    else:
-        lines.append(f"✗ Found {len(result.errors)} error(s) in {result.files_checked} files")
+def validate_rev_range(rev_range: str, repo_root: Path, json_output: bool = False, strict: bool = False,
+                       quiet: bool = False, show_warnings: bool = True, use_index: bool = True) -> int:
+    """Run --rev-range: exit code 1 if any commit has errors, 2 if the range does not resolve."""
+    try:
+        results = list(iter_range_results(rev_range, repo_root, use_index=use_index))
+    except ValueError as e:
+        if not quiet:
+            print(f"Error: {e}")
+        return 2
+    if strict:
+        results = [result._replace(frontmatter=result.frontmatter._replace(
+                       errors=result.frontmatter.errors + result.frontmatter.warnings, warnings=[]))
+                   for result in results]
 
-    # Show errors
-    if result.errors:
-        lines.append("")
-        lines.append("ERRORS:")
-
-        # Group by file
-        by_file = {}  # type: Dict[str, List[ValidationIssue]]
-        for issue in result.errors:
-            if issue.file not in by_file:
-                by_file[issue.file] = []
-            by_file[issue.file].append(issue)
-
-        for file_path, file_issues in sorted(by_file.items()):
-            lines.append(f"  {file_path}:")
-            for issue in file_issues:
-                field_info = f" [{issue.field}]" if issue.field else ""
-                lines.append(f"    Line {issue.line}{field_info}: {issue.message}")
-            lines.append("")
+    if not quiet:
+        if json_output:
+            import json
+            print(json.dumps(range_to_dict(results), indent=2))
+        elif not results:
+            print(f"No commits in {rev_range}")
+        else:
+            print(format_range_text(results, show_warnings=show_warnings))
+    return 0 if all(result.is_valid for result in results) else 1
 
-    # Show warnings
-    if show_warnings and result.warnings:
-        lines.append("")
-        lines.append("WARNINGS:")
-
-        by_file = {}  # type: Dict[str, List[ValidationIssue]]
-        for issue in result.warnings:
-            if issue.file not in by_file:
-                by_file[issue.file] = []
-            by_file[issue.file].append(issue)
-
-        for file_path, file_issues in sorted(by_file.items()):
-            lines.append(f"  {file_path}:")
-            for issue in file_issues:
-                field_info = f" [{issue.field}]" if issue.field else ""
-                lines.append(f"    Line {issue.line}{field_info}: {issue.message}")
-            lines.append("")
 
-    return '\n'.join(lines)
+# The options a git hook passes along with FILE arguments, by dest
+_HOOK_FLAGS = {'-q': 'quiet', '--quiet': 'quiet', '--strict': 'strict', '--no-warnings': 'no_warnings'}
 
 
-def main() -> int:
-    """Main entry point."""
+def _hook_args(argv: List[str]):
+    """What _parse_args(argv) returns for a hook's FILE... call, or None for any other.
+
+    Importing argparse and building the parser costs more than validating
+    the file or two a pre-commit hook passes, so a call made only of FILE
+    arguments and _HOOK_FLAGS skips both.
+    """
+    from types import SimpleNamespace
+
+    args = SimpleNamespace(
+        files=[], json=False, ndjson=False, changed=False, staged=False, rev_range=None,
+        strict=False, quiet=False, no_warnings=False, group_by='file', no_index=False, external_skill=[],
+        references=False, max_frontmatter_bytes=FRONTMATTER_MAX_BYTES, max_depth=FRONTMATTER_MAX_DEPTH,
+        max_aliases=FRONTMATTER_MAX_ALIASES, parse_timeout=FRONTMATTER_PARSE_SECONDS, jobs=1,
+        pipeline=False, cache=None, deps=None, watch=False, poll_interval=0.5, profile=False,
+        profile_out=None,
+    )
+    for arg in argv:
+        if arg in _HOOK_FLAGS:
+            setattr(args, _HOOK_FLAGS[arg], True)
+        elif arg.startswith('-'):
+            return None
+        else:
+            args.files.append(arg)
+    return args
+
+
+def _parse_args(argv: List[str]) -> 'argparse.Namespace':
+    """Parse and check the command line; exits with usage on a bad one."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='Validate YAML frontmatter in plugin markdown files',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
+        formatter_class=_help_formatter,
         epilog="""
 Exit codes:
   0  Valid (no errors)
   1  Validation errors found
-  2  No files to validate
+  2  No files to validate, or --rev-range does not resolve
 
 Examples:
   python3 scripts/validate-frontmatter.py
   python3 scripts/validate-frontmatter.py --json
+  python3 scripts/validate-frontmatter.py --ndjson  # one issue per line, streamed
   python3 scripts/validate-frontmatter.py --changed
+  python3 scripts/validate-frontmatter.py --staged  # index content, not working tree
+  python3 scripts/validate-frontmatter.py --rev-range origin/main..HEAD  # each commit of a push
+  python3 scripts/validate-frontmatter.py plugins/foo/agents/bar.md
   python3 scripts/validate-frontmatter.py --strict  # warnings become errors
+  python3 scripts/validate-frontmatter.py --references
+  python3 scripts/validate-frontmatter.py --jobs 8  # 8 worker processes
+  python3 scripts/validate-frontmatter.py --max-frontmatter-bytes 16384 --parse-timeout 1
+  python3 scripts/validate-frontmatter.py --pipeline --ndjson  # first results while still listing
+  python3 scripts/validate-frontmatter.py --cache   # .cache/validate-frontmatter.json
+  python3 scripts/validate-frontmatter.py --deps    # whole tree, writes .cache/validate-deps.json
+  python3 scripts/validate-frontmatter.py --changed --deps
+  python3 scripts/validate-frontmatter.py --profile --profile-out fm.pstats
+  python3 scripts/validate-frontmatter.py --watch
         """
     )
+    parser.add_argument(
+        'files',
+        nargs='*',
+        metavar='FILE',
+        help='Only validate these files; others are skipped (for pre-commit hooks)'
+    )
     parser.add_argument(
         '--json',
         action='store_true',
         help='Output results as JSON'
     )
+    parser.add_argument(
+        '--ndjson',
+        action='store_true',
+        help='Stream one JSON record per issue as files are validated, then a summary record'
+    )
     parser.add_argument(
         '--changed',
         action='store_true',
         help='Only validate files changed in git'
     )
+    parser.add_argument(
+        '--staged',
+        action='store_true',
+        help='Validate staged content from the git index, not the working tree '
+             '(with FILE, only those files); implies --cache'
+    )
+    parser.add_argument(
+        '--rev-range',
+        metavar='A..B',
+        help='Validate the frontmatter and manifest of every commit in a git range, read from git '
+             'objects; prints each commit\'s counts and the issues it introduced. Only blobs that '
+             'changed between commits are parsed. Fails if any commit has errors'
+    )
     parser.add_argument(
         '--strict',
         action='store_true',
@@ -735,8 +3949,167 @@ Examples:
         action='store_true',
         help='Suppress warning output (still show errors)'
     )
+    parser.add_argument(
+        '--group-by',
+        choices=['file', 'code'],
+        default='file',
+        help='Group text output by file (default), or by issue code and then file'
+    )
+    parser.add_argument(
+        '--no-index',
+        action='store_true',
+        help='Skip cross-file checks: unknown skill/agent references and duplicate names '
+             '(only run when validating the whole tree)'
+    )
+    parser.add_argument(
+        '--external-skill',
+        action='append',
+        default=[],
+        metavar='NAME',
+        help='A skill defined outside this repo that agents may reference (repeatable; '
+             f"added to {', '.join(sorted(EXTERNAL_SKILLS))})"
+    )
+    parser.add_argument(
+        '--references',
+        action='store_true',
+        help='Also scan skill reference files (skills/*/references/**/*.md) for absolute paths; '
+             f'they are memory-mapped, never decoded, and only the first {REFERENCE_MAX_BYTES // (1024 * 1024)} MiB '
+             'of each is scanned'
+    )
+    parser.add_argument(
+        '--max-frontmatter-bytes',
+        type=int,
+        default=FRONTMATTER_MAX_BYTES,
+        metavar='N',
+        help=f'Frontmatter over N bytes, or without a closing --- within them, is an error '
+             f'(default: {FRONTMATTER_MAX_BYTES}; 0: no limit)'
+    )
+    parser.add_argument(
+        '--max-depth',
+        type=int,
+        default=FRONTMATTER_MAX_DEPTH,
+        metavar='N',
+        help=f'Frontmatter nesting deeper than N levels is an error, checked before YAML parses it '
+             f'(default: {FRONTMATTER_MAX_DEPTH}; 0: no limit)'
+    )
+    parser.add_argument(
+        '--max-aliases',
+        type=int,
+        default=FRONTMATTER_MAX_ALIASES,
+        metavar='N',
+        help=f'YAML aliases re-entering collections more than N times is an error '
+             f'(default: {FRONTMATTER_MAX_ALIASES}; 0: no limit)'
+    )
+    parser.add_argument(
+        '--parse-timeout',
+        type=float,
+        default=FRONTMATTER_PARSE_SECONDS,
+        metavar='SECONDS',
+        help=f'YAML parsing of one file taking longer is an error; each --jobs worker times its '
+             f'own files (default: {FRONTMATTER_PARSE_SECONDS:g}; 0: no limit)'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        nargs='?',
+        const=0,
+        default=1,
+        metavar='N',
+        help='Validate with N worker processes (no value or 0: one per CPU; '
+             f'inputs under {PARALLEL_MIN_FILES} files always run serially)'
+    )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Run discovery, reads and validation as overlapping stages (threads for I/O, '
+             'asyncio to coordinate them), so cold-cache reads do not leave the CPU idle; '
+             'whole-tree runs only'
+    )
+    parser.add_argument(
+        '--cache',
+        nargs='?',
+        const=str(DEFAULT_CACHE_FILE),
+        default=None,
+        metavar='PATH',
+        help=f'Cache results by content hash and rule version (default: {DEFAULT_CACHE_FILE})'
+    )
+    parser.add_argument(
+        '--deps',
+        nargs='?',
+        const=str(DEFAULT_DEPS_FILE),
+        default=None,
+        metavar='PATH',
+        help=f'Keep a dependency graph (default: {DEFAULT_DEPS_FILE}). Whole-tree runs write it; '
+             'with --changed or FILE, the changed files and every file that defines or references '
+             'a name they define are revalidated (the whole tree if there is no graph yet)'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Stay running and revalidate changed files and manifest entries'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=0.5,
+        metavar='SECONDS',
+        help='Seconds between scans when --watch cannot use inotify (default: 0.5)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print per-phase, per-rule and per-file timings to stderr (runs serially)'
+    )
+    parser.add_argument(
+        '--profile-out',
+        metavar='PATH',
+        help='Also write a cProfile pstats dump to PATH (implies --profile)'
+    )
+
+    args = parser.parse_args(argv)
+    if args.staged and args.changed:
+        parser.error('--staged and --changed are alternatives')
+    if args.json and args.ndjson:
+        parser.error('--json and --ndjson are alternatives')
+    if args.watch and (args.files or args.changed or args.staged or args.json or args.ndjson or args.deps):
+        parser.error('--watch validates the whole tree and cannot be combined with FILE, --changed, '
+                     '--staged, --json, --ndjson or --deps')
+    if args.pipeline and (args.files or args.changed or args.staged or args.watch or args.jobs != 1):
+        parser.error('--pipeline validates the whole tree in one process and cannot be combined '
+                     'with FILE, --changed, --staged, --watch or --jobs')
+    if args.rev_range and (args.files or args.changed or args.staged or args.watch or args.pipeline
+                           or args.ndjson or args.references or args.cache or args.deps or args.jobs != 1):
+        parser.error('--rev-range reads commits, not the working tree, and cannot be combined with FILE, '
+                     '--changed, --staged, --watch, --pipeline, --ndjson, --references, --cache, --deps or --jobs')
+    if args.rev_range and args.rev_range.startswith('-'):
+        parser.error(f'--rev-range {args.rev_range} is not a commit range')
+    if args.references and args.staged:
+        parser.error('--references reads the working tree and cannot be combined with --staged')
+    if args.deps and (args.staged or args.no_index):
+        parser.error('--deps cannot be combined with --staged or --no-index')
+
+    if min(args.max_frontmatter_bytes, args.max_depth, args.max_aliases, args.parse_timeout) < 0:
+        parser.error('limits cannot be negative')
+    if args.deps:
+        deps_path = Path(args.deps)
+        # nargs='?' lets --deps swallow a FILE that follows it; never write over one
+        if deps_path.suffix != '.json' or deps_path.name in ('team-members.json', MANIFEST_PATH.name):
+            parser.error(f'--deps {deps_path} is not a dependency graph file '
+                         '(use --deps=PATH, or put FILE arguments first)')
+    return args
+
+
+def main() -> int:
+    """Main entry point."""
+    argv = sys.argv[1:]
+    args = _hook_args(argv)
+    if args is None:
+        args = _parse_args(argv)
 
-    args = parser.parse_args()
+    set_parse_limits(ParseLimits(args.max_frontmatter_bytes, args.max_depth, args.max_aliases,
+                                 args.parse_timeout))
+    if args.external_skill:
+        set_external_skills(EXTERNAL_SKILLS | set(args.external_skill))
 
     # Find repository root
     script_dir = Path(__file__).parent.resolve()
@@ -748,30 +4121,152 @@ Examples:
             print("Error: plugins directory not found")
         return 2
 
+    if args.watch:
+        return watch(repo_root, show_warnings=not args.no_warnings, strict=args.strict,
+                     poll_interval=args.poll_interval, use_index=not args.no_index)
+
+    profiler = None
+    cprofile = None
+    if args.profile or args.profile_out:
+        profiler = Profiler()
+        enable_profiling(profiler)
+        if args.profile_out:
+            import cProfile
+            cprofile = cProfile.Profile()
+            cprofile.enable()
+
+    if args.rev_range:
+        status = validate_rev_range(args.rev_range, repo_root, json_output=args.json, strict=args.strict,
+                                    quiet=args.quiet, show_warnings=not args.no_warnings,
+                                    use_index=not args.no_index)
+        report_profile(profiler, cprofile, args.profile_out)
+        return status
+
+    deps_path = None
+    if args.deps:
+        deps_path = Path(args.deps)
+        if not deps_path.is_absolute():
+            deps_path = repo_root / deps_path
+
     # Get files to validate
-    if args.changed:
-        files = get_changed_files()
-        # Resolve relative to repo root
-        files = [repo_root / f for f in files if (repo_root / f).exists()]
-    else:
-        files = find_plugin_files(plugins_dir)
+    staged = None
+    graph = None
+    changed_paths = None  # type: Optional[List[Path]]
+    whole_tree = not (args.files or args.changed or args.staged)
+    with _phase('discover'):
+        if deps_path is not None and not whole_tree:
+            graph = DependencyGraph.load(deps_path, repo_root)
+        if args.staged:
+            staged = get_staged_files(repo_root)
+            if args.files:
+                wanted = {Path(f).absolute() for f in args.files}
+                staged = [(f, blob) for f, blob in staged if f in wanted]
+            files = [f for f, _ in staged]
+        elif graph is not None:
+            # Deleted paths matter too: they can orphan references
+            changed_paths = [Path(f).absolute() for f in args.files] if args.files else get_changed_paths(repo_root)
+            files = changed_paths
+        elif deps_path is not None or whole_tree:
+            # With --deps and no graph yet, validate everything once to build it
+            whole_tree = True
+            # The pipeline lists the tree while it validates
+            files = [] if args.pipeline else find_plugin_files(plugins_dir)
+        elif args.files:
+            files = [Path(f).absolute() for f in args.files]
+            files = [f for f in files if get_file_type(str(f)) and f.exists()]
+        elif args.changed:
+            files = get_changed_files()
+            # Resolve relative to repo root
+            files = [repo_root / f for f in files if (repo_root / f).exists()]
+
+        references = []  # type: List[Path]
+        if args.references:
+            if whole_tree:
+                references = find_reference_files(plugins_dir)
+            else:
+                candidates = changed_paths
+                if candidates is None:
+                    candidates = [Path(f).absolute() for f in args.files] if args.files else get_changed_paths(repo_root)
+                references = [f for f in candidates if is_reference_file(f) and f.is_file()]
 
-    if not files:
+    if not files and not references and not args.pipeline:
         if not args.quiet:
             if args.json:
+                import json
                 print(json.dumps({'is_valid': True, 'files_checked': 0, 'errors': [], 'warnings': []}))
+            elif args.ndjson:
+                import json
+                print(json.dumps(_ndjson_summary(0, 0, 0)))
             else:
                 print("No files to validate")
         return 0
 
     # Validate all files
-    all_errors = []  # type: List[ValidationIssue]
-    all_warnings = []  # type: List[ValidationIssue]
+    cache = None
+    if args.staged and not args.cache:
+        args.cache = str(DEFAULT_CACHE_FILE)
+    if args.cache:
+        cache_path = Path(args.cache)
+        if not cache_path.is_absolute():
+            cache_path = repo_root / cache_path
+        with _phase('cache'):
+            cache = ValidationCache.load(cache_path)
 
-    for file_path in files:
-        errors, warnings = validate_file(file_path)
-        all_errors.extend(errors)
-        all_warnings.extend(warnings)
+    # Cross-file checks need every definition, so only whole-tree runs get
+    # them; incremental runs take the definitions from the graph
+    index = None
+    if whole_tree and not args.no_index:
+        index = SymbolIndex()
+        for roster in find_team_rosters(plugins_dir):
+            index.add_team_members(roster)
+
+    if changed_paths is not None:
+        changed = validate_changed(graph, changed_paths, jobs=args.jobs, cache=cache)
+        files = changed.files
+        file_results = iter([(None, changed.errors, changed.warnings)])
+    elif staged is not None:
+        file_results = iter_staged_results(staged, repo_root, cache)
+    else:
+        if args.pipeline:
+            file_results = iter_pipelined_results(plugins_dir, cache=cache, index=index)
+        else:
+            file_results = iter_file_results(files, jobs=args.jobs, cache=cache, index=index)
+        if index is not None:
+            file_results = with_index_issues(file_results, index)
+    if references:
+        import itertools
+        file_results = itertools.chain(file_results, iter_reference_results(references))
+    files_checked = len(files) + len(references)
+
+    if args.ndjson:
+        error_count, _ = write_ndjson(file_results, None if args.pipeline else files_checked,
+                                      strict=args.strict, out=None if args.quiet else sys.stdout)
+    else:
+        all_errors, all_warnings = [], []
+        counted = 0
+        for file_path, errors, warnings in file_results:
+            counted += file_path is not None
+            all_errors.extend(errors)
+            all_warnings.extend(warnings)
+        if args.pipeline:
+            files_checked = counted
+
+    if deps_path is not None and graph is None:
+        graph = DependencyGraph.from_index(repo_root, index, read_manifest_plugins(repo_root / MANIFEST_PATH))
+    try:
+        with _phase('cache'):
+            if cache is not None:
+                cache.save()
+            if deps_path is not None:
+                graph.save(deps_path)
+    except OSError as e:
+        if not args.quiet:
+            print(f"Warning: could not write cache: {e}", file=sys.stderr)
+
+    report_profile(profiler, cprofile, args.profile_out)
+
+    if args.ndjson:
+        return 0 if error_count == 0 else 1
 
     # In strict mode, promote warnings to errors
     if args.strict:
@@ -781,15 +4276,16 @@ Examples:
     result = ValidationResult(
         errors=all_errors,
         warnings=all_warnings,
-        files_checked=len(files)
+        files_checked=files_checked
     )
 
     # Output results
     if not args.quiet:
         if args.json:
+            import json
             print(json.dumps(result.to_dict(), indent=2))
         else:
-            print(format_issues_text(result, show_warnings=not args.no_warnings))
+            print(format_issues_text(result, show_warnings=not args.no_warnings, group_by=args.group_by))
 
     return 0 if result.is_valid else 1
 
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Validator Launcher for Git Hooks
+
+Runs validate-frontmatter.py or validate-manifests.py with cached bytecode.
+Python recompiles a script passed on the command line on every run, which
+for the validators costs more than the validation itself in a pre-commit
+hook. Importing them instead reuses scripts/__pycache__: the launcher's
+directory is sys.path[0], so a plain import finds the hyphenated module
+names, and multiprocessing children inherit that path.
+
+Usage:
+    python3 scripts/validate-hook.py frontmatter [ARGS...]  # validate-frontmatter.py ARGS
+    python3 scripts/validate-hook.py manifests [ARGS...]    # validate-manifests.py ARGS
+
+Exit codes:
+    Those of the selected validator, or 2 for an unknown validator name.
+"""
+
+import sys
+
+
+VALIDATORS = {
+    'frontmatter': 'validate-frontmatter.py',
+    'manifests': 'validate-manifests.py',
+}
+
+
+def main() -> int:
+    """Main entry point."""
+    if len(sys.argv) < 2 or sys.argv[1] not in VALIDATORS:
+        print(f"Usage: {sys.argv[0]} {{{','.join(VALIDATORS)}}} [ARGS...]")
+        return 2
+
+    script = VALIDATORS[sys.argv[1]]
+
+    # The validator's argparse sees the same argv as a direct run
+    sys.argv = [script] + sys.argv[2:]
+    module = __import__(script[:-len('.py')])
+    return module.main()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
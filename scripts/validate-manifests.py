@@ -4,14 +4,18 @@ from __future__ import annotations
 """
 Manifest Validation CLI
 
-Standalone validator for checking manifest-to-filesystem integrity.
-Designed for pre-commit hooks and CI/CD pipelines.
+Standalone validator for checking manifest-to-filesystem integrity, and
+marketplace.json and each plugin's .claude-plugin/plugin.json against
+their schemas. Designed for pre-commit hooks and CI/CD pipelines.
 
 Usage:
     python3 scripts/validate-manifests.py           # Validate, human-readable
     python3 scripts/validate-manifests.py --json   # JSON output
+    python3 scripts/validate-manifests.py --ndjson # Streamed JSON lines, then a summary
     python3 scripts/validate-manifests.py --fix    # Show fix suggestions
     python3 scripts/validate-manifests.py --path /custom/manifest.json
+    python3 scripts/validate-manifests.py --path 'repos/*/.claude-plugin/marketplace.json'
+    python3 scripts/validate-manifests.py --path manifest.json --base-dir plugins-root
 
 Exit codes:
     0 - Valid (no errors)
@@ -19,12 +23,283 @@ Exit codes:
     2 - Manifest not found or unreadable
 """
 
-import argparse
-import json
+# Startup time matters in git hooks: argparse, glob and json are imported
+# where used
+import os
+import re
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+
+# Upper bound on manifests validated at once; the work is stat()-bound
+MAX_MANIFEST_WORKERS = 8
+
+
+# ─── Manifest schema ───
+#
+# marketplace.json, its plugin entries and each plugin's
+# .claude-plugin/plugin.json are described declaratively, in a subset of
+# JSON Schema: type, required, properties, items, pattern, minLength and
+# minItems. A value that may be a string or an object lists both types,
+# and each keyword only applies to values of the type it describes, so
+# such a schema reads as a oneOf of its string and object forms.
+# compile_schema() turns a schema into nested closures once, so
+# checking an entry costs a type() and a dict lookup per field present.
+
+NAME_PATTERN = r'^[a-z0-9]+(?:-[a-z0-9]+)*$'
+SEMVER_PATTERN = r'^(?:0|[1-9]\d*)\.(?:0|[1-9]\d*)\.(?:0|[1-9]\d*)(?:-[0-9A-Za-z.-]+)?(?:\+[0-9A-Za-z.-]+)?$'
+
+_NAME = {'type': 'string', 'pattern': NAME_PATTERN, 'description': 'a kebab-case name'}
+_VERSION = {'type': 'string', 'pattern': SEMVER_PATTERN,
+            'description': 'a semantic version (MAJOR.MINOR.PATCH)'}
+_TEXT = {'type': 'string', 'minLength': 1}
+_TEXT_LIST = {'type': 'array', 'items': _TEXT}
+_PERSON = {'type': 'object', 'required': ['name'],
+           'properties': {'name': _TEXT, 'email': _TEXT, 'url': _TEXT}}
+
+# A plugin directory relative to the marketplace, or where to fetch the
+# plugin from, e.g. {"source": "github", "repo": "owner/name"}
+_SOURCE = {'type': ['string', 'object'], 'minLength': 1, 'required': ['source'],
+           'properties': {'source': _TEXT, 'repo': _TEXT, 'url': _TEXT, 'ref': _TEXT, 'path': _TEXT}}
+
+# A hooks file relative to the plugin, or the hooks configuration inline
+_HOOKS = {'type': ['string', 'object'], 'minLength': 1}
+
+# Fields a marketplace entry shares with plugin.json. Component paths are
+# lists, as _validate_plugin() checks them.
+_PLUGIN_PROPERTIES = {
+    'name': _NAME,
+    'description': _TEXT,
+    'version': _VERSION,
+    'author': _PERSON,
+    'homepage': _TEXT,
+    'repository': _TEXT,
+    'license': _TEXT,
+    'keywords': _TEXT_LIST,
+    'category': _TEXT,
+    'tags': _TEXT_LIST,
+    'agents': _TEXT_LIST,
+    'commands': _TEXT_LIST,
+    'skills': _TEXT_LIST,
+    'hooks': _HOOKS,
+    'mcpServers': {'type': ['string', 'object']},
+}
+
+# The plugin entries are checked one at a time by _validate_plugin()
+MARKETPLACE_SCHEMA = {
+    'type': 'object',
+    'required': ['name', 'owner'],
+    'properties': {
+        'name': _NAME,
+        'owner': _PERSON,
+        'metadata': {'type': 'object', 'properties': {
+            'description': _TEXT, 'version': _VERSION, 'pluginRoot': _TEXT}},
+        'plugins': {'type': 'array'},
+    },
+}
+
+PLUGIN_ENTRY_SCHEMA = {
+    'type': 'object',
+    'required': ['name'],
+    'properties': dict(_PLUGIN_PROPERTIES, source=_SOURCE, strict={'type': 'boolean'}),
+}
+
+PLUGIN_JSON_SCHEMA = {
+    'type': 'object',
+    'required': ['name'],
+    'properties': _PLUGIN_PROPERTIES,
+}
+
+# Entry fields the path checks read; they are skipped when one has the wrong type
+PATH_FIELDS = frozenset(['source', 'agents', 'commands', 'skills', 'hooks'])
+
+
+@dataclass
+class SchemaError:
+    """A value in a manifest or plugin.json that does not fit its schema."""
+    file: str
+    pointer: str  # JSON pointer to the value, or to where a missing key belongs
+    error: str  # 'wrong_type', 'missing_required', 'pattern_mismatch', 'too_short', 'invalid_json'
+    message: str
+
+    @property
+    def location(self) -> str:
+        return f"{self.file}#{self.pointer}"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'file': self.file,
+            'pointer': self.pointer,
+            'error': self.error,
+            'message': self.message,
+        }
+
+
+# Checker(value, pointer, out) appends (pointer, error, message) to out
+Checker = Callable[[Any, str, list], None]
+
+# JSON types by the Python types json.loads() returns; compared with
+# type(), so True is not an integer
+_JSON_TYPES: dict[str, tuple[type, ...]] = {
+    'object': (dict,),
+    'array': (list,),
+    'string': (str,),
+    'boolean': (bool,),
+    'integer': (int,),
+    'number': (int, float),
+    'null': (type(None),),
+}
+_TYPE_NAMES = {dict: 'object', list: 'array', str: 'string', bool: 'boolean',
+               int: 'integer', float: 'number', type(None): 'null'}
+
+
+def _pointer_token(key: str) -> str:
+    return '/' + key.replace('~', '~0').replace('/', '~1')
+
+
+def _string_test(schema: dict[str, Any]) -> Callable[[Any], bool] | None:
+    """A quick accept test for a plain string schema, None for any other.
+
+    Containers run it first and build a value's pointer and call its
+    checker only when it fails, which for valid manifests is never.
+    """
+    if schema.get('type') != 'string' or set(schema) - {'type', 'minLength', 'pattern', 'description'}:
+        return None
+    min_length = schema.get('minLength', 0)
+    if 'pattern' not in schema:
+        return lambda value: type(value) is str and len(value) >= min_length
+    search = re.compile(schema['pattern']).search
+    return lambda value: type(value) is str and len(value) >= min_length and search(value) is not None
+
+
+def compile_schema(schema: dict[str, Any]) -> Checker:
+    """Compile a schema into a checker closure.
+
+    Everything that does not depend on the value is settled here:
+    patterns are compiled, property pointers escaped, and only the
+    keywords the schema uses become checks. A value of the wrong type
+    gets one error and no further checks.
+    """
+    checks: list[Checker] = []
+
+    if 'minLength' in schema:
+        min_length = schema['minLength']
+
+        def check_min_length(value: Any, pointer: str, out: list) -> None:
+            if type(value) is str and len(value) < min_length:
+                out.append((pointer, 'too_short', f"expected at least {min_length} character(s)"))
+        checks.append(check_min_length)
+
+    if 'pattern' in schema:
+        regex = re.compile(schema['pattern'])
+        expected = schema.get('description', f"a string matching {schema['pattern']}")
+
+        def check_pattern(value: Any, pointer: str, out: list) -> None:
+            if type(value) is str and not regex.search(value):
+                import json
+                out.append((pointer, 'pattern_mismatch', f"expected {expected}, got {json.dumps(value)}"))
+        checks.append(check_pattern)
+
+    if 'minItems' in schema:
+        min_items = schema['minItems']
+
+        def check_min_items(value: Any, pointer: str, out: list) -> None:
+            if type(value) is list and len(value) < min_items:
+                out.append((pointer, 'too_short', f"expected at least {min_items} item(s)"))
+        checks.append(check_min_items)
+
+    if 'required' in schema:
+        required = [(key, _pointer_token(key)) for key in schema['required']]
+
+        def check_required(value: Any, pointer: str, out: list) -> None:
+            if type(value) is dict:
+                for key, token in required:
+                    if key not in value:
+                        out.append((pointer + token, 'missing_required', f"missing required key '{key}'"))
+        checks.append(check_required)
+
+    if 'properties' in schema:
+        properties = {key: (_pointer_token(key), compile_schema(sub), _string_test(sub))
+                      for key, sub in schema['properties'].items()}
+
+        def check_properties(value: Any, pointer: str, out: list) -> None:
+            if type(value) is dict:
+                # Only the keys present, in document order
+                for key, item in value.items():
+                    known = properties.get(key)
+                    if known is not None and (known[2] is None or not known[2](item)):
+                        known[1](item, pointer + known[0], out)
+        checks.append(check_properties)
+
+    if 'items' in schema:
+        check_item = compile_schema(schema['items'])
+        item_test = _string_test(schema['items'])
+
+        def check_items(value: Any, pointer: str, out: list) -> None:
+            if type(value) is list:
+                if item_test is not None and all(map(item_test, value)):
+                    return
+                for i, item in enumerate(value):
+                    check_item(item, f"{pointer}/{i}", out)
+        checks.append(check_items)
+
+    def check_all(value: Any, pointer: str, out: list) -> None:
+        for check in checks:
+            check(value, pointer, out)
+
+    if 'type' not in schema:
+        return check_all
+    names = [schema['type']] if isinstance(schema['type'], str) else list(schema['type'])
+    allowed = frozenset(t for name in names for t in _JSON_TYPES[name])
+    expected_type = ' or '.join(names)
+
+    # Most leaves have one check or none; call it without check_all
+    then = check_all if len(checks) > 1 else checks[0] if checks else None
+
+    def check_type(value: Any, pointer: str, out: list) -> None:
+        if type(value) not in allowed:
+            got = _TYPE_NAMES.get(type(value), type(value).__name__)
+            out.append((pointer, 'wrong_type', f"expected {expected_type}, got {got}"))
+        elif then is not None:
+            then(value, pointer, out)
+    return check_type
+
+
+check_marketplace = compile_schema(MARKETPLACE_SCHEMA)
+check_plugin_entry = compile_schema(PLUGIN_ENTRY_SCHEMA)
+check_plugin_json = compile_schema(PLUGIN_JSON_SCHEMA)
+
+
+def schema_errors(checker: Checker, value: Any, file: str, pointer: str = '') -> list[SchemaError]:
+    """Run a compiled checker over value, the document at file or a part of it at pointer."""
+    found: list = []
+    checker(value, pointer, found)
+    return [SchemaError(file, *error) for error in found]
+
+
+def _check_plugin_json(path: Path, snapshot: Any = None) -> list[SchemaError]:
+    """Schema errors for a plugin's .claude-plugin/plugin.json.
+
+    Read through snapshot.read_text() when the snapshot has one (a commit
+    being validated from git objects), else from disk.
+    """
+    import json
+
+    read_text = getattr(snapshot, 'read_text', None)
+    try:
+        if read_text is not None:
+            text = read_text(path)
+        else:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+        data = json.loads(text)
+    except (OSError, UnicodeDecodeError) as e:
+        return [SchemaError(str(path), '', 'unreadable', f"Cannot read: {e}")]
+    except json.JSONDecodeError as e:
+        return [SchemaError(str(path), '', 'invalid_json', f"Invalid JSON: {e}")]
+    return schema_errors(check_plugin_json, data, str(path))
 
 
 # ─── Inlined validation logic (from workspace plugin's validation.py) ───
@@ -37,7 +312,7 @@ class IntegrityError:
     file_type: str  # 'agent', 'command', 'skill', 'hook'
     declared_path: str
     expected_path: str
-    error: str  # 'missing_file', 'missing_skill_dir', 'missing_skill_md'
+    error: str  # 'missing_file', 'missing_skill_dir', 'missing_skill_md', 'orphan_file', 'undeclared_skill_dir'
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -53,16 +328,22 @@ class IntegrityError:
 class ValidationResult:
     """Validation result for a single plugin."""
     plugin_name: str
-    plugin_source: str
+    plugin_source: str | dict[str, Any]
     errors: list[IntegrityError] = field(default_factory=list)
     agents_checked: int = 0
     commands_checked: int = 0
     skills_checked: int = 0
     hooks_checked: int = 0
+    # The entry's own, then its plugin.json's
+    schema_errors: list[SchemaError] = field(default_factory=list)
 
     @property
     def is_valid(self) -> bool:
-        return len(self.errors) == 0
+        return len(self.errors) == 0 and len(self.schema_errors) == 0
+
+    @property
+    def error_count(self) -> int:
+        return len(self.errors) + len(self.schema_errors)
 
     @property
     def total_checked(self) -> int:
@@ -79,6 +360,7 @@ class ValidationResult:
             'plugin_source': self.plugin_source,
             'is_valid': self.is_valid,
             'errors': [e.to_dict() for e in self.errors],
+            'schema_errors': [e.to_dict() for e in self.schema_errors],
             'agents_checked': self.agents_checked,
             'commands_checked': self.commands_checked,
             'skills_checked': self.skills_checked,
@@ -93,17 +375,19 @@ class FullValidationResult:
     manifest_path: str
     plugin_results: list[ValidationResult] = field(default_factory=list)
     manifest_errors: list[str] = field(default_factory=list)
+    # Top-level keys; each entry's are in its plugin result
+    schema_errors: list[SchemaError] = field(default_factory=list)
 
     @property
     def is_valid(self) -> bool:
-        if self.manifest_errors:
+        if self.manifest_errors or self.schema_errors:
             return False
         return all(r.is_valid for r in self.plugin_results)
 
     @property
     def total_errors(self) -> int:
-        return len(self.manifest_errors) + sum(
-            len(r.errors) for r in self.plugin_results
+        return len(self.manifest_errors) + len(self.schema_errors) + sum(
+            r.error_count for r in self.plugin_results
         )
 
     @property
@@ -117,35 +401,169 @@ class FullValidationResult:
             'total_errors': self.total_errors,
             'total_checked': self.total_checked,
             'manifest_errors': self.manifest_errors,
+            'schema_errors': [e.to_dict() for e in self.schema_errors],
             'plugin_results': [r.to_dict() for r in self.plugin_results],
         }
 
 
+class _PathResolver:
+    """Path.resolve() for declared paths, without a realpath per entry.
+
+    Paths are normalised lexically against the plugin root's real path,
+    which is computed once. The only syscall per entry is an lstat() of
+    each component walked into (directories are cached), to find
+    symlinks; a path that passes through one falls back to real
+    resolution. Create one per plugin validation so that long-running
+    callers never see stale answers.
+    """
+
+    def __init__(self) -> None:
+        self._real: dict[Path, str] = {}
+        self._links: dict[str, bool] = {}
+
+    def real(self, path: Path) -> str:
+        """os.path.realpath of a root, cached."""
+        real = self._real.get(path)
+        if real is None:
+            real = self._real[path] = os.path.realpath(path)
+        return real
+
+    def _is_link(self, path: str) -> bool:
+        is_link = self._links.get(path)
+        if is_link is None:
+            is_link = self._links[path] = os.path.islink(path)
+        return is_link
+
+    def resolve(self, root: Path, relative: str) -> Path:
+        """What (root / relative).resolve() returns."""
+        current = self.real(root)
+        for part in relative.split('/'):
+            if part in ('', '.'):
+                continue
+            if part == '..':
+                current = os.path.dirname(current)
+                continue
+            current = os.path.join(current, part)
+            if self._is_link(current):
+                current = os.path.realpath(os.path.join(root, relative))
+                break
+        resolved = Path(current)
+        # Already real, so it can serve as a root without another realpath
+        self._real.setdefault(resolved, current)
+        return resolved
+
+    def is_within(self, path: Path, root: Path) -> bool:
+        """What path.relative_to(root.resolve()) succeeding means."""
+        real_root = self.real(root)
+        path_str = str(path)
+        return path_str == real_root or path_str.startswith(real_root.rstrip('/') + '/')
+
+
 def _resolve_path(
     declared_path: str,
-    plugin_dir: Path
+    plugin_dir: Path,
+    resolver: Optional[_PathResolver] = None
 ) -> tuple[Path, str | None]:
     """Resolve a declared path relative to plugin directory safely."""
     if declared_path.startswith('/'):
         return Path(), f"Absolute paths not allowed: {declared_path}"
 
+    if resolver is None:
+        resolver = _PathResolver()
     clean_path = declared_path[2:] if declared_path.startswith('./') else declared_path
-    resolved = (plugin_dir / clean_path).resolve()
+    resolved = resolver.resolve(plugin_dir, clean_path)
 
-    try:
-        resolved.relative_to(plugin_dir.resolve())
-    except ValueError:
+    if not resolver.is_within(resolved, plugin_dir):
         return Path(), f"Path traversal detected: {declared_path}"
 
     return resolved, None
 
 
-def _validate_plugin(plugin: dict[str, Any], base_dir: Path) -> ValidationResult:
-    """Validate a single plugin's declared paths."""
+def _listdir(path: Path) -> dict[str, bool] | None:
+    """{name: is_dir} for a directory, or None if it is not one (FsSnapshot.listdir without a snapshot)."""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name: entry.is_dir() for entry in it}
+    except OSError:
+        return None
+
+
+def _find_orphans(
+    plugin: dict[str, Any],
+    plugin_dir: Path,
+    listdir: Callable[[Path], dict[str, bool] | None],
+    exists: Callable[[Path], bool]
+) -> list[IntegrityError]:
+    """Components discovery finds in a plugin that its entry does not declare.
+
+    Discovery is validate-frontmatter.py's find_plugin_files(): agents/*.md,
+    commands/*.md and skills/*/SKILL.md. Only the kinds the entry lists are
+    checked; a plugin that declares no agents leaves them to the defaults.
+    Declared paths are compared lexically, so each kind costs one listing
+    and a set lookup per entry in it.
+    """
+    name = plugin.get('name', 'unknown')
+    errors = []
+    for key, file_type in (('agents', 'agent'), ('commands', 'command'), ('skills', 'skill')):
+        declared_paths = plugin.get(key)
+        if not isinstance(declared_paths, list):
+            continue
+        declared = {os.path.normpath(path) for path in declared_paths
+                    if isinstance(path, str) and not path.startswith('/')}
+        kind_dir = plugin_dir / key
+        for entry_name, entry_is_dir in (listdir(kind_dir) or {}).items():
+            rel = f'{key}/{entry_name}'
+            if rel in declared:
+                continue
+            if key != 'skills':
+                if entry_name.endswith('.md'):
+                    errors.append(IntegrityError(
+                        plugin_name=name, file_type=file_type,
+                        declared_path=f'./{rel}', expected_path=str(kind_dir / entry_name),
+                        error='orphan_file',
+                    ))
+            elif entry_is_dir and exists(kind_dir / entry_name / 'SKILL.md'):
+                errors.append(IntegrityError(
+                    plugin_name=name, file_type=file_type,
+                    declared_path=f'./{rel}', expected_path=str(kind_dir / entry_name),
+                    error='undeclared_skill_dir',
+                ))
+    return errors
+
+
+def _validate_plugin(
+    plugin: dict[str, Any],
+    base_dir: Path,
+    snapshot: Any = None,
+    manifest_path: str = '',
+    pointer: str = ''
+) -> ValidationResult:
+    """Validate a single plugin entry, its declared paths, what it leaves
+    undeclared and its plugin.json.
+
+    The entry is checked against PLUGIN_ENTRY_SCHEMA, its errors located
+    at pointer (the entry's place in manifest_path, e.g. /plugins/3). The
+    path checks need well-typed path fields, so they are skipped when one
+    is not. snapshot, if given, answers exists/is_dir/listdir from shared
+    directory listings instead of the filesystem (see validate-all.py).
+    """
+    entry_errors = schema_errors(check_plugin_entry, plugin, manifest_path, pointer)
+    if not isinstance(plugin, dict):
+        return ValidationResult(plugin_name='unknown', plugin_source='', schema_errors=entry_errors)
+
+    exists = os.path.exists if snapshot is None else snapshot.exists
+    is_dir = os.path.isdir if snapshot is None else snapshot.is_dir
+    resolver = _PathResolver()
+
     name = plugin.get('name', 'unknown')
     source = plugin.get('source', f'./plugins/{name}')
 
-    result = ValidationResult(plugin_name=name, plugin_source=source)
+    result = ValidationResult(plugin_name=name, plugin_source=source, schema_errors=entry_errors)
+    if any(e.error == 'wrong_type' and e.pointer[len(pointer):].split('/')[1] in PATH_FIELDS
+           for e in entry_errors):
+        return result
+    if not isinstance(source, str):
+        return result  # fetched from elsewhere; nothing in this tree to check
 
     if source.startswith('/'):
         result.errors.append(IntegrityError(
@@ -156,11 +574,9 @@ def _validate_plugin(plugin: dict[str, Any], base_dir: Path) -> ValidationResult
         return result
 
     clean_source = source[2:] if source.startswith('./') else source
-    plugin_dir = (base_dir / clean_source).resolve()
+    plugin_dir = resolver.resolve(base_dir, clean_source)
 
-    try:
-        plugin_dir.relative_to(base_dir.resolve())
-    except ValueError:
+    if not resolver.is_within(plugin_dir, base_dir):
         result.errors.append(IntegrityError(
             plugin_name=name, file_type='source',
             declared_path=source, expected_path='(path traversal detected)',
@@ -168,7 +584,7 @@ def _validate_plugin(plugin: dict[str, Any], base_dir: Path) -> ValidationResult
         ))
         return result
 
-    if not plugin_dir.exists():
+    if not exists(plugin_dir):
         result.errors.append(IntegrityError(
             plugin_name=name, file_type='source',
             declared_path=source, expected_path=str(plugin_dir),
@@ -176,17 +592,23 @@ def _validate_plugin(plugin: dict[str, Any], base_dir: Path) -> ValidationResult
         ))
         return result
 
+    # Most plugins have no .claude-plugin/; asking about it first is
+    # answered from plugin_dir's listing rather than by listing it
+    plugin_json = plugin_dir / '.claude-plugin' / 'plugin.json'
+    if is_dir(plugin_json.parent) and exists(plugin_json):
+        result.schema_errors.extend(_check_plugin_json(plugin_json, snapshot))
+
     # Validate agents
     for agent_path in plugin.get('agents', []):
         result.agents_checked += 1
-        full_path, path_error = _resolve_path(agent_path, plugin_dir)
+        full_path, path_error = _resolve_path(agent_path, plugin_dir, resolver)
         if path_error:
             result.errors.append(IntegrityError(
                 plugin_name=name, file_type='agent',
                 declared_path=agent_path, expected_path='(invalid path)',
                 error=path_error,
             ))
-        elif not full_path.exists():
+        elif not exists(full_path):
             result.errors.append(IntegrityError(
                 plugin_name=name, file_type='agent',
                 declared_path=agent_path, expected_path=str(full_path),
@@ -196,14 +618,14 @@ def _validate_plugin(plugin: dict[str, Any], base_dir: Path) -> ValidationResult
     # Validate commands
     for command_path in plugin.get('commands', []):
         result.commands_checked += 1
-        full_path, path_error = _resolve_path(command_path, plugin_dir)
+        full_path, path_error = _resolve_path(command_path, plugin_dir, resolver)
         if path_error:
             result.errors.append(IntegrityError(
                 plugin_name=name, file_type='command',
                 declared_path=command_path, expected_path='(invalid path)',
                 error=path_error,
             ))
-        elif not full_path.exists():
+        elif not exists(full_path):
             result.errors.append(IntegrityError(
                 plugin_name=name, file_type='command',
                 declared_path=command_path, expected_path=str(full_path),
@@ -213,7 +635,7 @@ def _validate_plugin(plugin: dict[str, Any], base_dir: Path) -> ValidationResult
     # Validate skills (directory + SKILL.md)
     for skill_path in plugin.get('skills', []):
         result.skills_checked += 1
-        skill_dir, path_error = _resolve_path(skill_path, plugin_dir)
+        skill_dir, path_error = _resolve_path(skill_path, plugin_dir, resolver)
 
         if path_error:
             result.errors.append(IntegrityError(
@@ -221,13 +643,13 @@ def _validate_plugin(plugin: dict[str, Any], base_dir: Path) -> ValidationResult
                 declared_path=skill_path, expected_path='(invalid path)',
                 error=path_error,
             ))
-        elif not skill_dir.exists():
+        elif not exists(skill_dir):
             result.errors.append(IntegrityError(
                 plugin_name=name, file_type='skill',
                 declared_path=skill_path, expected_path=str(skill_dir),
                 error='missing_skill_dir',
             ))
-        elif not skill_dir.is_dir():
+        elif not is_dir(skill_dir):
             result.errors.append(IntegrityError(
                 plugin_name=name, file_type='skill',
                 declared_path=skill_path, expected_path=str(skill_dir),
@@ -235,7 +657,7 @@ def _validate_plugin(plugin: dict[str, Any], base_dir: Path) -> ValidationResult
             ))
         else:
             skill_md = skill_dir / 'SKILL.md'
-            if not skill_md.exists():
+            if not exists(skill_md):
                 result.errors.append(IntegrityError(
                     plugin_name=name, file_type='skill',
                     declared_path=skill_path, expected_path=str(skill_md),
@@ -244,59 +666,146 @@ def _validate_plugin(plugin: dict[str, Any], base_dir: Path) -> ValidationResult
 
     # Validate hooks
     hooks_path = plugin.get('hooks')
-    if hooks_path:
+    if isinstance(hooks_path, str) and hooks_path:
         result.hooks_checked += 1
-        full_path, path_error = _resolve_path(hooks_path, plugin_dir)
+        full_path, path_error = _resolve_path(hooks_path, plugin_dir, resolver)
         if path_error:
             result.errors.append(IntegrityError(
                 plugin_name=name, file_type='hook',
                 declared_path=hooks_path, expected_path='(invalid path)',
                 error=path_error,
             ))
-        elif not full_path.exists():
+        elif not exists(full_path):
             result.errors.append(IntegrityError(
                 plugin_name=name, file_type='hook',
                 declared_path=hooks_path, expected_path=str(full_path),
                 error='missing_file',
             ))
 
+    listdir = _listdir if snapshot is None else snapshot.listdir
+    result.errors.extend(_find_orphans(plugin, plugin_dir, listdir, exists))
+
     return result
 
 
+def load_manifest(manifest_path: Path) -> tuple[Any, str | None]:
+    """Read and parse a manifest, or the manifest error explaining why not."""
+    if not manifest_path.exists():
+        return None, f"Manifest not found: {manifest_path}"
+
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            text = f.read()
+    except Exception as e:
+        return None, f"Error reading manifest: {e}"
+
+    return parse_manifest(text)
+
+
+def parse_manifest(text: str) -> tuple[Any, str | None]:
+    """load_manifest() for manifest content already in memory."""
+    import json
+
+    try:
+        return json.loads(text), None
+    except json.JSONDecodeError as e:
+        return None, f"Invalid JSON: {e}"
+
+
+def manifest_plugins(manifest: Any) -> tuple[list[dict[str, Any]], str | None]:
+    """A parsed manifest's plugin entries, or the error when it declares none.
+
+    A manifest that is not an object, or whose plugins are not a list,
+    has no entries; check_manifest() reports the wrong type.
+    """
+    if not isinstance(manifest, dict):
+        return [], None
+    plugins = manifest.get('plugins', [])
+    if not plugins:
+        return [], "No plugins found in manifest"
+    if not isinstance(plugins, list):
+        return [], None
+    return plugins, None
+
+
+def load_manifest_plugins(manifest_path: Path) -> tuple[list[dict[str, Any]], str | None]:
+    """Read a manifest's plugin entries, or the manifest error explaining why not."""
+    manifest, error = load_manifest(manifest_path)
+    if error:
+        return [], error
+    return manifest_plugins(manifest)
+
+
+def parse_manifest_plugins(text: str) -> tuple[list[dict[str, Any]], str | None]:
+    """load_manifest_plugins() for manifest content already in memory."""
+    manifest, error = parse_manifest(text)
+    if error:
+        return [], error
+    return manifest_plugins(manifest)
+
+
+def check_manifest(manifest: Any, manifest_path: Path | str) -> list[SchemaError]:
+    """Schema errors in a manifest's top-level keys (entries are checked by _validate_plugin)."""
+    return schema_errors(check_marketplace, manifest, str(manifest_path))
+
+
 def validate_manifest_paths(
     manifest_path: Path,
-    base_dir: Optional[Path] = None
+    base_dir: Optional[Path] = None,
+    snapshot: Any = None
 ) -> FullValidationResult:
-    """Validate that all paths declared in a manifest exist on the filesystem."""
+    """Validate a manifest, its plugin entries and their declared paths.
+
+    One pass over the entries checks each against the schema, checks the
+    paths it declares, and checks its plugin's plugin.json.
+    """
     result = FullValidationResult(manifest_path=str(manifest_path))
 
-    if not manifest_path.exists():
-        result.manifest_errors.append(f"Manifest not found: {manifest_path}")
+    manifest, error = load_manifest(manifest_path)
+    if error:
+        result.manifest_errors.append(error)
+        return result
+    result.schema_errors.extend(check_manifest(manifest, manifest_path))
+    plugins, error = manifest_plugins(manifest)
+    if error:
+        result.manifest_errors.append(error)
         return result
 
     if base_dir is None:
         base_dir = manifest_path.parent
 
-    try:
-        with open(manifest_path, encoding='utf-8') as f:
-            manifest = json.load(f)
-    except json.JSONDecodeError as e:
-        result.manifest_errors.append(f"Invalid JSON: {e}")
-        return result
-    except Exception as e:
-        result.manifest_errors.append(f"Error reading manifest: {e}")
-        return result
+    result.plugin_results.extend(iter_plugin_results(plugins, base_dir, snapshot, str(manifest_path)))
+    return result
 
-    plugins = manifest.get('plugins', [])
-    if not plugins:
-        result.manifest_errors.append("No plugins found in manifest")
-        return result
 
-    for plugin in plugins:
-        plugin_result = _validate_plugin(plugin, base_dir)
-        result.plugin_results.append(plugin_result)
+def iter_plugin_results(
+    plugins: list[dict[str, Any]],
+    base_dir: Path,
+    snapshot: Any = None,
+    manifest_path: str = '',
+    indices: Optional[list[int]] = None
+) -> Iterator[ValidationResult]:
+    """Validate plugin entries one at a time, in manifest order.
 
-    return result
+    indices are the entries' positions in the manifest's plugins list,
+    for locating schema errors when plugins is a subset of it.
+    """
+    if indices is None:
+        indices = range(len(plugins))
+    for i, plugin in zip(indices, plugins):
+        yield _validate_plugin(plugin, base_dir, snapshot, manifest_path, f'/plugins/{i}')
+
+
+def manifest_base_dir(manifest_path: Path) -> Path:
+    """Directory a manifest's plugin sources are relative to.
+
+    A marketplace manifest lives in the repo's .claude-plugin/ directory
+    and declares sources from the repo root; any other manifest declares
+    them from its own directory.
+    """
+    if manifest_path.parent.name == '.claude-plugin':
+        return manifest_path.parent.parent
+    return manifest_path.parent
 
 
 def validate_root_manifest() -> FullValidationResult:
@@ -316,6 +825,229 @@ def validate_root_manifest() -> FullValidationResult:
     return validate_manifest_paths(manifest_path, base_dir=repo_root)
 
 
+@dataclass
+class MultiManifestResult:
+    """Validation results for several manifests, in the order given."""
+    results: list[FullValidationResult] = field(default_factory=list)
+    # plugin name -> manifests declaring it, for names in more than one
+    collisions: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def is_valid(self) -> bool:
+        return all(r.is_valid for r in self.results)
+
+    @property
+    def total_errors(self) -> int:
+        return sum(r.total_errors for r in self.results)
+
+    @property
+    def total_checked(self) -> int:
+        return sum(r.total_checked for r in self.results)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'is_valid': self.is_valid,
+            'manifests_checked': len(self.results),
+            'total_errors': self.total_errors,
+            'total_checked': self.total_checked,
+            'collisions': self.collisions,
+            'results': [r.to_dict() for r in self.results],
+        }
+
+
+def find_plugin_collisions(results: list[FullValidationResult]) -> dict[str, list[str]]:
+    """Plugin names declared by more than one manifest, with those manifests."""
+    declared_by: dict[str, list[str]] = {}
+    for result in results:
+        for pr in result.plugin_results:
+            manifests = declared_by.setdefault(pr.plugin_name, [])
+            if result.manifest_path not in manifests:
+                manifests.append(result.manifest_path)
+    return {name: paths for name, paths in declared_by.items() if len(paths) > 1}
+
+
+def validate_manifests(
+    manifest_paths: list[Path],
+    max_workers: Optional[int] = None,
+    base_dir: Optional[Path] = None
+) -> MultiManifestResult:
+    """Validate several manifests concurrently, each against its own repo."""
+    results = list(iter_manifest_results(manifest_paths, max_workers, base_dir))
+    return MultiManifestResult(results=results, collisions=find_plugin_collisions(results))
+
+
+def iter_manifest_results(
+    manifest_paths: list[Path],
+    max_workers: Optional[int] = None,
+    base_dir: Optional[Path] = None
+) -> Iterator[FullValidationResult]:
+    """Validate manifests on a bounded pool, yielding each in input order as it finishes.
+
+    Sources resolve from base_dir if given, else from manifest_base_dir().
+    """
+    if max_workers is None:
+        max_workers = MAX_MANIFEST_WORKERS
+    max_workers = max(1, min(max_workers, len(manifest_paths)))
+
+    def validate(path: Path) -> FullValidationResult:
+        return validate_manifest_paths(path, base_dir=base_dir or manifest_base_dir(path))
+
+    if max_workers == 1:
+        for path in manifest_paths:
+            yield validate(path)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        yield from pool.map(validate, manifest_paths)
+
+
+def expand_manifest_paths(patterns: list[str]) -> tuple[list[Path], list[str]]:
+    """Resolved manifest paths for --path values, and the values matching nothing.
+
+    Values containing glob characters are expanded (``**`` included);
+    others must name an existing file. Duplicates are dropped, keeping
+    the first occurrence.
+    """
+    paths: list[Path] = []
+    seen: set[Path] = set()
+    unmatched: list[str] = []
+    for pattern in patterns:
+        if any(c in pattern for c in '*?['):
+            import glob
+            matches = [Path(m) for m in sorted(glob.glob(pattern, recursive=True))]
+            matches = [m for m in matches if m.is_file()]
+        else:
+            matches = [Path(pattern)] if Path(pattern).exists() else []
+        if not matches:
+            unmatched.append(pattern)
+        for match in matches:
+            resolved = match.resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                paths.append(resolved)
+    return paths, unmatched
+
+
+class NdjsonWriter:
+    """Writes results as JSON lines while manifests are validated.
+
+    Records carry a "type": "integrity_error" (an IntegrityError plus
+    its manifest_path), "schema_error" (a SchemaError plus its
+    manifest_path and, for an entry, plugin_name), "manifest_error",
+    "collision", and a final "summary" with the counts. Output is flushed
+    after each plugin, and only counts and the collision index are kept.
+    """
+
+    def __init__(self, out: Optional[TextIO]):
+        self.out = out
+        self.manifests_checked = 0
+        self.total_errors = 0
+        self.total_checked = 0
+        self._declared_by: dict[str, list[str]] = {}
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self.out is not None:
+            import json
+            self.out.write(json.dumps(record) + '\n')
+
+    def _flush(self) -> None:
+        if self.out is not None:
+            self.out.flush()
+
+    def manifest(self, manifest_path: Path, base_dir: Optional[Path] = None) -> None:
+        """Validate one manifest, writing each plugin's errors as it is checked."""
+        path_str = str(manifest_path)
+        self.manifests_checked += 1
+        manifest, error = load_manifest(manifest_path)
+        if not error:
+            for schema_error in check_manifest(manifest, manifest_path):
+                self.schema_error(path_str, schema_error)
+            plugins, error = manifest_plugins(manifest)
+        if error:
+            self.total_errors += 1
+            self._write({'type': 'manifest_error', 'manifest_path': path_str, 'error': error})
+            self._flush()
+            return
+        if base_dir is None:
+            base_dir = manifest_base_dir(manifest_path)
+        for pr in iter_plugin_results(plugins, base_dir, manifest_path=path_str):
+            self.plugin_result(path_str, pr)
+
+    def result(self, result: FullValidationResult) -> None:
+        """Write an already computed manifest result."""
+        self.manifests_checked += 1
+        for error in result.manifest_errors:
+            self.total_errors += 1
+            self._write({'type': 'manifest_error', 'manifest_path': result.manifest_path, 'error': error})
+        for schema_error in result.schema_errors:
+            self.schema_error(result.manifest_path, schema_error)
+        for pr in result.plugin_results:
+            self.plugin_result(result.manifest_path, pr)
+        self._flush()
+
+    def schema_error(self, manifest_path: str, error: SchemaError, plugin_name: Optional[str] = None) -> None:
+        self.total_errors += 1
+        record = {'type': 'schema_error', 'manifest_path': manifest_path}
+        if plugin_name is not None:
+            record['plugin_name'] = plugin_name
+        record.update(error.to_dict())
+        self._write(record)
+
+    def plugin_result(self, manifest_path: str, pr: ValidationResult) -> None:
+        self.total_checked += pr.total_checked
+        self.total_errors += len(pr.errors)
+        manifests = self._declared_by.setdefault(pr.plugin_name, [])
+        if manifest_path not in manifests:
+            manifests.append(manifest_path)
+        for error in pr.errors:
+            record = {'type': 'integrity_error', 'manifest_path': manifest_path}
+            record.update(error.to_dict())
+            self._write(record)
+        for schema_error in pr.schema_errors:
+            self.schema_error(manifest_path, schema_error, pr.plugin_name)
+        if pr.errors or pr.schema_errors:
+            self._flush()
+
+    def finish(self) -> bool:
+        """Write collisions (when several manifests were checked) and the summary."""
+        collisions = 0
+        if self.manifests_checked > 1:
+            for name, manifests in self._declared_by.items():
+                if len(manifests) > 1:
+                    collisions += 1
+                    self._write({'type': 'collision', 'plugin_name': name, 'manifests': manifests})
+        is_valid = self.total_errors == 0
+        self._write({
+            'type': 'summary',
+            'is_valid': is_valid,
+            'manifests_checked': self.manifests_checked,
+            'total_errors': self.total_errors,
+            'total_checked': self.total_checked,
+            'collisions': collisions,
+        })
+        self._flush()
+        return is_valid
+
+
+def _format_schema_errors(errors: list[SchemaError], indent: str = "  ") -> list[str]:
+    lines = []
+    for schema_error in errors:
+        lines.append(f"{indent}- schema: {schema_error.location}")
+        lines.append(f"{indent}  Error: {schema_error.error}: {schema_error.message}")
+    return lines
+
+
+def _format_plugin_errors(pr: ValidationResult, indent: str = "  ") -> list[str]:
+    lines = [f"{indent}x {pr.plugin_name} ({pr.error_count} errors)"]
+    for integrity_error in pr.errors:
+        lines.append(f"{indent}  - {integrity_error.file_type}: {integrity_error.declared_path}")
+        lines.append(f"{indent}    Error: {integrity_error.error}")
+        lines.append(f"{indent}    Expected: {integrity_error.expected_path}")
+    lines.extend(_format_schema_errors(pr.schema_errors, indent + "  "))
+    return lines
+
+
 def format_validation_text(result: FullValidationResult) -> str:
     """Format validation result as human-readable text."""
     lines = []
@@ -333,6 +1065,11 @@ def format_validation_text(result: FullValidationResult) -> str:
             lines.append(f"  x {error}")
         lines.append("")
 
+    if result.schema_errors:
+        lines.append("Schema Errors:")
+        lines.extend(_format_schema_errors(result.schema_errors))
+        lines.append("")
+
     valid_plugins = []
     invalid_plugins = []
 
@@ -345,11 +1082,7 @@ def format_validation_text(result: FullValidationResult) -> str:
     if invalid_plugins:
         lines.append("Plugins with Errors:")
         for pr in invalid_plugins:
-            lines.append(f"  x {pr.plugin_name} ({len(pr.errors)} errors)")
-            for integrity_error in pr.errors:
-                lines.append(f"    - {integrity_error.file_type}: {integrity_error.declared_path}")
-                lines.append(f"      Error: {integrity_error.error}")
-                lines.append(f"      Expected: {integrity_error.expected_path}")
+            lines.extend(_format_plugin_errors(pr))
         lines.append("")
 
     if valid_plugins:
@@ -368,6 +1101,50 @@ def format_validation_text(result: FullValidationResult) -> str:
     return "\n".join(lines)
 
 
+def format_multi_validation_text(multi: MultiManifestResult) -> str:
+    """Format several manifests' results as one human-readable report."""
+    lines = []
+
+    lines.append("=" * 50)
+    lines.append("MANIFEST VALIDATION")
+    lines.append("=" * 50)
+    lines.append(f"Manifests: {len(multi.results)}")
+    lines.append(f"Total items checked: {multi.total_checked}")
+    lines.append("")
+
+    for result in multi.results:
+        if result.is_valid:
+            lines.append(f"+ {result.manifest_path} "
+                         f"({len(result.plugin_results)} plugins, {result.total_checked} items)")
+            continue
+        lines.append(f"x {result.manifest_path} ({result.total_errors} errors)")
+        for error in result.manifest_errors:
+            lines.append(f"  x {error}")
+        lines.extend(_format_schema_errors(result.schema_errors))
+        for pr in result.plugin_results:
+            if not pr.is_valid:
+                lines.extend(_format_plugin_errors(pr))
+    lines.append("")
+
+    if multi.collisions:
+        lines.append("Plugin Name Collisions:")
+        for name, manifests in sorted(multi.collisions.items()):
+            lines.append(f"  ! {name} ({len(manifests)} manifests)")
+            for manifest in manifests:
+                lines.append(f"    - {manifest}")
+        lines.append("")
+
+    invalid = sum(1 for r in multi.results if not r.is_valid)
+    lines.append("-" * 50)
+    if multi.is_valid:
+        lines.append(f"+ All {len(multi.results)} manifests validated successfully")
+    else:
+        lines.append(f"x Found {multi.total_errors} errors in {invalid} of {len(multi.results)} manifests")
+    lines.append("")
+
+    return "\n".join(lines)
+
+
 def format_fix_suggestions(result: FullValidationResult) -> str:
     """Generate fix suggestions for validation errors."""
     if result.is_valid:
@@ -381,6 +1158,11 @@ def format_fix_suggestions(result: FullValidationResult) -> str:
     lines.append("These are suggestions only. Review before applying.")
     lines.append("")
 
+    for schema_error in result.schema_errors:
+        lines.append(f"Edit {schema_error.location}:")
+        lines.append(f"  {schema_error.message}")
+        lines.append("")
+
     for pr in result.plugin_results:
         if pr.is_valid:
             continue
@@ -412,6 +1194,19 @@ def format_fix_suggestions(result: FullValidationResult) -> str:
                 lines.append(f"  Plugin source directory missing:")
                 lines.append(f"    mkdir -p {error.expected_path}")
                 lines.append("")
+            elif error.error in ('orphan_file', 'undeclared_skill_dir'):
+                lines.append(f"  Option 1: Declare the {error.file_type}")
+                lines.append(f"    Add '{error.declared_path}' to {error.file_type}s array")
+                lines.append("")
+                lines.append(f"  Option 2: Remove it from the plugin")
+                lines.append(f"    rm -r {error.expected_path}" if error.error == 'undeclared_skill_dir'
+                             else f"    rm {error.expected_path}")
+                lines.append("")
+
+        for schema_error in pr.schema_errors:
+            lines.append(f"  Edit {schema_error.location}:")
+            lines.append(f"    {schema_error.message}")
+            lines.append("")
 
     return "\n".join(lines)
 
@@ -419,11 +1214,28 @@ def format_fix_suggestions(result: FullValidationResult) -> str:
 # ─── CLI entry point ───
 
 
+def _help_formatter(prog: str) -> argparse.HelpFormatter:
+    """Help formatter sized from os, sparing argparse its shutil import."""
+    import argparse
+
+    columns = os.environ.get('COLUMNS', '')
+    width = int(columns) if columns.isdigit() else 0
+    if width <= 0:
+        try:
+            width = os.get_terminal_size(sys.__stdout__.fileno()).columns
+        except (AttributeError, OSError, ValueError):
+            width = 80
+    return argparse.RawDescriptionHelpFormatter(prog, width=width - 2)
+
+
 def main() -> int:
     """Main entry point."""
+    import argparse
+    import json
+
     parser = argparse.ArgumentParser(
         description='Validate manifest-to-filesystem integrity',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
+        formatter_class=_help_formatter,
         epilog="""
 Exit codes:
   0  Valid (no errors)
@@ -433,8 +1245,15 @@ Exit codes:
 Examples:
   python3 scripts/validate-manifests.py
   python3 scripts/validate-manifests.py --json
+  python3 scripts/validate-manifests.py --ndjson
   python3 scripts/validate-manifests.py --fix
   python3 scripts/validate-manifests.py --path .claude-plugin/marketplace.json
+  python3 scripts/validate-manifests.py --path 'repos/*/.claude-plugin/marketplace.json'
+
+A manifest in a .claude-plugin/ directory is checked against the repo
+containing it. With several manifests, the report rolls them up; plugin
+names declared by more than one manifest are listed but do not fail
+validation.
         """
     )
     parser.add_argument(
@@ -442,6 +1261,11 @@ Examples:
         action='store_true',
         help='Output results as JSON'
     )
+    parser.add_argument(
+        '--ndjson',
+        action='store_true',
+        help='Stream one JSON record per error as plugins are checked, then a summary record'
+    )
     parser.add_argument(
         '--fix',
         action='store_true',
@@ -449,8 +1273,24 @@ Examples:
     )
     parser.add_argument(
         '--path',
-        type=str,
-        help='Path to manifest file (defaults to auto-detect root manifest)'
+        nargs='+',
+        action='extend',
+        metavar='PATH',
+        help='Manifest files or glob patterns (defaults to auto-detect root manifest). '
+             'Sources resolve from the repo root for a manifest under .claude-plugin/, '
+             'else from the manifest\'s own directory'
+    )
+    parser.add_argument(
+        '--base-dir',
+        metavar='DIR',
+        help='Resolve every --path manifest\'s sources from DIR instead'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=MAX_MANIFEST_WORKERS,
+        metavar='N',
+        help=f'Manifests validated concurrently (default: {MAX_MANIFEST_WORKERS})'
     )
     parser.add_argument(
         '--quiet', '-q',
@@ -459,27 +1299,65 @@ Examples:
     )
 
     args = parser.parse_args()
+    if args.json and args.ndjson:
+        parser.error('--json and --ndjson are alternatives')
 
     # Validate manifest
     if args.path:
-        manifest_path = Path(args.path).resolve()
-        if not manifest_path.exists():
+        manifest_paths, unmatched = expand_manifest_paths(args.path)
+        if unmatched:
+            missing = Path(unmatched[0]).resolve()
             if not args.quiet:
-                if args.json:
+                if args.json or args.ndjson:
                     print(json.dumps({
-                        'error': f'Manifest not found: {manifest_path}',
+                        'error': f'Manifest not found: {missing}',
                         'is_valid': False,
                     }, indent=2))
                 else:
-                    print(f"Error: Manifest not found: {manifest_path}")
+                    print(f"Error: Manifest not found: {missing}")
             return 2
 
-        result = validate_manifest_paths(manifest_path)
+        base_dir = Path(args.base_dir).resolve() if args.base_dir else None
+        if args.ndjson:
+            writer = NdjsonWriter(None if args.quiet else sys.stdout)
+            if len(manifest_paths) == 1:
+                writer.manifest(manifest_paths[0], base_dir=base_dir)
+            else:
+                # Manifests finish on the pool; each is written as soon as
+                # it and those before it are done
+                for result in iter_manifest_results(manifest_paths, max_workers=args.jobs, base_dir=base_dir):
+                    writer.result(result)
+            return 0 if writer.finish() else 1
+
+        if len(manifest_paths) > 1:
+            multi = validate_manifests(manifest_paths, max_workers=args.jobs, base_dir=base_dir)
+            if not args.quiet:
+                if args.json:
+                    print(json.dumps(multi.to_dict(), indent=2))
+                else:
+                    print(format_multi_validation_text(multi))
+                    if args.fix and not multi.is_valid:
+                        for result in multi.results:
+                            if not result.is_valid:
+                                print()
+                                print(f"Manifest: {result.manifest_path}")
+                                print(format_fix_suggestions(result))
+            return 0 if multi.is_valid else 1
+
+        result = validate_manifest_paths(manifest_paths[0], base_dir=base_dir or manifest_base_dir(manifest_paths[0]))
     else:
+        script_dir = Path(__file__).parent.resolve()
+        repo_root = script_dir.parent
+        root_manifest = repo_root / '.claude-plugin' / 'marketplace.json'
+        if args.ndjson and root_manifest.exists():
+            writer = NdjsonWriter(None if args.quiet else sys.stdout)
+            writer.manifest(root_manifest, base_dir=repo_root)
+            return 0 if writer.finish() else 1
+
         result = validate_root_manifest()
         if result.manifest_errors and 'not found' in result.manifest_path:
             if not args.quiet:
-                if args.json:
+                if args.json or args.ndjson:
                     print(json.dumps({
                         'error': 'Root manifest not found',
                         'is_valid': False,
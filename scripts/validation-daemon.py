@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Validation Daemon
+
+Keeps validate-frontmatter.py's rules, discovered files and results warm in
+a long-running process and answers a thin client over a local Unix socket.
+Answers are the JSON the validators print with --json. With no daemon
+running the client validates in-process, so hooks work either way.
+
+Usage:
+    python3 scripts/validation-daemon.py serve                  # Run the daemon
+    python3 scripts/validation-daemon.py frontmatter [FILE...]  # validate-frontmatter.py --json
+    python3 scripts/validation-daemon.py manifests [--path P]   # validate-manifests.py --json
+    python3 scripts/validation-daemon.py stop                   # Stop the daemon
+
+Protocol:
+    One request per connection: a JSON object on one line, such as
+    {"command": "frontmatter", "paths": ["/abs/agent.md"], "strict": false}
+    or {"command": "manifests", "path": "/abs/marketplace.json", "base_dir": "/abs"}.
+    The reply is one line of JSON: the validator's result dict, or
+    {"error": ..., "is_valid": false} for requests that cannot be answered.
+
+Exit codes:
+    0 - Valid (no errors)
+    1 - Validation errors found
+    2 - Bad request, manifest not found, or no daemon (with --no-fallback)
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).parent.resolve().parent
+DEFAULT_SOCKET = Path('.cache') / 'validation-daemon.sock'
+
+# Longest request a client may send; paths lists for a whole tree fit easily
+MAX_REQUEST_BYTES = 4 * 1024 * 1024
+
+
+def _load_script(filename: str):
+    """Load a validator from this directory as a module, once."""
+    name = filename[:-len('.py')].replace('-', '_')
+    module = sys.modules.get(name)
+    if module is None:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(name, Path(__file__).parent / filename)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+# ─── Answers (shared by the daemon and the in-process fallback) ───
+
+
+def answer(request: dict, repo_root: Path = REPO_ROOT, state=None) -> dict:
+    """Result dict for a request, from warm state when there is one."""
+    command = request.get('command')
+    if command == 'frontmatter':
+        return _answer_frontmatter(request, repo_root, state)
+    if command == 'manifests':
+        return _answer_manifests(request, repo_root, state)
+    return {'error': f'Unknown command: {command}', 'is_valid': False}
+
+
+def _answer_frontmatter(request: dict, repo_root: Path, state) -> dict:
+    vf = _load_script('validate-frontmatter.py')
+    paths = request.get('paths')
+
+    if paths:
+        files = [Path(p) for p in paths]
+        files = [f for f in files if vf.get_file_type(str(f)) and f.exists()]
+        if state is not None:
+            result = state.check(files)
+        else:
+            errors, warnings = vf.validate_files(files)
+            result = vf.ValidationResult(errors=errors, warnings=warnings, files_checked=len(files))
+    elif state is not None:
+        result = state.result()
+    else:
+        # A whole-tree answer carries the cross-file checks, as the CLI's does
+        files = vf.find_plugin_files(repo_root / 'plugins')
+        index = vf.SymbolIndex()
+        for roster in vf.find_team_rosters(repo_root / 'plugins'):
+            index.add_team_members(roster)
+        errors, warnings = vf.validate_files(files, index=index)
+        result = vf.ValidationResult(errors=errors, warnings=warnings, files_checked=len(files))
+
+    if not result.files_checked:
+        return {'is_valid': True, 'files_checked': 0, 'errors': [], 'warnings': []}
+    if request.get('strict'):
+        result = result._replace(errors=result.errors + result.warnings, warnings=[])
+    return result.to_dict()
+
+
+def _answer_manifests(request: dict, repo_root: Path, state) -> dict:
+    vm = _load_script('validate-manifests.py')
+
+    if request.get('path'):
+        manifest_path = Path(request['path']).resolve()
+        if not manifest_path.exists():
+            return {'error': f'Manifest not found: {manifest_path}', 'is_valid': False}
+        base_dir = Path(request['base_dir']).resolve() if request.get('base_dir') else None
+        return vm.validate_manifest_paths(manifest_path, base_dir=base_dir or vm.manifest_base_dir(manifest_path)).to_dict()
+
+    manifest_path = repo_root / '.claude-plugin' / 'marketplace.json'
+    if not manifest_path.exists():
+        return {'error': 'Root manifest not found', 'is_valid': False}
+    if state is not None:
+        return state.manifest_result().to_dict()
+    return vm.validate_manifest_paths(manifest_path, base_dir=repo_root).to_dict()
+
+
+# ─── Daemon ───
+
+
+class ValidationDaemon:
+    """Serves answers from a WatchState kept current by a file watcher.
+
+    Requests are handled one at a time. Before each answer, changes queued
+    by the watcher are applied, so results reflect every write that
+    finished before the client connected.
+    """
+
+    def __init__(self, socket_path: Path, repo_root: Path = REPO_ROOT, poll_interval: float = 0.5):
+        vf = _load_script('validate-frontmatter.py')
+        self.socket_path = socket_path
+        self.repo_root = repo_root
+        self.state = vf.WatchState(repo_root)
+        self.state.load()
+        self.watcher = vf.make_watcher(
+            [self.state.plugins_dir, self.state.manifest_path.parent], poll_interval
+        )
+        self.running = False
+
+    def handle(self, request: dict) -> dict:
+        if request.get('command') == 'stop':
+            self.running = False
+            return {'stopped': True}
+        self.state.apply(self.watcher.pending())
+        return answer(request, self.repo_root, self.state)
+
+    def _handle_connection(self, conn: socket.socket) -> None:
+        conn.settimeout(5)
+        try:
+            request = json.loads(_recv_line(conn))
+            if not isinstance(request, dict):
+                raise ValueError('request must be a JSON object')
+        except (OSError, ValueError) as e:
+            response = {'error': f'Bad request: {e}', 'is_valid': False}
+        else:
+            response = self.handle(request)
+        try:
+            conn.sendall(json.dumps(response).encode('utf-8') + b'\n')
+        except OSError:
+            pass  # client went away
+
+    def serve_forever(self, ready=None) -> None:
+        """Accept requests until a stop request arrives."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(str(self.socket_path))
+            os.chmod(self.socket_path, 0o600)
+            server.listen(16)
+            self.running = True
+            if ready is not None:
+                ready()
+            while self.running:
+                conn, _ = server.accept()
+                with conn:
+                    self._handle_connection(conn)
+        finally:
+            server.close()
+            self.watcher.close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+
+def _recv_line(conn: socket.socket) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if chunk.endswith(b'\n'):
+            break
+        if size > MAX_REQUEST_BYTES:
+            raise ValueError('request too large')
+    return b''.join(chunks)
+
+
+# ─── Client ───
+
+
+def send_request(socket_path: Path, request: dict, timeout: float = 30.0) -> dict:
+    """Send one request to a running daemon and return its reply.
+
+    Raises OSError (FileNotFoundError, ConnectionRefusedError) when no
+    daemon is listening.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(str(socket_path))
+        conn.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        return json.loads(_recv_line(conn))
+
+
+def daemon_running(socket_path: Path) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(str(socket_path))
+    except OSError:
+        return False
+    return True
+
+
+def _exit_code(response: dict) -> int:
+    if 'error' in response:
+        return 2
+    return 0 if response.get('is_valid') else 1
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Serve validation from a warm daemon, or query it',
+    )
+    parser.add_argument(
+        'command',
+        choices=['serve', 'frontmatter', 'manifests', 'stop'],
+        help='Run the daemon, query it, or stop it'
+    )
+    parser.add_argument(
+        'files',
+        nargs='*',
+        metavar='FILE',
+        help='frontmatter: only validate these files'
+    )
+    parser.add_argument(
+        '--socket',
+        default=str(DEFAULT_SOCKET),
+        metavar='PATH',
+        help=f'Unix socket path, relative to the repo root (default: {DEFAULT_SOCKET})'
+    )
+    parser.add_argument(
+        '--path',
+        help='manifests: manifest file (defaults to the root manifest)'
+    )
+    parser.add_argument(
+        '--base-dir',
+        metavar='DIR',
+        help='manifests: resolve the --path manifest\'s sources from DIR'
+    )
+    parser.add_argument(
+        '--strict',
+        action='store_true',
+        help='frontmatter: treat warnings as errors'
+    )
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help='Suppress output, only return exit code'
+    )
+    parser.add_argument(
+        '--no-fallback',
+        action='store_true',
+        help='Exit 2 instead of validating in-process when no daemon is running'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=0.5,
+        metavar='SECONDS',
+        help='serve: seconds between scans when inotify is unavailable (default: 0.5)'
+    )
+
+    args = parser.parse_intermixed_args()
+
+    socket_path = Path(args.socket)
+    if not socket_path.is_absolute():
+        socket_path = REPO_ROOT / socket_path
+
+    if args.command == 'serve':
+        if daemon_running(socket_path):
+            print(f"Error: a daemon is already listening on {socket_path}")
+            return 2
+        if socket_path.exists():
+            socket_path.unlink()  # left behind by a daemon that died
+        import signal
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        daemon = ValidationDaemon(socket_path, poll_interval=args.poll_interval)
+        if not args.quiet:
+            print(f"Serving {len(daemon.state.files)} files on {socket_path} "
+                  f"({daemon.watcher.name})", flush=True)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == 'stop':
+        try:
+            send_request(socket_path, {'command': 'stop'})
+        except OSError:
+            if not args.quiet:
+                print(f"No daemon listening on {socket_path}")
+            return 2
+        return 0
+
+    request = {'command': args.command}
+    if args.command == 'frontmatter':
+        request['paths'] = [str(Path(f).absolute()) for f in args.files]
+        request['strict'] = args.strict
+    elif args.path:
+        request['path'] = str(Path(args.path).absolute())
+        if args.base_dir:
+            request['base_dir'] = str(Path(args.base_dir).absolute())
+
+    try:
+        response = send_request(socket_path, request)
+    except OSError:
+        if args.no_fallback:
+            if not args.quiet:
+                print(f"Error: no daemon listening on {socket_path}")
+            return 2
+        response = answer(request)
+
+    if not args.quiet:
+        # validate-frontmatter.py prints its no-files answer on one line
+        indent = None if response.get('files_checked') == 0 else 2
+        print(json.dumps(response, indent=indent))
+    return _exit_code(response)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
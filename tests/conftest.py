@@ -1,6 +1,7 @@
 """Shared fixtures for marketplace validation tests."""
 
 import importlib.util
+import json
 import sys
 from pathlib import Path
 
@@ -27,6 +28,12 @@ validate_frontmatter = _load_module(
 validate_manifests = _load_module(
     "validate_manifests", SCRIPTS_DIR / "validate-manifests.py"
 )
+validate_all = _load_module(
+    "validate_all", SCRIPTS_DIR / "validate-all.py"
+)
+validation_daemon = _load_module(
+    "validation_daemon", SCRIPTS_DIR / "validation-daemon.py"
+)
 
 
 # ── Fixtures ──
@@ -115,3 +122,25 @@ def make_manifest():
         return {"plugins": plugins_list}
 
     return _make
+
+
+@pytest.fixture
+def plugin_repo(tmp_plugin_dir, make_agent_md, make_skill_md, make_manifest):
+    """A repo root with two plugins and a manifest declaring them."""
+    plugin = tmp_plugin_dir / "plugins" / "test-plugin"
+    (plugin / "agents" / "alpha.md").write_text(make_agent_md(name="alpha"))
+    (plugin / "agents" / "beta.md").write_text(make_agent_md(name="beta"))
+    (plugin / "skills" / "test-skill" / "SKILL.md").write_text(make_skill_md())
+    other = tmp_plugin_dir / "plugins" / "other-plugin" / "agents"
+    other.mkdir(parents=True)
+    (other / "gamma.md").write_text(make_agent_md(name="gamma"))
+    (tmp_plugin_dir / ".claude-plugin").mkdir()
+    manifest = make_manifest([
+        {"name": "test-plugin", "source": "./plugins/test-plugin",
+         "agents": ["./agents/alpha.md", "./agents/beta.md"], "skills": ["./skills/test-skill"]},
+        {"name": "other-plugin", "source": "./plugins/other-plugin",
+         "agents": ["./agents/gamma.md"]},
+    ])
+    manifest.update(name="test-marketplace", owner={"name": "Test"})
+    (tmp_plugin_dir / ".claude-plugin" / "marketplace.json").write_text(json.dumps(manifest))
+    return tmp_plugin_dir
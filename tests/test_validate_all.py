@@ -0,0 +1,113 @@
+"""Tests for scripts/validate-all.py"""
+
+import os
+
+import pytest
+import validate_all as va
+import validate_frontmatter as vf
+import validate_manifests as vm
+
+
+@pytest.fixture
+def counted_scandir(monkeypatch):
+    """Record every directory os.scandir is called on."""
+    calls = []
+    original = os.scandir
+
+    def counting(path="."):
+        calls.append(os.fspath(path))
+        return original(path)
+
+    monkeypatch.setattr(os, "scandir", counting)
+    return calls
+
+
+# ── FsSnapshot ──
+
+
+class TestFsSnapshot:
+
+    def test_exists_and_is_dir(self, tmp_path):
+        (tmp_path / "dir").mkdir()
+        (tmp_path / "file.md").write_text("x")
+        snap = va.FsSnapshot()
+        assert snap.is_dir(tmp_path / "dir") and snap.exists(tmp_path / "dir")
+        assert snap.exists(tmp_path / "file.md") and not snap.is_dir(tmp_path / "file.md")
+        assert not snap.exists(tmp_path / "missing")
+        assert not snap.exists(tmp_path / "missing" / "deeper")
+        assert not snap.exists(tmp_path / "file.md" / "child")
+
+    def test_symlinks_are_followed(self, tmp_path):
+        (tmp_path / "real").mkdir()
+        (tmp_path / "link").symlink_to(tmp_path / "real")
+        (tmp_path / "dangling").symlink_to(tmp_path / "nowhere")
+        snap = va.FsSnapshot()
+        assert snap.is_dir(tmp_path / "link")
+        assert not snap.exists(tmp_path / "dangling")
+
+    def test_each_directory_listed_once(self, tmp_path, counted_scandir):
+        (tmp_path / "a.md").write_text("x")
+        snap = va.FsSnapshot()
+        for _ in range(3):
+            snap.exists(tmp_path / "a.md")
+            snap.is_dir(tmp_path / "b")
+            snap.listdir(tmp_path)
+        assert counted_scandir == [str(tmp_path)]
+
+
+# ── shared snapshot ──
+
+
+class TestSharedSnapshot:
+
+    def test_discovery_matches_filesystem(self, plugin_repo):
+        plugins_dir = plugin_repo / "plugins"
+        (plugins_dir / "not-a-plugin.txt").write_text("x")
+        (plugins_dir / "test-plugin" / "skills" / "no-skill-md").mkdir()
+        snap = va.FsSnapshot()
+        assert vf.find_plugin_files(plugins_dir, snap) == vf.find_plugin_files(plugins_dir)
+
+    def test_manifest_check_matches_filesystem(self, plugin_repo):
+        manifest = plugin_repo / ".claude-plugin" / "marketplace.json"
+        (plugin_repo / "plugins/test-plugin/agents/beta.md").unlink()
+        expected = vm.validate_manifest_paths(manifest, base_dir=plugin_repo).to_dict()
+        actual = vm.validate_manifest_paths(manifest, base_dir=plugin_repo, snapshot=va.FsSnapshot())
+        assert actual.to_dict() == expected
+        assert actual.total_errors == 1
+
+    def test_orphan_check_matches_filesystem(self, plugin_repo):
+        skills = plugin_repo / "plugins" / "test-plugin" / "skills"
+        (skills / "new-skill").mkdir()
+        (skills / "new-skill" / "SKILL.md").write_text("x")
+        (plugin_repo / "plugins" / "other-plugin" / "agents" / "delta.md").write_text("x")
+        manifest = plugin_repo / ".claude-plugin" / "marketplace.json"
+        expected = vm.validate_manifest_paths(manifest, base_dir=plugin_repo).to_dict()
+        actual = vm.validate_manifest_paths(manifest, base_dir=plugin_repo, snapshot=va.FsSnapshot())
+        assert actual.to_dict() == expected
+        assert sorted(e.error for r in actual.plugin_results for e in r.errors) == ["orphan_file", "undeclared_skill_dir"]
+
+    def test_manifest_check_reuses_discovery_listings(self, plugin_repo, counted_scandir, monkeypatch):
+        snap = va.FsSnapshot()
+        vf.find_plugin_files(plugin_repo / "plugins", snap)
+        listed = list(counted_scandir)
+
+        def no_stat(path):
+            raise AssertionError(f"stat {path}")
+
+        monkeypatch.setattr(vm.os.path, "exists", no_stat)
+        monkeypatch.setattr(vm.os.path, "isdir", no_stat)
+        manifest = plugin_repo / ".claude-plugin" / "marketplace.json"
+        result = vm.validate_manifest_paths(manifest, base_dir=plugin_repo, snapshot=snap)
+        assert result.is_valid
+        assert counted_scandir == listed
+        assert len(set(listed)) == len(listed)
+
+
+class TestFormatSummary:
+
+    def test_all_passed(self):
+        assert va.format_summary(True, True).startswith("+")
+
+    def test_lists_failed_checks(self):
+        assert va.format_summary(False, False) == "x Checks failed: frontmatter, manifests"
+        assert va.format_summary(True, False) == "x Checks failed: manifests"
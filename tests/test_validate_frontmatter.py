@@ -1,6 +1,15 @@
 """Tests for scripts/validate-frontmatter.py"""
 
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+
 import pytest
+import yaml
 import validate_frontmatter as vf
 
 
@@ -252,6 +261,58 @@ class TestCheckAbsolutePaths:
         assert len(result) == 0
 
 
+# ── reference files ──
+
+
+class TestReferenceFiles:
+
+    BODY = ("# Heading\n\nRead /Users/foo/bar twice: /Users/foo/baz\n"
+            "  # /home/foo is a comment\n// /home/foo too\n\n"
+            "Install to ~/.claude/plugins/x\nthen /home/foo/y\n")
+
+    def test_matches_the_text_scan(self, tmp_path):
+        ref = tmp_path / "ref.md"
+        ref.write_text(self.BODY)
+        lines, size = vf.scan_reference(ref, limit=None)
+        assert lines == vf.check_absolute_paths(self.BODY) == [3, 7, 8]
+        assert size == len(self.BODY)
+        assert vf.scan_reference(ref)[0] == [3, 7, 8][:vf.MAX_ABSOLUTE_PATH_WARNINGS]
+
+    def test_bytes_are_never_decoded(self, tmp_path):
+        ref = tmp_path / "ref.md"
+        ref.write_bytes(b"\xff\xfe not utf-8\n/home/foo\n")
+        assert vf.scan_reference(ref) == ([2], 23)
+        empty = tmp_path / "empty.md"
+        empty.write_bytes(b"")
+        assert vf.scan_reference(empty) == ([], 0)
+
+    def test_newlines_counted_across_chunks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(vf, "_NEWLINE_CHUNK", 7)
+        ref = tmp_path / "ref.md"
+        ref.write_text("line\n" * 50 + "/Users/x\n")
+        assert vf.scan_reference(ref)[0] == [51]
+
+    def test_size_cap(self, tmp_path, monkeypatch):
+        ref = tmp_path / "ref.md"
+        ref.write_text("/Users/a\n" + "x" * 100 + "\n/Users/b\n")
+        monkeypatch.setattr(vf, "REFERENCE_MAX_BYTES", 50)
+        errors, warnings = vf.validate_reference(ref)
+        assert errors == []
+        assert [(w.code, w.line) for w in warnings] == [("FM601", 1), ("FM602", 1)]
+        assert warnings[1].message == "Only the first 50 of 119 bytes were scanned"
+
+    def test_finds_nested_reference_files(self, tmp_plugin_dir):
+        refs = tmp_plugin_dir / "plugins" / "test-plugin" / "skills" / "test-skill" / "references"
+        (refs / "deep").mkdir(parents=True)
+        (refs / "a.md").write_text("x")
+        (refs / "deep" / "b.md").write_text("x")
+        (refs / "c.txt").write_text("x")
+        found = vf.find_reference_files(tmp_plugin_dir / "plugins")
+        assert found == [refs / "a.md", refs / "deep" / "b.md"]
+        assert all(vf.is_reference_file(f) for f in found)
+        assert not vf.is_reference_file(refs.parent / "SKILL.md")
+
+
 # ── check_mcp_tools ──
 
 
@@ -283,3 +344,1311 @@ class TestGetFileType:
 
     def test_unknown_path(self):
         assert vf.get_file_type("plugins/foo/other/bar.md") is None
+
+
+# ── iter_file_results / validate_files ──
+
+
+class TestParallelValidation:
+
+    def _make_tree(self, root, make_agent_md, count):
+        agents = root / "plugins" / "p" / "agents"
+        agents.mkdir(parents=True)
+        files = []
+        for i in range(count):
+            path = agents / f"agent-{i:03d}.md"
+            # Every third agent gets an invalid color so there are errors to merge
+            color = "rainbow" if i % 3 == 0 else "blue"
+            path.write_text(make_agent_md(name=f"agent-{i:03d}", color=color))
+            files.append(path)
+        return files
+
+    def test_small_inputs_stay_serial(self):
+        assert vf.resolve_jobs(8, vf.PARALLEL_MIN_FILES - 1) == 1
+
+    def test_auto_jobs_uses_cpu_count(self, monkeypatch):
+        monkeypatch.setattr(vf.os, "cpu_count", lambda: 4)
+        assert vf.resolve_jobs(0, 1000) == 4
+
+    def test_parallel_matches_serial(self, tmp_path, make_agent_md):
+        files = self._make_tree(tmp_path, make_agent_md,
+                                vf.PARALLEL_MIN_FILES + 8)
+        serial = vf.validate_files(files, jobs=1)
+        parallel = vf.validate_files(files, jobs=2)
+        assert parallel == serial
+        assert len(serial[0]) > 0
+
+
+# ── iter_pipelined_results ──
+
+
+class TestPipeline:
+
+    @pytest.fixture
+    def tree(self, plugin_repo, make_agent_md, make_command_md):
+        agents = plugin_repo / "plugins" / "test-plugin" / "agents"
+        (agents / "bad.md").write_text(make_agent_md(name="bad", color="rainbow"))
+        (plugin_repo / "plugins" / "test-plugin" / "commands" / "go.md").write_text(make_command_md())
+        (plugin_repo / "plugins" / "other-plugin" / "agents" / "broken.md").write_text("no frontmatter")
+        return plugin_repo / "plugins"
+
+    def test_matches_serial_run(self, tree):
+        serial = list(vf.iter_file_results(vf.find_plugin_files(tree)))
+        assert list(vf.iter_pipelined_results(tree, readers=2, depth=1)) == serial
+        assert [f for batch in vf.iter_plugin_file_batches(tree) for f in batch] == vf.find_plugin_files(tree)
+
+    def test_cache_and_index_match_serial_run(self, tree, tmp_path):
+        expected_index = vf.SymbolIndex()
+        expected = vf.validate_files(vf.find_plugin_files(tree), index=expected_index)
+        for _ in range(2):  # cold, then replayed from the cache
+            cache = vf.ValidationCache.load(tmp_path / "cache.json")
+            index = vf.SymbolIndex()
+            errors, warnings = [], []
+            for _, file_errors, file_warnings in vf.with_index_issues(
+                    vf.iter_pipelined_results(tree, cache=cache, index=index), index):
+                errors.extend(file_errors)
+                warnings.extend(file_warnings)
+            assert (errors, warnings) == expected
+            assert index.files == expected_index.files
+            cache.save()
+        assert all(entry["stat"] for entry in cache.entries.values())
+
+    def test_first_results_arrive_before_discovery_finishes(self, tree, monkeypatch):
+        gate = threading.Event()
+        original = vf.iter_plugin_file_batches
+
+        def slow_discovery(plugins_dir):
+            batches = original(plugins_dir)
+            yield next(batches)
+            assert gate.wait(5)
+            yield from batches
+
+        monkeypatch.setattr(vf, "iter_plugin_file_batches", slow_discovery)
+        results = vf.iter_pipelined_results(tree)
+        first = next(results)
+        assert not gate.is_set()
+        gate.set()
+        assert [first] + list(results) == list(vf.iter_file_results(vf.find_plugin_files(tree)))
+
+    def test_stopping_early_shuts_the_stages_down(self, tree):
+        results = vf.iter_pipelined_results(tree, depth=1)
+        next(results)
+        results.close()
+        assert not any(t.name == "validate-pipeline" for t in threading.enumerate())
+
+    def test_discovery_errors_reach_the_caller(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            list(vf.iter_pipelined_results(tmp_path / "missing"))
+
+    def test_unreadable_file(self, tree, monkeypatch):
+        bad = tree / "test-plugin" / "agents" / "bad.md"
+        original = vf._read_batch
+
+        def failing(batch, cache):
+            return [(f, None, None, PermissionError("denied")) if f == bad else read
+                    for read in original(batch, cache) for f in read[:1]]
+
+        monkeypatch.setattr(vf, "_read_batch", failing)
+        results = {f: (e, w) for f, e, w in vf.iter_pipelined_results(tree)}
+        assert [e.code for e in results[bad][0]] == ["FM002"]
+
+
+# ── ValidationIssue / issue codes ──
+
+
+class TestIssueCodes:
+
+    @pytest.mark.parametrize("code", sorted(vf.ISSUE_CODES))
+    def test_every_code_renders(self, code):
+        issue = vf.ValidationIssue.new("plugins/p/agents/a.md", code, "one", "two", "three", "four")
+        assert issue.message
+        assert "{" not in issue.message.replace("${CLAUDE_PLUGIN_ROOT}", "")
+        assert issue.severity in ("error", "warning")
+
+    def test_rendered_fields(self):
+        issue = vf.ValidationIssue.new("a.md", "FM101", "description")
+        assert (issue.file, issue.line, issue.field, issue.severity) == ("a.md", 1, "description", "error")
+        assert issue.message == "Missing required field 'description'"
+        assert issue.to_dict()["code"] == "FM101"
+
+    def test_paths_and_params_are_shared(self):
+        first = vf.ValidationIssue.new("plugins/p/agents/a.md", "FM103", "memory")
+        second = vf.ValidationIssue.new("plugins/p/agents/a.md", "FM103", "memory", line=3)
+        assert first.file is second.file
+        assert first.params is second.params
+
+    def test_clearing_interned_keeps_issues(self):
+        issue = vf.ValidationIssue.new("plugins/p/agents/a.md", "FM204", "rainbow")
+        vf.clear_interned()
+        assert vf._interned == {}
+        assert issue.file == "plugins/p/agents/a.md"
+        assert issue.message == vf.ValidationIssue.new(issue.file, "FM204", "rainbow").message
+
+    def test_watch_state_does_not_accumulate_interned(self, plugin_repo):
+        state = vf.WatchState(plugin_repo)
+        state.load()
+        state.apply([])
+        assert vf._interned == {}
+
+    def test_pickle_round_trip(self):
+        import pickle
+        issue = vf.ValidationIssue.new("plugins/p/agents/a.md", "FM204", "rainbow")
+        restored = pickle.loads(pickle.dumps(issue))
+        assert restored == issue
+        assert restored.message == issue.message
+
+    def test_old_keyword_constructor(self):
+        issue = vf.ValidationIssue(file="a.md", line=2, message="Custom check failed", field="name", severity="warning")
+        assert (issue.file, issue.line, issue.message, issue.field, issue.severity) == (
+            "a.md", 2, "Custom check failed", "name", "warning")
+        assert vf.ValidationIssue("a.md", 1, message="m").severity == "error"
+        assert issue.to_dict()["code"] is None
+
+    def test_text_keeps_the_original_format(self):
+        warnings = [
+            vf.ValidationIssue.new("b.md", "FM103", "memory"),
+            vf.ValidationIssue.new("a.md", "FM103", "memory"),
+            vf.ValidationIssue.new("b.md", "FM202"),
+        ]
+        text = vf.format_issues_text(vf.ValidationResult([], warnings, 2))
+        assert text.index("  a.md:") < text.index("  b.md:")
+        assert "    Line 1 [skills]: Missing recommended field 'skills'" in text
+        assert "FM202" not in text and "By code" not in text
+
+    def test_text_grouped_by_code(self):
+        warnings = [
+            vf.ValidationIssue.new("b.md", "FM202"),
+            vf.ValidationIssue.new("b.md", "FM103", "memory"),
+            vf.ValidationIssue.new("a.md", "FM103", "memory"),
+            vf.ValidationIssue(file="c.md", line=3, message="Custom check failed", severity="warning"),
+        ]
+        text = vf.format_issues_text(vf.ValidationResult([], warnings, 3), group_by="code")
+        lines = text.splitlines()
+        fm103 = lines.index("  FM103 (2):")
+        assert lines[fm103 + 1:fm103 + 5] == [
+            "    a.md:",
+            "      Line 1 [memory]: Non-standard field 'memory' - wrap in 'metadata:' block",
+            "    b.md:",
+            "      Line 1 [memory]: Non-standard field 'memory' - wrap in 'metadata:' block",
+        ]
+        assert lines.index("  No code (1):") < fm103 < lines.index("  FM202 (1):")
+        assert "      Line 3: Custom check failed" in lines
+        assert vf.format_issues_text(vf.ValidationResult([], warnings, 3)) == \
+            vf.format_issues_text(vf.ValidationResult([], warnings, 3), group_by="file")
+
+
+# ── SymbolIndex ──
+
+
+class TestSymbolIndex:
+
+    def _check(self, plugins_dir, **kwargs):
+        index = vf.SymbolIndex()
+        for roster in vf.find_team_rosters(plugins_dir):
+            index.add_team_members(roster)
+        errors, warnings = vf.validate_files(vf.find_plugin_files(plugins_dir), index=index, **kwargs)
+        return ([e for e in errors if e.code.startswith("FM5")],
+                [w for w in warnings if w.code.startswith("FM5")])
+
+    def test_references_resolve_across_plugins(self, plugin_repo, make_agent_md):
+        agents = plugin_repo / "plugins" / "other-plugin" / "agents"
+        (agents / "delta.md").write_text(make_agent_md(name="delta", skills="test-skill, missing-skill"))
+        errors, warnings = self._check(plugin_repo / "plugins")
+        assert errors == []
+        assert [(w.code, w.message) for w in warnings] == [
+            ("FM501", "Unknown skill 'missing-skill' referenced in 'skills'")]
+        assert warnings[0].file.endswith("delta.md")
+
+    def test_external_skills_resolve(self, plugin_repo, make_agent_md, monkeypatch):
+        agents = plugin_repo / "plugins" / "other-plugin" / "agents"
+        (agents / "delta.md").write_text(make_agent_md(name="delta", skills="codex, claude-code-guide, my-tool"))
+        _, warnings = self._check(plugin_repo / "plugins")
+        assert [w.params[2] for w in warnings] == ["my-tool"]
+
+        monkeypatch.setattr(vf, "_external_skills", vf._external_skills)
+        vf.set_external_skills(vf.EXTERNAL_SKILLS | {"my-tool"})
+        assert self._check(plugin_repo / "plugins") == ([], [])
+
+    def test_qualified_external_skill_must_be_defined(self, plugin_repo, make_agent_md):
+        agents = plugin_repo / "plugins" / "other-plugin" / "agents"
+        (agents / "delta.md").write_text(make_agent_md(name="delta", skills="test-plugin:codex"))
+        _, warnings = self._check(plugin_repo / "plugins")
+        assert [w.params[2] for w in warnings] == ["test-plugin:codex"]
+
+    def test_qualified_reference_names_the_plugin(self, plugin_repo, make_agent_md):
+        agents = plugin_repo / "plugins" / "other-plugin" / "agents"
+        (agents / "delta.md").write_text(make_agent_md(
+            name="delta", skills="test-plugin:test-skill, other-plugin:test-skill"))
+        _, warnings = self._check(plugin_repo / "plugins")
+        assert [w.params[2] for w in warnings] == ["other-plugin:test-skill"]
+
+    def test_skill_agent_reference(self, plugin_repo, make_skill_md):
+        skills = plugin_repo / "plugins" / "test-plugin" / "skills"
+        for name, agent in [("forked", "alpha"), ("builtin", "Explore"), ("stray", "nobody")]:
+            (skills / name).mkdir()
+            (skills / name / "SKILL.md").write_text(make_skill_md(name=name, agent=agent))
+        _, warnings = self._check(plugin_repo / "plugins")
+        assert [w.message for w in warnings] == ["Unknown agent 'nobody' referenced in 'agent'"]
+
+    def test_duplicate_names(self, plugin_repo, make_agent_md):
+        (plugin_repo / "plugins" / "test-plugin" / "agents" / "alpha-copy.md").write_text(make_agent_md(name="alpha"))
+        (plugin_repo / "plugins" / "other-plugin" / "agents" / "beta.md").write_text(make_agent_md(name="beta"))
+        errors, warnings = self._check(plugin_repo / "plugins")
+        assert [(e.code, e.params[1]) for e in errors] == [("FM503", "alpha")]
+        assert [(w.code, w.params[1], w.params[2]) for w in warnings] == [("FM504", "beta", "test-plugin")]
+
+    def test_team_roster(self, plugin_repo):
+        roster = plugin_repo / "plugins" / "test-plugin" / "skills" / "test-skill" / "team-members.json"
+        roster.write_text(json.dumps({
+            "leads": {"a": {"agent": "alpha"}, "b": {"agent": "ghost"}},
+            "teams": {"elsewhere": {"plugin": "not-in-tree", "members": [{"agent": "remote"}]},
+                      "here": {"plugin": "other-plugin", "agents": ["gamma", "phantom"]}},
+        }))
+        _, warnings = self._check(plugin_repo / "plugins")
+        assert [w.message for w in warnings] == [
+            "Unknown agent 'ghost' at /leads/b/agent",
+            "Unknown agent 'phantom' at /teams/here/agents/1",
+        ]
+        assert all(w.file == str(roster) for w in warnings)
+
+    def test_cached_runs_index_the_same(self, plugin_repo, make_agent_md, tmp_path):
+        agents = plugin_repo / "plugins" / "other-plugin" / "agents"
+        (agents / "delta.md").write_text(make_agent_md(name="alpha", skills="missing-skill"))
+        expected = self._check(plugin_repo / "plugins")
+        cache_path = tmp_path / "cache.json"
+        for _ in range(2):  # cold, then replayed from the cache
+            cache = vf.ValidationCache.load(cache_path)
+            assert self._check(plugin_repo / "plugins", cache=cache) == expected
+            cache.save()
+
+
+# ── DependencyGraph / validate_changed ──
+
+
+class TestDependencyGraph:
+
+    def _full_run(self, repo):
+        index = vf.SymbolIndex()
+        for roster in vf.find_team_rosters(repo / "plugins"):
+            index.add_team_members(roster)
+        errors, warnings = vf.validate_files(vf.find_plugin_files(repo / "plugins"), index=index)
+        plugins = vf.read_manifest_plugins(repo / ".claude-plugin" / "marketplace.json")
+        return vf.DependencyGraph.from_index(repo, index, plugins), errors, warnings
+
+    @pytest.fixture
+    def repo(self, plugin_repo, make_agent_md):
+        agents = plugin_repo / "plugins" / "test-plugin" / "agents"
+        (agents / "alpha.md").write_text(make_agent_md(name="alpha", skills="test-skill"))
+        return plugin_repo
+
+    def test_save_and_load_round_trip(self, repo, tmp_path):
+        graph, _, _ = self._full_run(repo)
+        graph.save(tmp_path / "deps.json")
+        loaded = vf.DependencyGraph.load(tmp_path / "deps.json", repo)
+        assert (loaded.files, loaded.rosters, loaded.plugins) == (graph.files, graph.rosters, graph.plugins)
+        assert "plugins/test-plugin/agents/alpha.md" in loaded.files
+        (tmp_path / "deps.json").write_text(json.dumps({"format": 0}))
+        assert vf.DependencyGraph.load(tmp_path / "deps.json", repo) is None
+
+    def test_content_edit_revalidates_only_that_file(self, repo, make_agent_md):
+        graph, _, _ = self._full_run(repo)
+        beta = repo / "plugins" / "test-plugin" / "agents" / "beta.md"
+        beta.write_text(make_agent_md(name="beta", color="mauve"))
+        result = vf.validate_changed(graph, [beta])
+        assert result.files == [beta]
+        assert [e.file for e in result.errors] == [str(beta)]
+        assert [p["name"] for p in result.plugins] == ["test-plugin"]
+        assert not result.manifest_changed
+
+    def test_renamed_skill_revalidates_its_referrers(self, repo, make_skill_md):
+        graph, _, _ = self._full_run(repo)
+        skill = repo / "plugins" / "test-plugin" / "skills" / "test-skill" / "SKILL.md"
+        skill.write_text(make_skill_md(name="renamed-skill"))
+        result = vf.validate_changed(graph, [skill])
+        alpha = repo / "plugins" / "test-plugin" / "agents" / "alpha.md"
+        assert result.files == [skill, alpha]
+        assert [(w.file, w.code) for w in result.warnings if w.code.startswith("FM5")] == [
+            (str(alpha), "FM501")]
+
+    def test_new_duplicate_revalidates_the_other_definer(self, repo, make_agent_md):
+        graph, _, _ = self._full_run(repo)
+        copy = repo / "plugins" / "other-plugin" / "agents" / "gamma-copy.md"
+        copy.write_text(make_agent_md(name="gamma"))
+        result = vf.validate_changed(graph, [copy])
+        gamma = repo / "plugins" / "other-plugin" / "agents" / "gamma.md"
+        assert sorted(result.files) == sorted([copy, gamma])
+        assert [e.code for e in result.errors] == ["FM503"]
+        # Declared by no entry, but other-plugin's orphan check lists agents/
+        assert [p["name"] for p in result.plugins] == ["other-plugin"]
+
+    def test_deleted_file_rechecks_the_entry_declaring_it(self, repo):
+        graph, _, _ = self._full_run(repo)
+        gamma = repo / "plugins" / "other-plugin" / "agents" / "gamma.md"
+        gamma.unlink()
+        result = vf.validate_changed(graph, [gamma])
+        assert result.files == []
+        assert [p["name"] for p in result.plugins] == ["other-plugin"]
+        assert "plugins/other-plugin/agents/gamma.md" not in graph.files
+
+    def test_manifest_edit_rechecks_changed_entries(self, repo):
+        graph, _, _ = self._full_run(repo)
+        manifest = repo / ".claude-plugin" / "marketplace.json"
+        data = json.loads(manifest.read_text())
+        data["plugins"][1]["agents"].append("./agents/missing.md")
+        manifest.write_text(json.dumps(data))
+        result = vf.validate_changed(graph, [manifest])
+        assert result.manifest_changed
+        assert [p["name"] for p in result.plugins] == ["other-plugin"]
+        assert result.files == []
+
+    def test_roster_follows_agent_renames(self, repo, make_agent_md):
+        roster = repo / "plugins" / "test-plugin" / "skills" / "test-skill" / "team-members.json"
+        roster.write_text(json.dumps({"lead": {"agent": "beta"}}))
+        graph, _, _ = self._full_run(repo)
+        beta = repo / "plugins" / "test-plugin" / "agents" / "beta.md"
+        beta.write_text(make_agent_md(name="beta-renamed"))
+        result = vf.validate_changed(graph, [beta])
+        assert result.files == [beta, roster]
+        assert [(w.file, w.code) for w in result.warnings if w.code.startswith("FM5")] == [
+            (str(roster), "FM502")]
+
+    def test_matches_a_full_run_for_revalidated_files(self, repo, make_skill_md, make_agent_md):
+        graph, _, _ = self._full_run(repo)
+        skill = repo / "plugins" / "test-plugin" / "skills" / "test-skill" / "SKILL.md"
+        skill.write_text(make_skill_md(name="renamed-skill"))
+        beta = repo / "plugins" / "test-plugin" / "agents" / "beta.md"
+        beta.write_text(make_agent_md(name="gamma", skills="renamed-skill"))
+        result = vf.validate_changed(graph, [skill, beta])
+        _, errors, warnings = self._full_run(repo)
+        checked = {str(f) for f in result.files}
+        assert sorted(result.errors) == sorted(e for e in errors if e.file in checked)
+        assert sorted(result.warnings) == sorted(w for w in warnings if w.file in checked)
+
+
+# ── write_ndjson ──
+
+
+class TestNdjson:
+
+    ERROR = vf.ValidationIssue.new("a.md", "FM204", "rainbow", line=2)
+    WARNING = vf.ValidationIssue.new("a.md", "FM103", "memory")
+
+    def _records(self, out):
+        return [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_issue_then_summary_records(self, tmp_path):
+        out = io.StringIO()
+        results = [(tmp_path / "a.md", [self.ERROR], [self.WARNING]), (tmp_path / "b.md", [], [])]
+        assert vf.write_ndjson(iter(results), 2, out=out) == (1, 1)
+        records = self._records(out)
+        assert records[0] == {"type": "issue", **self.ERROR.to_dict()}
+        assert records[1]["severity"] == "warning"
+        assert records[2] == {"type": "summary", "is_valid": False, "files_checked": 2,
+                              "error_count": 1, "warning_count": 1}
+
+    def test_strict_promotes_warnings(self, tmp_path):
+        out = io.StringIO()
+        assert vf.write_ndjson(iter([(tmp_path / "a.md", [], [self.WARNING])]), 1,
+                               strict=True, out=out) == (1, 0)
+        assert [r.get("severity") for r in self._records(out)] == ["error", None]
+
+    def test_records_written_before_input_is_exhausted(self, tmp_path):
+        out = io.StringIO()
+        seen = []
+
+        def results():
+            yield tmp_path / "a.md", [self.ERROR], []
+            seen.append(out.getvalue().count("\n"))
+            yield tmp_path / "b.md", [], []
+
+        vf.write_ndjson(results(), 2, out=out)
+        assert seen == [1]
+
+    def test_matches_json_output(self, tmp_path, make_agent_md):
+        files = TestParallelValidation()._make_tree(tmp_path, make_agent_md, 6)
+        errors, warnings = vf.validate_files(files)
+        out = io.StringIO()
+        vf.write_ndjson(vf.iter_file_results(files), len(files), out=out)
+        issues = [r for r in self._records(out) if r.pop("type") == "issue"]
+        expected = vf.ValidationResult(errors, warnings, len(files)).to_dict()
+        key = lambda r: (r["file"], r["line"], r["message"])
+        assert sorted(issues, key=key) == sorted(expected["errors"] + expected["warnings"], key=key)
+
+
+# ── ValidationCache / validate_file_cached ──
+
+
+class TestValidationCache:
+
+    def _agent(self, tmp_plugin_dir, make_agent_md, **fields):
+        path = tmp_plugin_dir / "plugins" / "test-plugin" / "agents" / "a.md"
+        path.write_text(make_agent_md(**fields))
+        return path
+
+    def test_blob_id_matches_git(self):
+        # `printf 'hello\n' | git hash-object --stdin`
+        assert vf.git_blob_id(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+    def test_cached_results_match_uncached(self, tmp_plugin_dir, make_agent_md):
+        path = self._agent(tmp_plugin_dir, make_agent_md, color="rainbow")
+        errors, warnings, entry = vf.validate_file_cached(path, None)
+        assert (errors, warnings) == vf.validate_file(path)
+        assert entry["blob"] == vf.git_blob_id(path.read_bytes())
+
+    def test_hit_replays_without_running_rules(self, tmp_plugin_dir,
+                                               make_agent_md, monkeypatch):
+        path = self._agent(tmp_plugin_dir, make_agent_md, color="rainbow")
+        expected = vf.validate_file(path)
+        _, _, entry = vf.validate_file_cached(path, None)
+
+        def boom(*args):
+            raise AssertionError("rule re-ran on a cache hit")
+
+        monkeypatch.setattr(vf, "extract_frontmatter", boom)
+        errors, warnings, _ = vf.validate_file_cached(path, entry)
+        assert (errors, warnings) == expected
+
+    def test_rule_version_bump_reruns_only_that_rule(self, tmp_plugin_dir,
+                                                     make_agent_md, monkeypatch):
+        path = self._agent(tmp_plugin_dir, make_agent_md)
+        _, _, entry = vf.validate_file_cached(path, None)
+
+        calls = []
+        rules = []
+        for rule in vf.AGENT_RULES:
+            def check(fm, fp, body, _rule=rule):
+                calls.append(_rule.id)
+                return _rule.check(fm, fp, body)
+            version = rule.version + 1 if rule.id == "agent-color" else rule.version
+            rules.append(vf.Rule(rule.id, version, check))
+        monkeypatch.setitem(vf.RULES_BY_TYPE, "agent", rules)
+
+        vf.validate_file_cached(path, entry)
+        assert calls == ["agent-color"]
+
+    def test_content_change_invalidates(self, tmp_plugin_dir, make_agent_md):
+        path = self._agent(tmp_plugin_dir, make_agent_md)
+        _, _, entry = vf.validate_file_cached(path, None)
+        path.write_text(make_agent_md(color="rainbow") + "\nmore body")
+        errors, _, _ = vf.validate_file_cached(path, entry)
+        assert any(e.field == "color" for e in errors)
+
+    def test_round_trip_through_disk(self, tmp_plugin_dir, make_agent_md):
+        path = self._agent(tmp_plugin_dir, make_agent_md, color="rainbow")
+        cache_file = tmp_plugin_dir / ".cache" / "fm.json"
+        cache = vf.ValidationCache.load(cache_file)
+        first = vf.validate_files([path], cache=cache)
+        cache.save()
+
+        reloaded = vf.ValidationCache.load(cache_file)
+        assert str(path) in reloaded.entries
+        assert vf.validate_files([path], cache=reloaded) == first
+
+
+# ── read_frontmatter / LazyBody ──
+
+
+class TestReadFrontmatter:
+
+    @pytest.mark.parametrize("content", [
+        "---\nname: a\ncolor: blue\n---\n\nBody\nmore",
+        "---\r\nname: a\r\n---\r\nBody\r\n",
+        "---\nname: a\n---",
+        "---\nname: a\ndescription: x\n",
+        "No frontmatter\n---\n",
+        "---\n---\nbody",
+    ])
+    def test_matches_extract_frontmatter(self, tmp_path, content):
+        path = tmp_path / "f.md"
+        path.write_bytes(content.encode("utf-8"))
+        expected_fm, expected_end, expected_body = vf.extract_frontmatter(
+            path.read_text(encoding="utf-8"))
+        fm, end_line, body = vf.read_frontmatter(path)
+        assert (fm, end_line) == (expected_fm, expected_end)
+        if fm is not None:
+            assert str(body) == expected_body
+
+    def test_body_not_read_until_needed(self, tmp_path):
+        path = tmp_path / "f.md"
+        path.write_text("---\nname: a\n---\nUse $ARGUMENTS\n")
+        _, _, body = vf.read_frontmatter(path)
+        assert not body.loaded
+        assert "$ARGUMENTS" in body
+        assert body.loaded
+
+    def test_undecodable_body_reported_as_read_error(self, tmp_plugin_dir):
+        path = tmp_plugin_dir / "plugins" / "test-plugin" / "commands" / "c.md"
+        path.write_bytes(b"---\ndescription: Test\nallowed-tools: Read\n---\n\xff\xfe")
+        errors, warnings = vf.validate_file(path)
+        assert len(errors) == 1
+        assert "Cannot read file" in errors[0].message
+        assert warnings == []
+
+
+# ── scan_body ──
+
+
+def _legacy_table_routing(content):
+    import re
+    patterns = [
+        r'\|\s*(Keyword|Trigger|Command|Input|First Word)\s*\|\s*(Action|Agent|Route)',
+        r'\|\s*\w+\s*\|\s*(code-reviewer|engineer|architect)',
+    ]
+    return any(re.search(p, content, re.IGNORECASE) for p in patterns)
+
+
+def _legacy_absolute_paths(content):
+    import re
+    hits = []
+    for i, line in enumerate(content.split('\n'), start=1):
+        if re.search(r'(/Users/|/home/|~/.claude/plugins/)', line):
+            if not line.strip().startswith('#') and not line.strip().startswith('//'):
+                hits.append(i)
+    return hits
+
+
+SCAN_BODIES = [
+    "",
+    "plain text",
+    "Use $ARGUMENTS and /Users/me/x",
+    "# /Users/comment\n  // /home/also\n/home/real /Users/twice",
+    "| keyword | ACTION |\n| x | Engineer |",
+    "| Trigger |\n| Agent | and $arguments lowercase",
+    "~/.claude/plugins/a\n~x.claude/plugins/b\n/USERS/upper",
+    "\n\n/home/a\n\n| a | architect\n$ARGUMENTS\n/home/b",
+]
+
+
+class TestScanBody:
+
+    @pytest.mark.parametrize("body", SCAN_BODIES)
+    def test_matches_legacy_checks(self, body):
+        scan = vf.scan_body(body)
+        assert scan.has_arguments == ("$ARGUMENTS" in body)
+        assert scan.table_routing == _legacy_table_routing(body)
+        assert scan.absolute_path_lines == _legacy_absolute_paths(body)
+
+    def test_abspath_limit_stops_early(self):
+        body = "\n".join(f"/home/user{i}" for i in range(100))
+        assert vf.check_absolute_paths(body, limit=3) == [1, 2, 3]
+
+    def test_rules_share_one_scan(self, monkeypatch):
+        calls = []
+        real_scan = vf.scan_body
+
+        def counting_scan(content, tokens=frozenset(vf.BODY_TOKENS), abspath_limit=None):
+            calls.append(tokens)
+            return real_scan(content, tokens, abspath_limit)
+
+        monkeypatch.setattr(vf, "scan_body", counting_scan)
+        fm = {"description": "Test", "allowed-tools": "Read"}
+        vf.validate_command(fm, "plugins/p/commands/c.md", "| Keyword | Action |")
+        assert calls == [frozenset(["arguments", "table"])]
+
+
+# ── Profiler ──
+
+
+class TestProfiler:
+
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 21)]
+        assert vf._percentile(values, 50) == 10.0
+        assert vf._percentile(values, 95) == 19.0
+        assert vf._percentile([], 50) == 0.0
+
+    def test_records_phases_rules_and_files(self, tmp_plugin_dir, make_agent_md):
+        path = tmp_plugin_dir / "plugins" / "test-plugin" / "agents" / "a.md"
+        path.write_text(make_agent_md())
+        profiler = vf.Profiler()
+        vf.enable_profiling(profiler)
+        try:
+            vf.validate_files([path])
+        finally:
+            vf.enable_profiling(None)
+
+        assert {"read", "native"} <= set(profiler.phases)
+        assert set(profiler.rules) == {rule.id for rule in vf.AGENT_RULES}
+        assert [p for _, p in profiler.file_times] == [str(path)]
+
+        report = profiler.report()
+        assert "p50" in report and "p95" in report
+        assert "agent-color" in report
+        assert str(path) in report
+
+    def test_disabled_profiler_records_nothing(self, tmp_plugin_dir, make_agent_md):
+        path = tmp_plugin_dir / "plugins" / "test-plugin" / "agents" / "a.md"
+        path.write_text(make_agent_md())
+        assert vf._profiler is None
+        assert vf._phase("read") is vf._NULL_TIMER
+        vf.validate_files([path])
+
+
+# ── parse_simple_mapping / parser stack ──
+
+
+NATIVE_HEADERS = [
+    ["name: a", "description: A plain description, with commas"],
+    ["name: a", 'argument-hint: "<agent-name>"', "note: 'it''s quoted'"],
+    ["user-invocable: false", "enabled: Yes", "empty: ~", "other: NULL"],
+    ["name: a", "metadata:", "  capabilities: one, two", "  license: MIT"],
+    ["name: a", "hooks:", "color: blue"],
+    ["# comment", "", "name: a#b", "url: http://example.com/x"],
+]
+
+NON_NATIVE_HEADERS = [
+    ["description: >", "  folded text"],
+    ["tools: [Read, Write]"],
+    ["count: 3"],
+    ["version: 1.0"],
+    ["date: 2024-01-01"],
+    ["name: &anchor a"],
+    ["description: has: colon"],
+    ["description: trailing # comment"],
+    ["on: value"],
+    ["flag: tRUE"],
+    ["metadata:", "  nested:", "    deeper: x"],
+    ["metadata:", "  a: x", "   b: y"],
+    ['quoted: "escaped \\" quote"'],
+    ["description: first line", "  continued"],
+]
+
+
+class TestParseSimpleMapping:
+
+    @pytest.mark.parametrize("header", NATIVE_HEADERS)
+    def test_matches_yaml(self, header):
+        parsed = vf.parse_simple_mapping(header)
+        assert parsed is not None
+        assert parsed == yaml.safe_load("\n".join(header))
+
+    @pytest.mark.parametrize("header", NON_NATIVE_HEADERS)
+    def test_declines_non_flat(self, header):
+        assert vf.parse_simple_mapping(header) is None
+
+    @pytest.mark.parametrize("header", NATIVE_HEADERS + NON_NATIVE_HEADERS)
+    def test_stack_matches_previous_behaviour(self, header):
+        try:
+            expected = yaml.safe_load("\n".join(header))
+        except yaml.YAMLError:
+            expected = None
+        if not isinstance(expected, dict):
+            expected = vf.parse_fallback(header)
+        assert vf._parse_frontmatter(header) == expected
+
+
+class TestKeyLines:
+
+    @pytest.mark.parametrize("header", NATIVE_HEADERS)
+    def test_native_matches_yaml(self, header):
+        loaded, _ = vf._load_yaml_mapping(header, "\n".join(header), yaml.SafeLoader)
+        assert vf.parse_simple_mapping(header).key_lines == loaded.key_lines
+
+    def test_native_spans_metadata(self):
+        parsed = vf.parse_simple_mapping(["name: a", "metadata:", "  capabilities: x", "", "  license: MIT"])
+        assert parsed.key_lines == {
+            "name": (2, 2), "metadata": (3, 6), "metadata.capabilities": (4, 4), "metadata.license": (6, 6)}
+
+    def test_yaml_spans_block_values(self):
+        frontmatter, _, _ = vf.extract_frontmatter(
+            "---\nname: a\ntools: [Read,\n  Write]\nmetadata:\n  capabilities:\n    - one\n    - two\n"
+            "  license: MIT\ndescription: |\n  text\n\ncolor: blue\n---\nbody")
+        assert frontmatter.key_lines == {
+            "name": (2, 2), "tools": (3, 4), "metadata": (5, 9), "metadata.capabilities": (6, 8),
+            "metadata.license": (9, 9), "description": (10, 11), "color": (13, 13)}
+
+    def test_fallback_locates_keys(self):
+        frontmatter, _, _ = vf.extract_frontmatter(
+            "---\nname: a\ndescription: has: colon\n  more\nmetadata:\n  capabilities: x\n---\n")
+        assert frontmatter == {"name": "a", "description": "has: colon", "metadata": True}
+        assert frontmatter.key_lines == {
+            "name": (2, 2), "description": (3, 4), "metadata": (5, 6), "metadata.capabilities": (6, 6)}
+
+    def test_rules_report_key_lines(self, tmp_plugin_dir):
+        agent = tmp_plugin_dir / "plugins/test-plugin/agents/lines.md"
+        agent.write_text("---\nname: Lines\ndescription: d\ncolor: mauve\nskills: s\n"
+                         "metadata:\n  owner: me\nversion: 2\n---\n")
+        errors, warnings = vf.validate_file(agent)
+        lines = sorted((i.code, i.line) for i in errors + warnings)
+        assert lines == [("FM101", 1), ("FM103", 8), ("FM104", 2), ("FM203", 6), ("FM204", 4)]
+        _, _, entry = vf.validate_file_cached(agent, None)
+        cached_errors, cached_warnings, _ = vf.validate_file_cached(agent, entry)
+        assert sorted((i.code, i.line) for i in cached_errors + cached_warnings) == lines
+
+    def test_cross_file_issues_at_key_lines(self, plugin_repo):
+        agents = plugin_repo / "plugins" / "test-plugin" / "agents"
+        (agents / "zeta.md").write_text(
+            "---\ndescription: d\ncolor: blue\ntools: Read\nname: alpha\nskills: test-skill, nowhere\n---\n")
+        index = vf.SymbolIndex()
+        errors, warnings = vf.validate_files(vf.find_plugin_files(plugin_repo / "plugins"), index=index)
+        # Either file may be found second; each reports at its own 'name' line
+        assert [(e.code, os.path.basename(e.file), e.line) for e in errors] in (
+            [("FM503", "zeta.md", 5)], [("FM503", "alpha.md", 2)])
+        assert [(w.code, w.line) for w in warnings if w.code == "FM501"] == [("FM501", 6)]
+
+
+
+# ── parse limits ──
+
+
+def _billion_laughs(levels=9):
+    lines = ['name: bomb', 'description: d', 'a: &a ["lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol", "lol"]']
+    prev = "a"
+    for name in "bcdefghi"[:levels - 1]:
+        lines.append(f"{name}: &{name} [" + ", ".join([f"*{prev}"] * 9) + "]")
+        prev = name
+    return "---\n" + "\n".join(lines) + "\n---\n"
+
+
+@pytest.fixture
+def parse_limits():
+    """Set ParseLimits for one test, restoring the defaults afterwards."""
+    yield vf.set_parse_limits
+    vf.set_parse_limits(vf.ParseLimits())
+
+
+class TestParseLimits:
+
+    def _codes(self, path):
+        errors, _ = vf.validate_file(path)
+        return [e.code for e in errors]
+
+    def test_oversized_frontmatter(self, tmp_plugin_dir, parse_limits):
+        parse_limits(vf.ParseLimits(max_bytes=100))
+        agent = tmp_plugin_dir / "plugins/test-plugin/agents/big.md"
+        agent.write_text("---\nname: big\ndescription: " + "x" * 200 + "\n---\nbody\n")
+        assert self._codes(agent) == ["FM003"]
+        with pytest.raises(vf.FrontmatterLimitError):
+            vf.extract_frontmatter(agent.read_text())
+
+    def test_multibyte_frontmatter_counted_in_bytes(self, parse_limits):
+        parse_limits(vf.ParseLimits(max_bytes=100))
+        assert vf.extract_frontmatter("---\nname: a\n---\n")[0] == {"name": "a"}
+        with pytest.raises(vf.FrontmatterLimitError):
+            vf.extract_frontmatter("---\ndescription: " + "é" * 60 + "\n---\n")
+
+    def test_unclosed_frontmatter_stops_at_limit(self, tmp_plugin_dir, parse_limits):
+        parse_limits(vf.ParseLimits(max_bytes=1000))
+        agent = tmp_plugin_dir / "plugins/test-plugin/agents/unclosed.md"
+        agent.write_text("---\nname: unclosed\n" + "key: value\n" * 100000)
+        assert self._codes(agent) == ["FM003"]
+
+    def test_deep_nesting_rejected_before_parsing(self, parse_limits, monkeypatch):
+        parse_limits(vf.ParseLimits(max_bytes=0))
+        # Deep enough to crash libyaml's loader if it ever saw it
+        monkeypatch.setattr(vf, "_load_yaml_mapping", lambda *a: pytest.fail("YAML was loaded"))
+        flow = "---\nx: " + "[" * 100000 + "]" * 100000 + "\n---\n"
+        block = "---\n" + "".join(" " * i + f"k{i}:\n" for i in range(40)) + " " * 40 + "v: 1\n---\n"
+        for content in (flow, block):
+            with pytest.raises(vf.FrontmatterLimitError) as info:
+                vf.extract_frontmatter(content)
+            assert info.value.code == "FM004"
+
+    def test_block_scalar_indentation_is_not_nesting(self):
+        text = "description: |\n" + "".join("  " + " " * i + "text\n" for i in range(60)) + "color: blue"
+        lines = text.split("\n")
+        assert vf.estimate_depth(lines, text) <= 2
+        frontmatter, _, _ = vf.extract_frontmatter("---\n" + text + "\n---\n")
+        assert frontmatter["color"] == "blue"
+
+    def test_alias_expansion(self, tmp_plugin_dir):
+        agent = tmp_plugin_dir / "plugins/test-plugin/agents/bomb.md"
+        agent.write_text(_billion_laughs())
+        assert self._codes(agent) == ["FM005"]
+        shared = "---\nname: shared\nbase: &base [a, b]\none: *base\ntwo: *base\n---\n"
+        assert vf.extract_frontmatter(shared)[0]["two"] == ["a", "b"]
+
+    def test_recursive_alias(self):
+        with pytest.raises(vf.FrontmatterLimitError):
+            vf.extract_frontmatter("---\nname: loop\nx: &x [*x]\n---\n")
+
+    def test_parse_timeout_is_not_cached(self, tmp_plugin_dir, parse_limits, monkeypatch, make_agent_md):
+        parse_limits(vf.ParseLimits(seconds=0.05))
+
+        def slow(*args):
+            while True:
+                pass
+
+        monkeypatch.setattr(vf, "_load_yaml_mapping", slow)
+        agent = tmp_plugin_dir / "plugins/test-plugin/agents/slow.md"
+        agent.write_text(make_agent_md(name="slow", description=">\n  Folded"))
+        errors, _, entry = vf.validate_file_cached(agent, None)
+        assert [e.code for e in errors] == ["FM006"]
+        assert entry is None
+
+    def test_limits_are_part_of_cache_version(self, tmp_plugin_dir, parse_limits, make_agent_md):
+        agent = tmp_plugin_dir / "plugins/test-plugin/agents/a.md"
+        agent.write_text(make_agent_md(name="a", description="x" * 200))
+        _, _, entry = vf.validate_file_cached(agent, None)
+        parse_limits(vf.ParseLimits(max_bytes=100))
+        errors, _, _ = vf.validate_file_cached(agent, entry)
+        assert [e.code for e in errors] == ["FM003"]
+
+    def test_workers_use_the_same_limits(self, tmp_plugin_dir, parse_limits, make_agent_md):
+        parse_limits(vf.ParseLimits(max_bytes=50))
+        agents = tmp_plugin_dir / "plugins/test-plugin/agents"
+        files = []
+        for i in range(vf.PARALLEL_MIN_FILES):
+            files.append(agents / f"a{i}.md")
+            files[-1].write_text(make_agent_md(name=f"a{i}", description="x" * 100))
+        errors, _ = vf.validate_files(files, jobs=2)
+        assert [e.code for e in errors] == ["FM003"] * len(files)
+
+
+# ── startup imports ──
+
+
+HEAVY_MODULES = ("yaml", "json", "subprocess", "hashlib", "concurrent.futures", "shutil")
+
+IMPORT_PROBE = """
+import sys
+sys.path.insert(0, sys.argv[1])
+vf = __import__("validate-frontmatter")
+sys.argv = ["validate-frontmatter.py", "-q"] + sys.argv[2:]
+code = vf.main()
+print("probe", code, *[m for m in {heavy!r} if m in sys.modules])
+"""
+
+
+class TestStartupImports:
+
+    def _probe(self, scripts_path, *files):
+        """Exit code and heavy modules loaded by a fresh-interpreter run."""
+        proc = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE.format(heavy=HEAVY_MODULES),
+             str(scripts_path), *map(str, files)],
+            capture_output=True, text=True, check=True,
+        )
+        _, code, *loaded = proc.stdout.splitlines()[-1].split()
+        return int(code), loaded
+
+    def test_flat_file_loads_no_heavy_modules(self, scripts_path, tmp_plugin_dir, make_agent_md):
+        agent = tmp_plugin_dir / "plugins" / "test-plugin" / "agents" / "test-agent.md"
+        agent.write_text(make_agent_md())
+        assert self._probe(scripts_path, agent) == (0, [])
+
+    def test_no_validatable_files_loads_no_heavy_modules(self, scripts_path, tmp_path):
+        readme = tmp_path / "README.md"
+        readme.write_text("# Not a plugin file")
+        assert self._probe(scripts_path, readme) == (0, [])
+
+    @pytest.mark.parametrize("argv", [
+        [], ["a.md"], ["-q", "a.md", "b.md"], ["--strict", "a.md", "--no-warnings", "--quiet"],
+    ])
+    def test_hook_args_match_argparse(self, argv):
+        assert vars(vf._hook_args(argv)) == vars(vf._parse_args(argv))
+
+    @pytest.mark.parametrize("argv", [["--json", "a.md"], ["-j", "2"], ["--", "-odd.md"], ["-h"]])
+    def test_other_calls_use_argparse(self, argv):
+        assert vf._hook_args(argv) is None
+
+    def test_nested_yaml_loads_yaml_only(self, scripts_path, tmp_plugin_dir, make_agent_md):
+        agent = tmp_plugin_dir / "plugins" / "test-plugin" / "agents" / "test-agent.md"
+        agent.write_text(make_agent_md(description=">\n  Folded description"))
+        assert self._probe(scripts_path, agent) == (0, ["yaml"])
+
+
+# ── watch mode ──
+
+
+def _write_manifest(repo, plugins):
+    manifest = {"name": "test-marketplace", "owner": {"name": "Test"}, "plugins": plugins}
+    (repo / ".claude-plugin" / "marketplace.json").write_text(json.dumps(manifest))
+
+
+@pytest.fixture
+def count_plugin_checks(monkeypatch):
+    """Record the plugin names validate_manifests._validate_plugin is called for."""
+    import validate_manifests as vm
+    calls = []
+    original = vm._validate_plugin
+
+    def counting(plugin, base_dir, *args, **kwargs):
+        calls.append(plugin["name"])
+        return original(plugin, base_dir, *args, **kwargs)
+
+    monkeypatch.setattr(vm, "_validate_plugin", counting)
+    return calls
+
+
+class TestWatchState:
+
+    def test_load_matches_full_run(self, plugin_repo):
+        state = vf.WatchState(plugin_repo)
+        state.load()
+        errors, warnings = vf.validate_files(vf.find_plugin_files(plugin_repo / "plugins"))
+        assert sorted(state.result().errors) == sorted(errors)
+        assert sorted(state.result().warnings) == sorted(warnings)
+        assert state.result().files_checked == 4
+        assert state.manifest_result().is_valid
+        assert state.files[plugin_repo / "plugins/test-plugin/agents/alpha.md"].frontmatter["name"] == "alpha"
+
+    def test_index_issues_follow_moved_definitions(self, plugin_repo, make_agent_md, make_skill_md):
+        agents = plugin_repo / "plugins" / "other-plugin" / "agents"
+        delta = agents / "delta.md"
+        delta.write_text(make_agent_md(name="delta", skills="test-skill"))
+        state = vf.WatchState(plugin_repo)
+        state.load()
+        assert [w for w in state.result().warnings if w.code.startswith("FM5")] == []
+
+        skill = plugin_repo / "plugins/test-plugin/skills/test-skill/SKILL.md"
+        skill.write_text(make_skill_md(name="renamed-skill"))
+        state.apply({skill})
+        warnings = [w for w in state.result().warnings if w.code.startswith("FM5")]
+        assert [(w.file, w.code) for w in warnings] == [(str(delta), "FM501")]
+        index = vf.SymbolIndex()
+        vf.validate_files(vf.find_plugin_files(plugin_repo / "plugins"), index=index)
+        assert warnings == index.check()[1]
+
+        unindexed = vf.WatchState(plugin_repo, use_index=False)
+        unindexed.load()
+        assert not any(w.code.startswith("FM5") for w in unindexed.result().warnings)
+
+    def test_only_changed_file_is_revalidated(self, plugin_repo, make_agent_md):
+        state = vf.WatchState(plugin_repo)
+        state.load()
+        alpha = plugin_repo / "plugins/test-plugin/agents/alpha.md"
+        alpha.write_text(make_agent_md(name="alpha", color="mauve"))
+        beta = plugin_repo / "plugins/test-plugin/agents/beta.md"
+        beta_entry = state.files[beta]
+        assert state.apply({alpha, beta}) == (1, 0)
+        assert state.files[beta] is beta_entry
+        assert [e.field for e in state.result().errors] == ["color"]
+
+    def test_same_content_rewrite_is_not_reparsed(self, plugin_repo):
+        state = vf.WatchState(plugin_repo)
+        state.load()
+        alpha = plugin_repo / "plugins/test-plugin/agents/alpha.md"
+        alpha.write_bytes(alpha.read_bytes())
+        os.utime(alpha, ns=(1, 1))
+        assert state.apply({alpha}) == (0, 0)
+        assert state.files[alpha].stat[1] == 1
+
+    def test_new_and_deleted_files(self, plugin_repo, make_agent_md, count_plugin_checks):
+        state = vf.WatchState(plugin_repo)
+        state.load()
+        count_plugin_checks.clear()
+        beta = plugin_repo / "plugins/test-plugin/agents/beta.md"
+        beta.unlink()
+        delta = plugin_repo / "plugins/other-plugin/agents/delta.md"
+        delta.write_text(make_agent_md(name="delta"))
+        assert state.apply({beta, delta}) == (2, 2)
+        assert sorted(count_plugin_checks) == ["other-plugin", "test-plugin"]
+        assert delta in state.files and beta not in state.files
+        assert sorted(e.error for r in state.manifest_result().plugin_results for e in r.errors) == ["missing_file", "orphan_file"]
+
+    def test_manifest_edit_rechecks_changed_plugins_only(self, plugin_repo, count_plugin_checks):
+        state = vf.WatchState(plugin_repo)
+        state.load()
+        assert sorted(count_plugin_checks) == ["other-plugin", "test-plugin"]
+        count_plugin_checks.clear()
+        _write_manifest(plugin_repo, [
+            {"name": "test-plugin", "source": "./plugins/test-plugin",
+             "agents": ["./agents/alpha.md", "./agents/beta.md"], "skills": ["./skills/test-skill"]},
+            {"name": "other-plugin", "source": "./plugins/other-plugin",
+             "agents": ["./agents/gamma.md", "./agents/missing.md"]},
+        ])
+        assert state.apply({state.manifest_path}) == (0, 1)
+        assert count_plugin_checks == ["other-plugin"]
+        result = state.manifest_result()
+        assert [r.plugin_name for r in result.plugin_results] == ["test-plugin", "other-plugin"]
+        assert result.total_errors == 1
+
+    def test_invalid_manifest_is_reported(self, plugin_repo):
+        state = vf.WatchState(plugin_repo)
+        state.load()
+        state.manifest_path.write_text("{not json")
+        state.apply({state.manifest_path})
+        result = state.manifest_result()
+        assert not result.is_valid
+        assert result.manifest_errors[0].startswith("Invalid JSON")
+        assert "MANIFEST VALIDATION" in vf.format_watch_report(state)
+
+
+class TestWatchers:
+
+    def _watchers(self, repo):
+        roots = [repo / "plugins", repo / ".claude-plugin"]
+        watchers = [vf.PollingWatcher(roots, interval=0.01)]
+        if sys.platform.startswith("linux"):
+            watchers.append(vf.InotifyWatcher(roots))
+        return watchers
+
+    def test_idle_tree_reports_nothing(self, plugin_repo):
+        for watcher in self._watchers(plugin_repo):
+            try:
+                assert watcher.wait(timeout=0.05) == set()
+            finally:
+                watcher.close()
+
+    def test_reports_modified_created_and_deleted(self, plugin_repo, make_agent_md):
+        for watcher in self._watchers(plugin_repo):
+            try:
+                alpha = plugin_repo / "plugins/test-plugin/agents/alpha.md"
+                alpha.write_text(make_agent_md(name="alpha", description="Edited " + watcher.name))
+                new_dir = plugin_repo / "plugins" / f"new-{watcher.name}" / "agents"
+                new_dir.mkdir(parents=True)
+                changed = set()
+                for _ in range(20):
+                    changed |= watcher.wait(timeout=0.5)
+                    if alpha in changed and any(new_dir.parent == p or new_dir.parent in p.parents
+                                                for p in changed):
+                        break
+                assert alpha in changed
+                assert any(new_dir.parent == p or new_dir.parent in p.parents for p in changed)
+
+                state = vf.WatchState(plugin_repo)
+                state.load()
+                (new_dir / "zeta.md").write_text(make_agent_md(name="zeta"))
+                state.manifest_path.write_text("{}")
+                changed = set()
+                for _ in range(20):
+                    changed |= watcher.wait(timeout=0.5)
+                    if state.manifest_path in changed and new_dir / "zeta.md" in changed:
+                        break
+                state.apply(changed)
+                assert new_dir / "zeta.md" in state.files
+                assert state.manifest_result().manifest_errors == ["No plugins found in manifest"]
+            finally:
+                watcher.close()
+
+    def test_polling_listing_tracks_each_directory(self, plugin_repo, make_agent_md):
+        plugins = plugin_repo / "plugins"
+        nested = plugins / "extra" / "agents"
+        nested.mkdir(parents=True)
+        (nested / "one.md").write_text(make_agent_md(name="one"))
+        watcher = vf.PollingWatcher([plugins], interval=0.01)
+        assert watcher.children[nested] == ({nested / "one.md"}, set())
+        assert nested.parent in watcher.children[plugins][1]
+
+        (nested / "one.md").rename(nested / "two.md")
+        changed = watcher.poll()
+        assert {nested / "one.md", nested / "two.md"} <= changed
+        assert watcher.children[nested][0] == {nested / "two.md"}
+
+        shutil.rmtree(nested.parent)
+        changed = watcher.poll()
+        assert nested.parent in changed
+        assert nested not in watcher.dirs and nested not in watcher.children
+        assert nested.parent not in watcher.children[plugins][1]
+        assert not any(nested in p.parents for p in watcher.files)
+
+    def test_make_watcher_prefers_inotify_on_linux(self, plugin_repo):
+        watcher = vf.make_watcher([plugin_repo / "plugins"])
+        try:
+            expected = "inotify" if sys.platform.startswith("linux") else "polling"
+            assert watcher.name == expected
+        finally:
+            watcher.close()
+
+
+# ── staged content ──
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo, check=True, capture_output=True,
+    ).stdout
+
+
+@pytest.fixture
+def git_repo(tmp_plugin_dir, make_agent_md):
+    """A plugin layout in a git repo with one committed agent."""
+    _git(tmp_plugin_dir, "init", "-q")
+    agent = tmp_plugin_dir / "plugins/test-plugin/agents/alpha.md"
+    agent.write_text(make_agent_md(name="alpha"))
+    _git(tmp_plugin_dir, "add", "-A")
+    _git(tmp_plugin_dir, "commit", "-qm", "init")
+    return tmp_plugin_dir
+
+
+class TestStagedContent:
+
+    def test_staged_files_carry_index_blob_ids(self, git_repo, make_agent_md):
+        agents = git_repo / "plugins/test-plugin/agents"
+        (agents / "beta.md").write_text(make_agent_md(name="beta"))
+        (agents / "alpha.md").write_text(make_agent_md(name="alpha", color="red"))
+        (git_repo / "README.md").write_text("# not a plugin file")
+        _git(git_repo, "add", "-A")
+        (agents / "alpha.md").write_text("unstaged edit")
+
+        staged = dict(vf.get_staged_files(git_repo))
+        assert set(staged) == {agents / "alpha.md", agents / "beta.md"}
+        expected = vf.git_blob_id(make_agent_md(name="alpha", color="red").encode())
+        assert staged[agents / "alpha.md"] == expected
+
+    def test_renamed_file_uses_destination(self, git_repo):
+        agents = git_repo / "plugins/test-plugin/agents"
+        _git(git_repo, "mv", "plugins/test-plugin/agents/alpha.md", "plugins/test-plugin/agents/gamma.md")
+        assert [f for f, _ in vf.get_staged_files(git_repo)] == [agents / "gamma.md"]
+
+    def test_not_a_repo_has_nothing_staged(self, tmp_path):
+        assert vf.get_staged_files(tmp_path) == []
+
+    def test_cat_file_streams_content(self, git_repo):
+        blob = _git(git_repo, "rev-parse", "HEAD:plugins/test-plugin/agents/alpha.md").decode().strip()
+        missing = "0" * 40
+        results = list(vf.iter_git_blobs([blob, missing, blob], git_repo))
+        content = (git_repo / "plugins/test-plugin/agents/alpha.md").read_bytes()
+        assert results == [(blob, content), (missing, None), (blob, content)]
+
+    def test_validates_index_not_working_tree(self, git_repo, make_agent_md):
+        alpha = git_repo / "plugins/test-plugin/agents/alpha.md"
+        alpha.write_text(make_agent_md(name="alpha", color="mauve"))
+        _git(git_repo, "add", "-A")
+        alpha.write_text(make_agent_md(name="alpha"))
+
+        staged = vf.get_staged_files(git_repo)
+        [(file_path, errors, _)] = list(vf.iter_staged_results(staged, git_repo))
+        assert file_path == alpha
+        assert [e.field for e in errors] == ["color"]
+        assert vf.validate_file(alpha)[0] == []
+
+    def test_cached_blobs_are_not_fetched(self, git_repo, make_agent_md, tmp_path, monkeypatch):
+        alpha = git_repo / "plugins/test-plugin/agents/alpha.md"
+        alpha.write_text(make_agent_md(name="alpha", color="mauve"))
+        _git(git_repo, "add", "-A")
+        staged = vf.get_staged_files(git_repo)
+        cache = vf.ValidationCache(tmp_path / "cache.json")
+        first = list(vf.iter_staged_results(staged, git_repo, cache))
+
+        def no_fetch(blob_ids, cwd):
+            raise AssertionError(f"fetched {blob_ids}")
+
+        monkeypatch.setattr(vf, "iter_git_blobs", no_fetch)
+        assert list(vf.iter_staged_results(staged, git_repo, cache)) == first
+
+    def test_staged_cache_entry_is_safe_for_working_tree(self, git_repo, make_agent_md, tmp_path):
+        alpha = git_repo / "plugins/test-plugin/agents/alpha.md"
+        alpha.write_text(make_agent_md(name="alpha", color="mauve"))
+        _git(git_repo, "add", "-A")
+        cache = vf.ValidationCache(tmp_path / "cache.json")
+        list(vf.iter_staged_results(vf.get_staged_files(git_repo), git_repo, cache))
+        alpha.write_text(make_agent_md(name="alpha"))
+
+        errors, _, _ = vf.validate_file_cached(alpha, cache.get(str(alpha)))
+        assert errors == []
+
+    def test_duplicate_blobs_fetched_once(self, git_repo, make_agent_md, monkeypatch):
+        agents = git_repo / "plugins/test-plugin/agents"
+        (agents / "alpha.md").write_text(make_agent_md(name="alpha", color="red"))
+        (agents / "beta.md").write_text(make_agent_md(name="alpha", color="red"))
+        _git(git_repo, "add", "-A")
+        fetched = []
+        original = vf.iter_git_blobs
+
+        def counting(blob_ids, cwd):
+            fetched.extend(blob_ids)
+            return original(blob_ids, cwd)
+
+        monkeypatch.setattr(vf, "iter_git_blobs", counting)
+        results = list(vf.iter_staged_results(vf.get_staged_files(git_repo), git_repo))
+        assert len(results) == 2
+        assert len(fetched) == 1
+
+
+# ── commit ranges ──
+
+
+@pytest.fixture
+def range_repo(git_repo, make_agent_md):
+    """git_repo plus a manifest, then commits that break and fix alpha's color."""
+    (git_repo / ".claude-plugin").mkdir()
+    _write_manifest(git_repo, [
+        {"name": "test-plugin", "source": "./plugins/test-plugin", "agents": ["./agents/alpha.md", "./agents/beta.md"]},
+    ])
+    (git_repo / "plugins/test-plugin/agents/beta.md").write_text(make_agent_md(name="beta"))
+    _git(git_repo, "add", "-A")
+    _git(git_repo, "commit", "-qm", "manifest")
+    alpha = git_repo / "plugins/test-plugin/agents/alpha.md"
+    alpha.write_text(make_agent_md(name="alpha", color="mauve"))
+    _git(git_repo, "commit", "-qam", "break alpha")
+    alpha.write_text(make_agent_md(name="alpha"))
+    _git(git_repo, "commit", "-qam", "fix alpha")
+    return git_repo
+
+
+class TestRevRange:
+
+    def test_each_commit_validated_from_git_objects(self, range_repo):
+        (range_repo / "plugins/test-plugin/agents/alpha.md").write_text("not frontmatter")
+        results = list(vf.iter_range_results("HEAD~3..HEAD", range_repo))
+        assert [r.subject for r in results] == ["manifest", "break alpha", "fix alpha"]
+        assert [r.is_valid for r in results] == [True, False, True]
+        assert [e.code for e in results[1].frontmatter.errors] == ["FM204"]
+        assert all(r.frontmatter.files_checked == 2 for r in results)
+
+    def test_matches_working_tree_run(self, range_repo):
+        [result] = list(vf.iter_range_results("HEAD~1..HEAD", range_repo))
+        files = vf.find_plugin_files(range_repo / "plugins")
+        errors, warnings = vf.validate_files(files, index=vf.SymbolIndex())
+        assert sorted(result.frontmatter.errors) == sorted(errors)
+        assert sorted(result.frontmatter.warnings) == sorted(warnings)
+        manifest = range_repo / ".claude-plugin" / "marketplace.json"
+        expected = vf._load_sibling("validate-manifests.py").validate_manifest_paths(manifest, base_dir=range_repo)
+        assert result.manifests.to_dict() == expected.to_dict()
+
+    def test_only_changed_blobs_are_parsed(self, range_repo, monkeypatch):
+        parsed = []
+        original = vf.validate_blob
+
+        def counting(file_path, blob, data, entry):
+            parsed.append(file_path.name)
+            return original(file_path, blob, data, entry)
+
+        monkeypatch.setattr(vf, "validate_blob", counting)
+        list(vf.iter_range_results("HEAD~3..HEAD", range_repo))
+        # The fix restores alpha's first blob, so it is not parsed again
+        assert sorted(parsed) == ["alpha.md", "alpha.md", "beta.md"]
+
+    def test_manifest_checked_against_each_commit(self, range_repo):
+        _git(range_repo, "rm", "-q", "plugins/test-plugin/agents/alpha.md")
+        _git(range_repo, "commit", "-qm", "drop alpha")
+        results = list(vf.iter_range_results("HEAD~2..HEAD", range_repo))
+        assert [r.manifests.total_errors for r in results] == [0, 1]
+        [[error]] = [r.errors for r in results[1].manifests.plugin_results]
+        assert (error.declared_path, error.error) == ("./agents/alpha.md", "missing_file")
+
+    def test_schema_checked_from_git_objects(self, range_repo):
+        plugin_json = range_repo / "plugins/test-plugin/.claude-plugin/plugin.json"
+        plugin_json.parent.mkdir()
+        plugin_json.write_text(json.dumps({"name": "test-plugin", "version": "one"}))
+        _git(range_repo, "add", "-A")
+        _git(range_repo, "commit", "-qm", "add plugin.json")
+        plugin_json.write_text(json.dumps({"name": "test-plugin"}))
+        [result] = list(vf.iter_range_results("HEAD~1..HEAD", range_repo))
+        [[error]] = [r.schema_errors for r in result.manifests.plugin_results]
+        assert (error.file, error.pointer, error.error) == (str(plugin_json), "/version", "pattern_mismatch")
+        [record] = vf.introduced_issues([result])[0][2]
+        assert vf._format_manifest_issue(record).endswith("#/version (pattern_mismatch): " + error.message)
+
+    def test_orphans_found_in_commit_trees(self, range_repo, make_agent_md):
+        (range_repo / "plugins/test-plugin/agents/gamma.md").write_text(make_agent_md(name="gamma"))
+        _git(range_repo, "add", "-A")
+        _git(range_repo, "commit", "-qm", "add gamma")
+        (range_repo / "plugins/test-plugin/agents/gamma.md").unlink()
+        [result] = list(vf.iter_range_results("HEAD~1..HEAD", range_repo))
+        [[error]] = [r.errors for r in result.manifests.plugin_results]
+        assert (error.declared_path, error.error) == ("./agents/gamma.md", "orphan_file")
+
+    def test_introduced_in_first_commit_with_issue(self, range_repo):
+        _git(range_repo, "rm", "-q", "plugins/test-plugin/agents/alpha.md")
+        _git(range_repo, "commit", "-qm", "drop alpha")
+        results = list(vf.iter_range_results("HEAD~4..HEAD", range_repo))
+        introduced = vf.introduced_issues(results)
+        assert [[e.code for e in errors] for errors, _, _ in introduced] == [[], ["FM204"], [], []]
+        assert [len(manifest) for _, _, manifest in introduced] == [0, 0, 0, 1]
+
+        data = vf.range_to_dict(results)
+        assert not data["is_valid"]
+        assert [(r["code"], r["commit"]) for r in data["introduced"] if r.get("severity") == "error"] == [("FM204", results[1].commit)]
+        assert [r["error"] for r in data["introduced"] if "code" not in r] == ["missing_file"]
+
+    def test_cli_exit_codes(self, range_repo, capsys):
+        assert vf.validate_rev_range("HEAD~1..HEAD", range_repo) == 0
+        assert vf.validate_rev_range("HEAD~2..HEAD", range_repo) == 1
+        assert "+ " + str(range_repo / "plugins/test-plugin/agents/alpha.md") in capsys.readouterr().out
+        assert vf.validate_rev_range("no-such-rev..HEAD", range_repo) == 2
+        with pytest.raises(ValueError):
+            vf.get_range_commits("no-such-rev..HEAD", range_repo)
@@ -1,6 +1,8 @@
 """Tests for scripts/validate-manifests.py"""
 
+import io
 import json
+import sys
 from pathlib import Path
 
 import pytest
@@ -37,6 +39,76 @@ class TestResolvePath:
         assert "traversal" in error.lower()
 
 
+def _resolve_path_reference(declared_path, plugin_dir):
+    """The Path.resolve() implementation _resolve_path must match."""
+    if declared_path.startswith('/'):
+        return Path(), f"Absolute paths not allowed: {declared_path}"
+    clean_path = declared_path[2:] if declared_path.startswith('./') else declared_path
+    resolved = (plugin_dir / clean_path).resolve()
+    try:
+        resolved.relative_to(plugin_dir.resolve())
+    except ValueError:
+        return Path(), f"Path traversal detected: {declared_path}"
+    return resolved, None
+
+
+DECLARED_PATHS = [
+    "", ".", "./", "agents", "agents/", "./agents/foo.md", "agents//foo.md",
+    "agents/./foo.md", "agents/../agents/foo.md", "missing/../agents/foo.md",
+    "agents/foo.md/../bar.md", "missing/deeper/file.md", "..", "../plugin",
+    "../plugin/agents/foo.md", "../outside/x", "agents/../../outside",
+    "inner-link/foo.md", "inner-link/../agents/foo.md", "escape-link",
+    "escape-link/secret.md", "escape-link/../plugin/agents/foo.md",
+    "file-link", "dangling-link", "dangling-link/../agents/foo.md",
+    "/etc/passwd",
+]
+
+
+class TestLexicalResolution:
+
+    @pytest.fixture
+    def tree(self, tmp_path):
+        """plugin/ with links inside, outside and nowhere, also reachable via a linked root."""
+        plugin = tmp_path / "real" / "plugin"
+        (plugin / "agents").mkdir(parents=True)
+        (plugin / "agents" / "foo.md").write_text("x")
+        outside = tmp_path / "real" / "outside"
+        outside.mkdir()
+        (outside / "secret.md").write_text("x")
+        (plugin / "inner-link").symlink_to(plugin / "agents")
+        (plugin / "escape-link").symlink_to(outside)
+        (plugin / "file-link").symlink_to(plugin / "agents" / "foo.md")
+        (plugin / "dangling-link").symlink_to(tmp_path / "nowhere" / "deeper")
+        (tmp_path / "linked-real").symlink_to(tmp_path / "real")
+        return tmp_path
+
+    @pytest.mark.parametrize("declared", DECLARED_PATHS)
+    @pytest.mark.parametrize("root", ["real/plugin", "linked-real/plugin", "real/../real/plugin"])
+    def test_matches_path_resolve(self, tree, root, declared):
+        plugin_dir = tree / root
+        assert vm._resolve_path(declared, plugin_dir) == _resolve_path_reference(declared, plugin_dir)
+
+    def test_one_resolver_shared_across_entries(self, tree, monkeypatch):
+        resolver = vm._PathResolver()
+        plugin_dir = tree / "linked-real" / "plugin"
+        declared_paths = ["agents/foo.md", "agents/bar.md", "missing.md"]
+        expected = [_resolve_path_reference(d, plugin_dir) for d in declared_paths]
+        calls = []
+        original = vm.os.path.realpath
+        monkeypatch.setattr(vm.os.path, "realpath", lambda p, **kw: calls.append(p) or original(p, **kw))
+        assert [vm._resolve_path(d, plugin_dir, resolver) for d in declared_paths] == expected
+        assert calls == [plugin_dir]
+
+    def test_symlinks_fall_back_to_realpath(self, tree):
+        resolver = vm._PathResolver()
+        plugin_dir = tree / "real" / "plugin"
+        resolved, error = vm._resolve_path("escape-link/secret.md", plugin_dir, resolver)
+        assert "traversal" in error.lower()
+        resolved, error = vm._resolve_path("inner-link/foo.md", plugin_dir, resolver)
+        assert error is None
+        assert resolved == plugin_dir / "agents" / "foo.md"
+
+
 # ── _validate_plugin ──
 
 
@@ -129,6 +201,48 @@ class TestValidatePlugin:
         assert any("absolute" in e.error for e in result.errors)
 
 
+# ── orphans ──
+
+
+class TestOrphans:
+
+    def _errors(self, plugin, base_dir, snapshot=None):
+        result = vm._validate_plugin(plugin, base_dir, snapshot)
+        return [(e.file_type, e.declared_path, e.error) for e in result.errors]
+
+    def test_undeclared_components(self, tmp_plugin_dir):
+        plugin_dir = tmp_plugin_dir / "plugins" / "test-plugin"
+        for rel in ("agents/a.md", "agents/extra.md", "agents/notes.txt", "commands/run.md", "commands/go.md",
+                    "skills/test-skill/SKILL.md", "skills/other/SKILL.md"):
+            (plugin_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+            (plugin_dir / rel).write_text("x")
+        (plugin_dir / "skills" / "tooling").mkdir()  # no SKILL.md: not a skill
+        plugin = {
+            "name": "test-plugin",
+            "agents": ["./agents/a.md"],
+            "commands": ["commands/./run.md"],
+            "skills": ["./skills/test-skill/"],
+        }
+        assert sorted(self._errors(plugin, tmp_plugin_dir)) == [
+            ("agent", "./agents/extra.md", "orphan_file"),
+            ("command", "./commands/go.md", "orphan_file"),
+            ("skill", "./skills/other", "undeclared_skill_dir"),
+        ]
+
+    def test_only_declared_kinds_checked(self, tmp_plugin_dir):
+        (tmp_plugin_dir / "plugins" / "test-plugin" / "agents" / "a.md").write_text("x")
+        assert self._errors({"name": "test-plugin"}, tmp_plugin_dir) == []
+        assert self._errors({"name": "test-plugin", "agents": []}, tmp_plugin_dir) == [
+            ("agent", "./agents/a.md", "orphan_file"),
+        ]
+
+    def test_fix_suggestion(self, tmp_plugin_dir):
+        (tmp_plugin_dir / "plugins" / "test-plugin" / "agents" / "a.md").write_text("x")
+        result = vm.FullValidationResult(manifest_path="m.json")
+        result.plugin_results.append(vm._validate_plugin({"name": "test-plugin", "agents": []}, tmp_plugin_dir))
+        assert "Add './agents/a.md' to agents array" in vm.format_fix_suggestions(result)
+
+
 # ── validate_manifest_paths ──
 
 
@@ -138,6 +252,8 @@ class TestValidateManifestPaths:
         plugin_dir = tmp_plugin_dir / "plugins" / "test-plugin"
         (plugin_dir / "agents" / "a.md").write_text("agent")
         manifest = {
+            "name": "test-marketplace",
+            "owner": {"name": "Test"},
             "plugins": [
                 {
                     "name": "test-plugin",
@@ -172,6 +288,283 @@ class TestValidateManifestPaths:
         assert any("No plugins" in e for e in result.manifest_errors)
 
 
+# ── manifest schema ──
+
+
+class TestManifestSchema:
+
+    def _errors(self, checker, value):
+        return [(e.pointer, e.error) for e in vm.schema_errors(checker, value, "m.json")]
+
+    def test_valid_marketplace(self):
+        manifest = {"name": "market", "owner": {"name": "Team", "email": "t@example.com"},
+                    "metadata": {"version": "1.2.0"}, "plugins": []}
+        assert self._errors(vm.check_marketplace, manifest) == []
+
+    def test_missing_required_located_at_key(self):
+        assert self._errors(vm.check_marketplace, {"owner": {}}) == [
+            ("/name", "missing_required"), ("/owner/name", "missing_required"),
+        ]
+
+    def test_wrong_type_not_checked_further(self):
+        entry = {"name": "p", "author": {"name": 3}, "keywords": "one"}
+        assert self._errors(vm.check_plugin_entry, entry) == [
+            ("/author/name", "wrong_type"), ("/keywords", "wrong_type"),
+        ]
+
+    def test_pointer_escapes_key(self):
+        errors = []
+        vm.compile_schema({"type": "object", "properties": {"a/b~c": {"type": "string"}}})({"a/b~c": 1}, "", errors)
+        assert [pointer for pointer, _, _ in errors] == ["/a~1b~0c"]
+
+    def test_bool_is_not_a_number(self):
+        checker = vm.compile_schema({"type": "integer"})
+        errors = []
+        checker(True, "", errors)
+        assert [error for _, error, _ in errors] == ["wrong_type"]
+
+    @pytest.mark.parametrize("version,ok", [
+        ("1.0.0", True), ("2.10.3-beta.1+build.5", True), ("1.0", False), ("01.0.0", False), ("v1.0.0", False),
+    ])
+    def test_semver(self, version, ok):
+        errors = self._errors(vm.check_plugin_entry, {"name": "p", "version": version})
+        assert errors == ([] if ok else [("/version", "pattern_mismatch")])
+
+    def test_entry_errors_located_in_manifest(self, tmp_plugin_dir):
+        result = vm._validate_plugin({"name": "Test Plugin", "source": "./plugins/test-plugin"},
+                                     tmp_plugin_dir, manifest_path="m.json", pointer="/plugins/4")
+        assert [e.location for e in result.schema_errors] == ["m.json#/plugins/4/name"]
+        assert not result.is_valid
+        assert result.error_count == 1
+
+    def test_wrong_type_path_field_skips_path_checks(self, tmp_plugin_dir):
+        result = vm._validate_plugin({"name": "test-plugin", "agents": "agents/a.md"}, tmp_plugin_dir)
+        assert [e.error for e in result.schema_errors] == ["wrong_type"]
+        assert result.errors == [] and result.agents_checked == 0
+
+    @pytest.mark.parametrize("source,errors", [
+        ("./plugins/p", []),
+        ({"source": "github", "repo": "owner/p"}, []),
+        ({"source": "url", "url": "https://example.com/p.git", "ref": "v1"}, []),
+        ("", [("/source", "too_short")]),
+        ({"repo": "owner/p"}, [("/source/source", "missing_required")]),
+        ({"source": "github", "repo": 7}, [("/source/repo", "wrong_type")]),
+        (["./plugins/p"], [("/source", "wrong_type")]),
+    ])
+    def test_source_is_path_or_object(self, source, errors):
+        assert self._errors(vm.check_plugin_entry, {"name": "p", "source": source}) == errors
+
+    @pytest.mark.parametrize("hooks,errors", [
+        ("./hooks/hooks.json", []),
+        ({"PreToolUse": [{"matcher": "Bash", "hooks": [{"type": "command", "command": "true"}]}]}, []),
+        ("", [("/hooks", "too_short")]),
+        (["./hooks/hooks.json"], [("/hooks", "wrong_type")]),
+    ])
+    def test_hooks_is_path_or_object(self, hooks, errors):
+        assert self._errors(vm.check_plugin_entry, {"name": "p", "hooks": hooks}) == errors
+        assert self._errors(vm.check_plugin_json, {"name": "p", "hooks": hooks}) == errors
+
+    def test_object_source_skips_path_checks(self, tmp_path):
+        result = vm._validate_plugin({"name": "remote", "source": {"source": "github", "repo": "owner/remote"},
+                                      "agents": ["./agents/a.md"]}, tmp_path)
+        assert result.is_valid
+        assert result.agents_checked == 0
+        assert result.to_dict()["plugin_source"] == {"source": "github", "repo": "owner/remote"}
+
+    def test_inline_hooks_skip_hooks_path_check(self, tmp_plugin_dir):
+        hooks = {"Stop": [{"hooks": [{"type": "command", "command": "true"}]}]}
+        result = vm._validate_plugin({"name": "test-plugin", "hooks": hooks}, tmp_plugin_dir)
+        assert result.is_valid
+        assert result.hooks_checked == 0
+        result = vm._validate_plugin({"name": "test-plugin", "hooks": "./hooks/hooks.json"}, tmp_plugin_dir)
+        assert [(e.file_type, e.error) for e in result.errors] == [("hook", "missing_file")]
+
+    def test_non_object_entry(self, tmp_path):
+        result = vm._validate_plugin("p", tmp_path, pointer="/plugins/0")
+        assert result.plugin_name == "unknown"
+        assert [(e.pointer, e.error) for e in result.schema_errors] == [("/plugins/0", "wrong_type")]
+
+    def test_plugin_json_checked(self, tmp_plugin_dir):
+        plugin_json = tmp_plugin_dir / "plugins" / "test-plugin" / ".claude-plugin" / "plugin.json"
+        plugin_json.parent.mkdir()
+        plugin_json.write_text(json.dumps({"name": "test-plugin", "version": "one"}))
+        result = vm._validate_plugin({"name": "test-plugin"}, tmp_plugin_dir)
+        assert [(e.file, e.pointer, e.error) for e in result.schema_errors] == [
+            (str(plugin_json), "/version", "pattern_mismatch"),
+        ]
+        plugin_json.write_text("{")
+        result = vm._validate_plugin({"name": "test-plugin"}, tmp_plugin_dir)
+        assert [e.error for e in result.schema_errors] == ["invalid_json"]
+
+    def test_manifest_result_and_report(self, tmp_path):
+        manifest = _marketplace(tmp_path, [{"name": "p", "version": "1"}])
+        data = json.loads(manifest.read_text())
+        data["owner"] = "Team"
+        manifest.write_text(json.dumps(data))
+        result = vm.validate_manifest_paths(manifest, tmp_path)
+        assert not result.is_valid
+        assert result.total_errors == 2
+        assert [e.pointer for e in result.schema_errors] == ["/owner"]
+        assert [e.pointer for e in result.plugin_results[0].schema_errors] == ["/plugins/0/version"]
+        assert f"{manifest}#/plugins/0/version" in vm.format_validation_text(result)
+        assert result.to_dict()["schema_errors"][0]["error"] == "wrong_type"
+
+
+# ── validate_manifests (several manifests) ──
+
+
+def _marketplace(root, plugins):
+    """A repo at root whose .claude-plugin/marketplace.json declares plugins."""
+    for plugin in plugins:
+        plugin_dir = root / "plugins" / plugin["name"]
+        (plugin_dir / "agents").mkdir(parents=True, exist_ok=True)
+        for agent in plugin.get("agents", []):
+            (plugin_dir / agent).write_text("agent")
+    manifest_path = root / ".claude-plugin" / "marketplace.json"
+    manifest_path.parent.mkdir(parents=True)
+    manifest_path.write_text(json.dumps({"name": "test-marketplace", "owner": {"name": "Test"}, "plugins": [
+        {"source": f"./plugins/{p['name']}", **p} for p in plugins
+    ]}))
+    return manifest_path
+
+
+class TestValidateManifests:
+
+    @pytest.fixture
+    def marketplaces(self, tmp_path):
+        first = _marketplace(tmp_path / "first", [
+            {"name": "shared", "agents": ["agents/a.md"]},
+            {"name": "only-first", "agents": ["agents/b.md"]},
+        ])
+        second = _marketplace(tmp_path / "second", [
+            {"name": "shared", "agents": ["agents/a.md"]},
+        ])
+        return first, second
+
+    def test_sources_resolve_from_repo_root(self, marketplaces):
+        multi = vm.validate_manifests(list(marketplaces))
+        assert multi.is_valid
+        assert [r.manifest_path for r in multi.results] == [str(m) for m in marketplaces]
+        assert multi.total_checked == 3
+
+    def test_collisions_across_manifests(self, marketplaces):
+        multi = vm.validate_manifests(list(marketplaces))
+        assert multi.collisions == {"shared": [str(m) for m in marketplaces]}
+        assert multi.to_dict()["collisions"] == multi.collisions
+
+    def test_duplicate_within_one_manifest_is_not_a_collision(self, tmp_path):
+        manifest = _marketplace(tmp_path / "repo", [
+            {"name": "twice", "agents": ["agents/a.md"]},
+            {"name": "twice", "agents": ["agents/a.md"]},
+        ])
+        assert vm.validate_manifests([manifest]).collisions == {}
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_errors_roll_up(self, marketplaces, tmp_path, max_workers):
+        broken = tmp_path / "broken.json"
+        broken.write_text("{not json")
+        multi = vm.validate_manifests([*marketplaces, broken], max_workers=max_workers)
+        assert not multi.is_valid
+        assert multi.total_errors == 1
+        assert [r.is_valid for r in multi.results] == [True, True, False]
+
+    def test_expand_globs_and_dedupe(self, marketplaces, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        paths, unmatched = vm.expand_manifest_paths([
+            "*/.claude-plugin/marketplace.json",
+            "first/.claude-plugin/marketplace.json",
+            "missing/*.json",
+            "missing.json",
+        ])
+        assert paths == [m.resolve() for m in marketplaces]
+        assert unmatched == ["missing/*.json", "missing.json"]
+
+    def _cli(self, monkeypatch, capsys, *argv):
+        monkeypatch.setattr(sys, "argv", ["validate-manifests.py", *argv])
+        code = vm.main()
+        return code, capsys.readouterr().out
+
+    def test_manifest_verdict_does_not_depend_on_other_paths(self, marketplaces, monkeypatch, capsys):
+        first, second = marketplaces
+        code, out = self._cli(monkeypatch, capsys, "--json", "--path", str(first))
+        alone = json.loads(out)
+        _, out = self._cli(monkeypatch, capsys, "--json", "--path", str(first), str(second))
+        paired = json.loads(out)["results"][0]
+        assert code == 0
+        assert alone == paired
+
+        code, out = self._cli(monkeypatch, capsys, "--ndjson", "--path", str(first))
+        records = [json.loads(line) for line in out.splitlines()]
+        assert code == 0
+        assert records[-1]["total_errors"] == alone["total_errors"] == 0
+
+    def test_base_dir_applies_to_every_path(self, marketplaces, monkeypatch, capsys):
+        first, second = marketplaces
+        for paths in ([first], [first, second]):
+            code, out = self._cli(monkeypatch, capsys, "--ndjson", "--base-dir", str(first.parent),
+                                  "--path", *map(str, paths))
+            assert code == 1
+            assert '"missing_directory"' in out
+
+    def test_format_text(self, marketplaces):
+        text = vm.format_multi_validation_text(vm.validate_manifests(list(marketplaces)))
+        assert "Manifests: 2" in text
+        assert "Plugin Name Collisions:" in text
+        assert "All 2 manifests validated successfully" in text
+
+
+# ── NdjsonWriter ──
+
+
+class TestNdjsonWriter:
+
+    def _records(self, out):
+        return [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_errors_then_summary(self, tmp_path):
+        manifest = _marketplace(tmp_path / "repo", [{"name": "p", "agents": ["agents/a.md"]}])
+        (tmp_path / "repo" / "plugins" / "p" / "agents" / "a.md").unlink()
+        out = io.StringIO()
+        writer = vm.NdjsonWriter(out)
+        writer.manifest(manifest)
+        assert not writer.finish()
+        error, summary = self._records(out)
+        assert error["type"] == "integrity_error"
+        assert error["manifest_path"] == str(manifest)
+        assert error["error"] == "missing_file"
+        assert summary == {"type": "summary", "is_valid": False, "manifests_checked": 1,
+                           "total_errors": 1, "total_checked": 1, "collisions": 0}
+
+    def test_schema_errors(self, tmp_path):
+        manifest = _marketplace(tmp_path, [{"name": "p", "version": "1"}])
+        out = io.StringIO()
+        writer = vm.NdjsonWriter(out)
+        writer.manifest(manifest)
+        assert not writer.finish()
+        error, summary = self._records(out)
+        assert error["type"] == "schema_error"
+        assert (error["plugin_name"], error["pointer"], error["error"]) == ("p", "/plugins/0/version", "pattern_mismatch")
+        assert summary["total_errors"] == 1
+
+    def test_matches_multi_manifest_result(self, tmp_path):
+        first = _marketplace(tmp_path / "first", [{"name": "shared", "agents": ["agents/a.md"]}])
+        second = _marketplace(tmp_path / "second", [{"name": "shared", "agents": ["agents/a.md"]}])
+        broken = tmp_path / "broken.json"
+        broken.write_text("{not json")
+        paths = [first, second, broken]
+        out = io.StringIO()
+        writer = vm.NdjsonWriter(out)
+        for result in vm.iter_manifest_results(paths, max_workers=2):
+            writer.result(result)
+        writer.finish()
+        records = self._records(out)
+        multi = vm.validate_manifests(paths).to_dict()
+        assert [r["type"] for r in records] == ["manifest_error", "collision", "summary"]
+        assert records[1]["manifests"] == multi["collisions"]["shared"]
+        assert records[2]["total_errors"] == multi["total_errors"]
+        assert records[2]["total_checked"] == multi["total_checked"]
+
+
 # ── FullValidationResult ──
 
 
@@ -0,0 +1,154 @@
+"""Tests for scripts/validation-daemon.py"""
+
+import json
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+import validate_frontmatter as vf
+import validate_manifests as vm
+import validation_daemon as vd
+
+
+@pytest.fixture
+def daemon(plugin_repo, tmp_path):
+    """A daemon serving plugin_repo from a background thread."""
+    socket_path = tmp_path / "d.sock"
+    server = vd.ValidationDaemon(socket_path, repo_root=plugin_repo, poll_interval=0.01)
+    ready = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"ready": ready.set}, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield server
+    if thread.is_alive():
+        vd.send_request(socket_path, {"command": "stop"})
+        thread.join(5)
+
+
+def _full_run(repo):
+    files = vf.find_plugin_files(repo / "plugins")
+    index = vf.SymbolIndex()
+    for roster in vf.find_team_rosters(repo / "plugins"):
+        index.add_team_members(roster)
+    errors, warnings = vf.validate_files(files, index=index)
+    return vf.ValidationResult(errors=errors, warnings=warnings, files_checked=len(files)).to_dict()
+
+
+# ── answers ──
+
+
+class TestDaemonAnswers:
+
+    def test_frontmatter_matches_cli_result(self, daemon, plugin_repo):
+        response = vd.send_request(daemon.socket_path, {"command": "frontmatter"})
+        assert response == _full_run(plugin_repo)
+
+    def test_cross_file_checks_match_cli_json(self, daemon, plugin_repo, scripts_path, make_agent_md):
+        agents = plugin_repo / "plugins" / "other-plugin" / "agents"
+        (agents / "delta.md").write_text(make_agent_md(name="delta", skills="test-skill, missing-skill"))
+        (agents / "alpha.md").write_text(make_agent_md(name="alpha"))
+        (plugin_repo / "scripts").mkdir()
+        for name in ("validate-frontmatter.py", "validate-manifests.py"):
+            shutil.copy(scripts_path / name, plugin_repo / "scripts" / name)
+        proc = subprocess.run([sys.executable, str(plugin_repo / "scripts" / "validate-frontmatter.py"), "--json"],
+                              capture_output=True, text=True)
+        cli = json.loads(proc.stdout)
+        assert sorted(w["code"] for w in cli["warnings"] if w["code"].startswith("FM5")) == ["FM501", "FM504"]
+
+        assert vd.send_request(daemon.socket_path, {"command": "frontmatter"}) == cli
+        assert vd.answer({"command": "frontmatter"}, plugin_repo) == cli
+
+    @pytest.mark.parametrize("base_dir", [None, ".claude-plugin"])
+    def test_single_path_matches_cli_json(self, daemon, plugin_repo, monkeypatch, capsys, base_dir):
+        manifest = plugin_repo / ".claude-plugin" / "marketplace.json"
+        request = {"command": "manifests", "path": str(manifest)}
+        argv = ["validate-manifests.py", "--json", "--path", str(manifest)]
+        if base_dir:
+            request["base_dir"] = str(plugin_repo / base_dir)
+            argv += ["--base-dir", str(plugin_repo / base_dir)]
+        monkeypatch.setattr(sys, "argv", argv)
+        vm.main()
+        cli = json.loads(capsys.readouterr().out)
+        assert cli["is_valid"] is (base_dir is None)
+
+        assert vd.send_request(daemon.socket_path, request) == cli
+        assert vd.answer(request, plugin_repo) == cli
+
+    def test_paths_match_validate_files(self, daemon, plugin_repo):
+        files = [plugin_repo / "plugins/other-plugin/agents/gamma.md",
+                 plugin_repo / "plugins/test-plugin/agents/alpha.md"]
+        response = vd.send_request(daemon.socket_path, {
+            "command": "frontmatter", "paths": [str(f) for f in files]})
+        errors, warnings = vf.validate_files(files)
+        assert response == vf.ValidationResult(errors, warnings, 2).to_dict()
+
+    def test_no_validatable_paths(self, daemon, plugin_repo):
+        response = vd.send_request(daemon.socket_path, {
+            "command": "frontmatter", "paths": [str(plugin_repo / "README.md")]})
+        assert response == {"is_valid": True, "files_checked": 0, "errors": [], "warnings": []}
+
+    def test_manifests_match_validate_manifest_paths(self, daemon, plugin_repo):
+        response = vd.send_request(daemon.socket_path, {"command": "manifests"})
+        manifest = plugin_repo / ".claude-plugin" / "marketplace.json"
+        assert response == vm.validate_manifest_paths(manifest, base_dir=plugin_repo).to_dict()
+
+    def test_answers_reflect_edits(self, daemon, plugin_repo, make_agent_md):
+        alpha = plugin_repo / "plugins/test-plugin/agents/alpha.md"
+        alpha.write_text(make_agent_md(name="alpha", color="mauve"))
+        (plugin_repo / "plugins/test-plugin/agents/beta.md").unlink()
+
+        response = vd.send_request(daemon.socket_path, {"command": "frontmatter"})
+        assert response["files_checked"] == 3
+        assert [e["field"] for e in response["errors"]] == ["color"]
+        manifests = vd.send_request(daemon.socket_path, {"command": "manifests"})
+        assert manifests["total_errors"] == 1
+
+    def test_strict_promotes_warnings(self, daemon, plugin_repo):
+        full = _full_run(plugin_repo)
+        response = vd.send_request(daemon.socket_path, {"command": "frontmatter", "strict": True})
+        assert response["warnings"] == []
+        assert response["errors"] == full["errors"] + full["warnings"]
+
+    def test_bad_and_unknown_requests(self, daemon):
+        assert "error" in vd.send_request(daemon.socket_path, {"command": "nope"})
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(str(daemon.socket_path))
+            conn.sendall(b"[1, 2]\n")
+            reply = json.loads(vd._recv_line(conn))
+        assert reply["error"].startswith("Bad request")
+
+    def test_fallback_answers_match_daemon(self, daemon, plugin_repo):
+        for request in ({"command": "frontmatter"}, {"command": "manifests"},
+                        {"command": "frontmatter", "paths": [str(plugin_repo / "plugins/test-plugin/agents/beta.md")]}):
+            assert vd.answer(request, plugin_repo) == vd.send_request(daemon.socket_path, request)
+
+
+# ── lifecycle ──
+
+
+class TestDaemonLifecycle:
+
+    def test_stop_removes_socket(self, daemon):
+        assert vd.daemon_running(daemon.socket_path)
+        assert vd.send_request(daemon.socket_path, {"command": "stop"}) == {"stopped": True}
+        for _ in range(100):
+            if not daemon.socket_path.exists():
+                break
+            threading.Event().wait(0.01)
+        assert not daemon.socket_path.exists()
+        assert not vd.daemon_running(daemon.socket_path)
+
+    def test_send_request_without_daemon_raises(self, tmp_path):
+        with pytest.raises(OSError):
+            vd.send_request(tmp_path / "missing.sock", {"command": "frontmatter"})
+
+    @pytest.mark.parametrize("response,code", [
+        ({"is_valid": True}, 0),
+        ({"is_valid": False}, 1),
+        ({"error": "Root manifest not found", "is_valid": False}, 2),
+    ])
+    def test_exit_codes(self, response, code):
+        assert vd._exit_code(response) == code